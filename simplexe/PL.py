@@ -1,11 +1,58 @@
-import re
-from operator import itemgetter
 import exceptions
-import tabulate
+import reader
+import binary
+from tracing import Trace, Stats, Result, timed, SILENT, SUMMARY, TRACE
+from revised import RevisedSimplex
+from interior import InteriorPoint
+from sparse import CSCMatrix
+import pricing as pricing_rules
+import presolve as presolving
+import cache as caching
+import sensitivity
+import tableau
 import numpy as np
+import contextlib
 import copy
-from functools import reduce
-import math
+import time
+from fractions import Fraction
+
+
+def exact_number(value):
+    """
+    Exact value of a number read from a file
+    :param value: int, numpy int or float
+    :return: the int, or the Fraction of the shortest decimal writing of the float
+    """
+    if isinstance(value, np.integer):
+        return int(value)
+    return Fraction(str(value)) if isinstance(value, float) else value
+
+
+def integer_rows(table):
+    """
+    Scale every row of an exact table so that its numbers are python integers, a row standing for the
+    same equation whatever its positive scale
+    :param table: object ndarray of int and Fraction
+    :return: object ndarray of int
+    """
+    denominators = np.vectorize(lambda value: Fraction(value).denominator, otypes=[object])(table)
+    scales = np.lcm.reduce(denominators, axis=1)
+    return np.vectorize(int, otypes=[object])(table * scales[:, None])
+
+
+def read_file(file, sparse=False):
+    """
+    Read a PL file in the format of its extension: MPS for .mps, the binary format of binary.py for .lpb
+    and the text format otherwise
+    :param file: file containing the PL
+    :param sparse: return the constraints as a CSCMatrix, a binary file keeping the storage it was written with
+    :return: reader.Problem
+    """
+    if file.lower().endswith(".mps"):
+        return reader.read_mps(file, sparse=sparse)
+    if file.lower().endswith(".lpb"):
+        return binary.read_problem(file)
+    return reader.read_problem(file, sparse=sparse)
 
 
 class PL:
@@ -20,18 +67,101 @@ class PL:
         optimal_val : Valeur optimale si elle existe
         with_base_real: boolean telling if the PL has a base realisable
         var_artif_row_numbers: list of the var artificial row numbers
+        basis: list of the basic column of each constraint row, tracked from the crash basis on
         nb_var : int Original number of variables
         nb_additional_col: int Number of additionnal column other than x or y, so b or z
         nb_iteration = compte le nombre d iteration
+        nb_iteration_phase1: number of iterations of the first phase, looking for a base realisable
+        status: None before the solve, then "optimal", "unbounded", "infeasible" or "iteration_limit"
+        max_iterations: number of iterations after which the solve stops, no limit if None
+        stall_limit: number of degenerate pivots in a row after which the ratio test becomes lexicographic
+        nb_stalled: number of degenerate pivots in a row
+        lex_columns: basic columns when the simplex stalled, ordering the lexicographic ratio test, None
+            while the pricing rule breaks the ties
+        exact: boolean telling if the table is pivoted with exact integers (object ndarray)
+            instead of float64
+        tol: numbers of the table smaller than tol are taken as zero, 0 in exact mode
+        verbosity: SILENT, SUMMARY or TRACE, what is printed during the solve
+        trace: Trace recording the pivots and objective values of the solve
+        stats: tracing.Stats of the timers and counters of the last solve
+        callback: function called with the PL at each iteration of the tableau engine, None if no hook
+        engine: "tableau" for the full table method, "revised" for the revised simplex, "dual" for the
+            dual simplex on the table, "interior" for the interior point method, "auto" to let
+            choose_engine pick the tableau or dual one
+        crossover: boolean telling if the interior engine looks for an optimal basis from its last point
+        pricing: PricingRule choosing the entering column of the tableau engine
+        postsolve: presolve.Postsolve mapping the reduced PL back to the original one, None without presolve
+        sparse: boolean telling if the constraints are only stored as a CSCMatrix, without any table
+        objective, rhs: objective coefficients, as a max problem, and right hand side given at creation
+            or by set_objective and set_rhs
+        matrix: CSCMatrix of the constraints of a sparse PL
+        revised_solution: values of the variables found by the revised or interior engine, None after a
+            tableau solve
+        upper: list of the upper bound of each variable, inf when it has none, None if no variable has
+            one. The bounds are kept out of the table: a variable at its upper bound is substituted by
+            its bound minus a new variable, the column being flipped
+        flipped: ndarray telling for each variable if its column holds upper - x instead of x
+        cache: cache.SolutionCache looked up by solve, None if there is none
+        cache_key: hash of the PL as it was read and of the options changing its outcome, None without cache
+            or once the PL is changed
+        cache_entry: dict of the outcome found in the cache by the last solve, None if it was solved
     """
 
-    def __init__(self, file='file4.txt'):
+    engines = ("tableau", "revised", "dual", "interior", "auto")
+    native_bounds = True  # The tableau engine handles the upper bounds, the other solvers get rows
+
+    def __init__(self, file='file4.txt', exact=False, verbosity=TRACE, keep_tableaux=False, engine=None,
+                 sparse=False, problem=None, pricing="first", presolve=False, callback=None, max_iterations=None,
+                 stall_limit=50, cache=None, crossover=True):
         """
         Create the PL from a file
         set the the matrix of the problem, the signs and wether it is max or min
-        :param file: file containing the PL
+        :param file: file containing the PL, in the text format, in MPS format if it ends with .mps or in the
+            binary format of binary.py if it ends with .lpb
+        :param exact: pivot with exact python integers instead of float64
+        :param verbosity: SILENT, SUMMARY or TRACE
+        :param keep_tableaux: keep a copy of every table in the trace to render them afterwards
+        :param engine: "tableau", "revised", "dual", "interior" or "auto", engine used by solve, "revised"
+            for a sparse PL and "auto" otherwise if None
+        :param sparse: store only the non zero coefficients of the constraints, the slack variables
+            being implicit, the PL is then solved with the revised engine
+        :param problem: reader.Problem already parsed, used instead of the file
+        :param pricing: name of the pricing rule, one of pricing.rules, or a PricingRule
+        :param presolve: reduce and scale the PL with presolve.presolve before it is loaded
+        :param callback: function called with the PL at each iteration of the tableau engine, once the
+            pivot is chosen and before it is applied
+        :param max_iterations: number of iterations after which the solve stops with the status
+            "iteration_limit", no limit if None
+        :param stall_limit: number of degenerate pivots in a row after which the lexicographic ratio test
+            is used, the simplex then never cycling
+        :param cache: cache.SolutionCache giving the outcome of a PL already solved instead of solving it
+        :param crossover: with the interior engine, pivot from the last interior point to an optimal basis
+            so that the optimal value is the one of the simplex
         """
+        engine = engine or ("revised" if sparse else "auto")
+        if engine not in self.engines:
+            raise ValueError("Unknown engine {}, should be one of {}".format(engine, self.engines))
         self.file = file
+        self.engine = engine
+        self.sparse = sparse
+        self.pricing = pricing_rules.get_rule(pricing)
+        self.objective = None
+        self.matrix = None
+        self.rhs = None
+        self.exact = exact
+        self.tol = 0 if exact else 1e-9
+        self.verbosity = verbosity
+        self.trace = Trace(keep_tableaux)
+        self.stats = Stats()
+        self.callback = callback
+        self.revised_solution = None
+        self.crossover = crossover
+        self.upper = None
+        self.flipped = None
+        self.max_iterations = max_iterations
+        self.stall_limit = stall_limit
+        self.nb_stalled = 0
+        self.lex_columns = None
         self.table = []
         self.signs = []
         self.max_min = ""
@@ -40,27 +170,72 @@ class PL:
         self.optimal_val = None
         self.with_base_real = False
         self.var_artif_row_numbers = []
+        self.basis = None
         self.nb_var = 0
         self.nb_additional_col = 0
         self.nb_iteration = 0
+        self.nb_iteration_phase1 = 0
+        self.status = None
+        self.postsolve = None
+        self.cache = cache
+        self.cache_key = None
+        self.cache_entry = None
 
-        try:
-            my_file = open(self.file, encoding='utf-8')
-        except (IOError, OSError) as e:
-            raise FileNotFoundError("File not found. Try to check the name you provided.")
-        else:
-            self.max_min = my_file.read(3)  # Wether max or min
+        if problem is None:
+            problem = read_file(file, sparse)
+        if cache is not None:  # The key of the PL as it was read, before any bound row or presolve
+            self.cache_key = caching.problem_key(problem, solver=type(self).__name__, exact=exact,
+                                                 presolve=presolve, pricing=type(self.pricing).__name__,
+                                                 crossover=crossover, max_iterations=max_iterations,
+                                                 stall_limit=stall_limit)
+        if problem.upper is not None and (sparse or engine in ("revised", "interior") or presolve
+                                     or not self.native_bounds):
+            problem = problem.with_bound_rows()
+        if presolve:
+            problem, self.postsolve = presolving.presolve(problem)
+        self.load(problem)
 
-            for line in my_file:
-                numbers_list = line.split()  # Get a list of string
-                self.set_signs(numbers_list)
-                self.table.append(self.to_int(numbers_list))
-
-            self.fill_additional_column()  # Fill the z column of the table
+    def load(self, problem):
+        """
+        Fill the table, or the sparse matrix, from a parsed problem
+        A min problem is turned into a max problem by changing the sign of the objective
+        :param problem: reader.Problem
+        """
+        self.max_min = problem.max_min  # Wether max or min
+        self.signs = list(problem.signs)
+        self.nb_var = len(problem.objective)  # Original number of variables
+        if self.sparse:
+            self.objective = (self.sense() * problem.objective).tolist()
+            self.matrix = problem.matrix if isinstance(problem.matrix, CSCMatrix) \
+                else CSCMatrix.from_dense(problem.matrix)
+            self.rhs = problem.rhs.tolist()
+        else:
+            self.objective = (self.sense() * np.asarray(problem.objective)).tolist()
+            self.rhs = np.asarray(problem.rhs).tolist()
+            self.fill_additional_column()
+            matrix = problem.matrix.toarray() if isinstance(problem.matrix, CSCMatrix) else problem.matrix
+            self.table = tableau.build_table(self.objective, matrix, self.rhs, z_column=self.nb_additional_col == 2)
+            if problem.upper is not None:
+                self.upper = [self.exact_bound(value) if np.isfinite(value) else np.inf for value in problem.upper]
+                self.flipped = np.zeros(self.nb_var, dtype=bool)
 
-            self.nb_var = len(self.table[0][:-2])  # Original number of variables
+    def exact_bound(self, value):
+        """
+        Upper bound in the number type of the table, a python int when it is an integer
+        :param value: float bound
+        :return: float, int or Fraction
+        """
+        if not self.exact:
+            return float(value)
+        value = exact_number(value)
+        return int(value) if value == int(value) else value
 
-            my_file.close()
+    def sense(self):
+        """
+        Sign of the objective in the table
+        :return: 1 for a max problem, -1 for a min problem
+        """
+        return -1 if self.max_min.lower() == "min" else 1
 
     def has_base_real(self):
         """
@@ -69,50 +244,48 @@ class PL:
         """
         return self.with_base_real
 
-    @staticmethod
-    def to_int(list):
+    def fill_additional_column(self):
         """
-        Convert all elements of a list to int
-        :param list: list with digits represented as strings
-        :return: list which elements are all int
+        Set the number of additional columns of the table built by load, the z and b columns
         """
-        try:
-            return [int(i) for i in list]
-        except ValueError:
-            raise exceptions.NotDigitError("List should contain digits only")
+        self.nb_additional_col = 2
 
-    def set_signs(self, numbers_list):
+    def to_array(self):
         """
-        store the signs into the sign list and remove them from the prevous list
-        :param numbers_list: to get the sign from and remove them afterward
+        Convert the table to the ndarray kept for the whole solve
+        float64 by default, python integers (object) in exact mode, the rows with decimals being
+        multiplied by the lcm of their denominators
         """
-        for i in numbers_list:
-            if not re.match(r'-?\d', i):  # match positive and negative digits
-                self.signs.append(i)
-                numbers_list.remove(i)
+        if self.exact and self.table.dtype != object:
+            self.table = integer_rows(np.vectorize(exact_number, otypes=[object])(self.table))
+        elif not self.exact and self.table.dtype != np.float64:
+            self.table = self.table.astype(np.float64)
 
-    def fill_additional_column(self):
+    def __str__(self):
         """
-        Add the z and bcolumn to the table
+        display the table in a more human readable way
+        :return:
         """
-        self.nb_additional_col = 2
-
-        self.table[0].append(-1)
-        self.table[0].append(0)
+        if self.sparse:
+            return "PL creux: {} contraintes, {} variables, {} coefficients non nuls".format(
+                self.matrix.shape[0], self.nb_var, self.matrix.nnz)
+        return self.format_table(self.table, self.pivot)
 
-        for row in self.table[1:]:
-            row.insert(len(row) - 1, 0)  # insert 0 for the z column
-
-    def __str__(self):
+    def format_table(self, table, pivot=None):
         """
-        display the table in a more human readable way
+        display a table of the PL in a more human readable way
         :param table: multidimensional array representing the table of the PL
-        :return:
+        :param pivot: tuple of the row and column number of the pivot to highlight
+        :return: string of the table
         """
-        printed_table = copy.deepcopy(self.table)
+        import tabulate  # Only needed to display, kept out of the import of the module
+        if isinstance(table, np.ndarray):
+            printed_table = table.tolist()
+        else:
+            printed_table = copy.deepcopy(table)
 
-        if self.pivot is not None:
-            printed_table[self.pivot[0]][self.pivot[1]] = "[{}]".format(printed_table[self.pivot[0]][self.pivot[1]])
+        if pivot is not None:
+            printed_table[pivot[0]][pivot[1]] = "[{}]".format(printed_table[pivot[0]][pivot[1]])
 
         lines = ['--' for i in printed_table[0]]
         printed_table.insert(1, lines)  # Insert the lines with -- after the first row
@@ -128,144 +301,1028 @@ class PL:
     def standardize(self):
         """
         Put the PL to standard form
-        :param signs: list of constraints signs
-        :param table: multidimensional array representing the PL table
+        The table is built again at its standard shape, a slack column for each constraint being put
+        before the z column (a column of zeros for an equality, which has no slack)
         """
-        var_ecart = {"<=": 1, ">=": -1}
-        for sign_num, sign in enumerate(self.signs):
-            for row_num, row in enumerate(self.table):
-                if row_num == sign_num + 1:  # have to offset since we ignore first column
-                    row.insert(len(row) - self.nb_additional_col, var_ecart[sign])  # insert 0 before the z column
-                else:
-                    row.insert(len(row) - self.nb_additional_col, 0)  # insert 0 before the z column
+        if self.sparse:  # The slack variables stay implicit
+            return
+        self.table = tableau.build_table(self.table[0, :self.nb_var], self.table[1:, :self.nb_var],
+                                         self.table[1:, -1], self.signs, z_column=self.nb_additional_col == 2)
+
+    def get_problem(self):
+        """
+        Data of the problem, the constraints being read from the table, standardized or not
+        :return: tuple of the objective, the constraint matrix, the signs and the right hand side
+        """
+        if self.sparse:
+            return self.objective, self.matrix, self.signs, self.rhs
+        matrix = self.table[1:, :self.nb_var].tolist()
+        if self.upper is None:
+            return self.objective, matrix, self.signs, self.rhs
+        bounded = [var for var, value in enumerate(self.upper) if value != np.inf]  # The revised engine gets rows
+        matrix += [[int(i == var) for i in range(self.nb_var)] for var in bounded]
+        return (self.objective, matrix, self.signs + ["<="] * len(bounded),
+                self.rhs + [self.upper[var] for var in bounded])
+
+    def solve(self, engine=None):
+        """
+        Solve the PL with the chosen engine
+        :param engine: "tableau", "revised", "dual", "interior" or "auto", the engine given at creation if None
+        :return: tracing.Result of the solve
+        """
+        engine = engine or self.engine
+        if engine not in self.engines:
+            raise ValueError("Unknown engine {}, should be one of {}".format(engine, self.engines))
+        if engine == "auto":
+            engine = self.choose_engine()
+        self.pricing.reset()
+        self.stats = Stats()
+        self.optimal_val = None
+        self.revised_solution = None
+        self.cache_entry = None
+        self.reset_stall()
+        start = time.perf_counter()
+        key = None if self.cache_key is None else "{}-{}".format(self.cache_key, engine)
+        if key is not None:
+            entry = self.cache.get(key)
+            if entry is not None:
+                return self.load_cached(entry)
+        if self.postsolve is not None and self.nb_var == 0:
+            self.solve_empty()
+        elif engine == "revised":
+            self.solve_revised()
+        elif engine == "interior":
+            self.solve_interior()
+        elif engine == "dual":
+            self.to_array()
+            self.solve_dual(self.slack_basis())
+        else:
+            self.solve_tableau()
+        result = self.result(start)
+        if key is not None and self.status != "iteration_limit":  # A larger limit may find the optimum
+            basis = self.get_basis() if self.status == "optimal" and engine in ("tableau", "dual") else None
+            self.cache.put(key, {"status": self.status, "optimal_val": self.optimal_val, "solution": result.solution,
+                                 "basis": basis, "nb_iteration": self.nb_iteration, "stats": self.stats})
+        return result
+
+    def load_cached(self, entry):
+        """
+        Take the outcome of a solve from the cache, the table being left as it was
+        :param entry: dict of the status, optimal value, solution, basis, number of iterations and stats
+            of the solve which filled the cache
+        :return: tracing.Result of the cached solve
+        """
+        self.cache_entry = entry
+        self.status = entry["status"]
+        self.optimal_val = entry["optimal_val"]
+        self.nb_iteration = entry["nb_iteration"]
+        self.stats = entry["stats"]
+        if self.verbosity >= SUMMARY:
+            print("Solution trouvee dans le cache")
+        return Result(self.status, self.optimal_val, entry["solution"], self.nb_iteration, self.stats)
+
+    def result(self, start):
+        """
+        Close the stats of the solve
+        :param start: time.perf_counter at the start of the solve
+        :return: tracing.Result of the solve
+        """
+        self.stats.wall_time = time.perf_counter() - start
+        self.stats.record_memory()
+        if self.status != "optimal":  # The optimal value of a previous solve does not hold any more
+            return Result(self.status, None, None, self.nb_iteration, self.stats)
+        return Result(self.status, self.optimal_val, self.get_solution(), self.nb_iteration, self.stats)
+
+    def solve_revised(self):
+        """
+        Solve the PL with the revised simplex, keeping only a factorization of the basis
+        """
+        revised = RevisedSimplex(*self.get_problem(), max_iterations=self.max_iterations,
+                                 stall_limit=self.stall_limit)
+        with self.stopped_status():
+            revised.solve()
+            self.status = "optimal"
+            self.optimal_val = self.sense() * revised.optimal_val + self.offset()
+            self.revised_solution = revised.x.tolist()
+            if self.verbosity >= SUMMARY:
+                print("Termine en {} iterations".format(revised.nb_iteration))
+        self.nb_iteration = revised.nb_iteration
+
+    def solve_empty(self):
+        """
+        Solve a PL whose variables were all eliminated by presolve, without any engine: the solution
+        is the one of the postsolve, unless a row is left, presolve only keeping the empty rows which
+        do not hold
+        """
+        self.nb_iteration = 0
+        if self.signs:
+            self.status = "infeasible"
+            if self.verbosity >= SUMMARY:
+                print("Pas de solution realisable")
+        else:
+            self.status = "optimal"
+            self.optimal_val = self.offset()
+            self.revised_solution = []
+            if self.verbosity >= SUMMARY:
+                print("Resolu par le presolve")
+
+    def solve_interior(self):
+        """
+        Solve the PL with the interior point method, then the crossover to an optimal basis
+        The number of iterations counts the interior point iterations and the pivots of the crossover
+        """
+        interior = InteriorPoint(*self.get_problem(), max_iterations=self.max_iterations or 100,
+                                 crossover=self.crossover, max_pivots=self.max_iterations)
+        with self.stopped_status():
+            interior.solve()
+            self.status = "optimal"
+            self.optimal_val = self.sense() * interior.optimal_val + self.offset()
+            self.revised_solution = interior.solution.tolist()
+            if self.verbosity >= SUMMARY:
+                print("Termine en {} iterations et {} pivots".format(interior.nb_iteration,
+                                                                    interior.crossover_iterations))
+        self.nb_iteration = interior.nb_iteration + interior.crossover_iterations
 
-    def solve(self):
+    def solve_tableau(self, warm=False):
         """
-        Solve a simple PL with base realisable
+        Solve the PL with the table method, in two phases when the crash basis is not realisable
+        :param warm: start from the basis of the table, already realisable, without a first phase
+        """
+        if self.sparse:
+            raise ValueError("A sparse PL has no table, solve it with the revised engine")
+        self.to_array()
+        with self.stopped_status():
+            if warm or self.phase1():
+                self.iterate()
+                self.status = "optimal"
+                self.set_optimal_val()
+                if self.verbosity >= SUMMARY:
+                    print("Termine en {} iterations".format(self.nb_iteration))
+
+    @contextlib.contextmanager
+    def stopped_status(self):
+        """
+        Context of the run of an engine: when it stops on an unbounded or infeasible PL, or at the
+        iteration limit, the status is set and the rest of the block is skipped
         """
         try:
-            self.set_pivot()
+            yield
         except exceptions.SolutionNonBorneeError:
-            print("Solution non bornee")
+            self.status, message = "unbounded", "Solution non bornee"
+        except exceptions.SolutionNonRealisableError:
+            self.status, message = "infeasible", "Pas de solution realisable"
+        except exceptions.IterationLimitError:
+            self.status, message = "iteration_limit", "Nombre maximal d'iterations atteint"
         else:
-            if self.pivot is not None:
-                self.nb_iteration += 1
+            return
+        if self.verbosity >= SUMMARY:
+            print(message)
+
+    def iterate(self):
+        """
+        Pivot with the primal simplex until the table is optimal
+        :raise IterationLimitError: when max_iterations is reached first
+        """
+        while True:
+            self.check_iteration_limit()
+            self.set_pivot()
+            self.nb_iteration += 1
+            self.trace.record(self.table, self.pivot, self.objective_value())
+            if self.pivot is None:
+                break
+            if self.callback is not None:
+                self.callback(self)
+            if self.verbosity >= TRACE:
                 print(self)
+            self.transform()
+        if self.verbosity >= TRACE:
+            print("Dernier tableau:")
+            print(self)
+
+    def check_iteration_limit(self):
+        """
+        Raise IterationLimitError once the PL has done max_iterations iterations
+        """
+        if self.max_iterations is not None and self.nb_iteration >= self.max_iterations:
+            raise exceptions.IterationLimitError("Nombre maximal d'iterations atteint")
+
+    def reset_stall(self):
+        """
+        Give the ties of the ratio test back to the pricing rule, the columns of the table having changed
+        """
+        self.nb_stalled = 0
+        self.lex_columns = None
+
+    def phase1(self):
+        """
+        Phase 1: look for a base realisable, maximizing minus the sum of the artificial variables
+        added by check_base_real, then restore the objective of the PL for the second phase
+        :return: boolean telling if the PL has a base realisable, the status being set otherwise
+        """
+        self.check_base_real()
+        if not self.nb_var_artif:
+            return True
+        first_artif = len(self.table[0]) - self.nb_additional_col - self.nb_var_artif
+        costs = [0] * len(self.table[0])
+        costs[first_artif:-self.nb_additional_col] = [-1] * self.nb_var_artif
+        self.set_objective_row(costs)
+        self.iterate()
+        self.nb_iteration_phase1 = self.nb_iteration
+        if self.table[0][-1] / self.table[0][-2] < -self.tol:
+            self.status = "infeasible"
+            if self.verbosity >= SUMMARY:
+                print("Pas de solution realisable")
+            return False
+        self.drive_out_artificials(first_artif)
+        self.pricing.reset()
+        self.reset_stall()
+
+        costs = [0] * len(self.table[0])
+        costs[:self.nb_var] = self.objective
+        self.set_objective_row(costs)
+        if self.verbosity >= TRACE:
+            print("Phase 2")
+            print(self)
+        return True
+
+    def set_objective_row(self, costs):
+        """
+        Replace the objective row, priced out on the basic columns
+        :param costs: list of the objective coefficients of every column but z and b
+        """
+        row = list(costs[:len(self.table[0]) - self.nb_additional_col]) + [-1, 0]
+        for col in np.flatnonzero(self.flipped) if self.upper is not None else []:
+            row[-1] -= exact_number(row[col]) * self.upper[col] if self.exact else row[col] * self.upper[col]
+            row[col] = -row[col]
+        if self.exact:
+            row = integer_rows(np.array([[exact_number(value) for value in row]], dtype=object))[0]
+        basis = self.get_basis()
+        self.table[0] = row
+        self.price_out(basis)
+        if self.exact:
+            self.simplify()
+
+    def drive_out_artificials(self, first_artif):
+        """
+        Replace the artificial variables still basic at the end of phase 1, at zero level, then remove
+        the columns of the artificial variables
+        An artificial variable stays basic in a redundant row, where every other number is zero
+        :param first_artif: index of the first artificial column
+        """
+        for row_num, col in enumerate(list(self.basis), 1):
+            if col < first_artif:
+                continue
+            values = np.abs(self.table[row_num, :first_artif])
+            if values.max(initial=0) > self.tol:  # The largest number is the most stable pivot
+                self.pivot = (row_num, int(np.argmax(values)))
                 self.transform()
-                self.solve()
+        basic = set(self.basis)
+        removed = [col for col in range(first_artif, first_artif + self.nb_var_artif) if col not in basic]
+        self.table = np.delete(self.table, removed, axis=1)
+        self.basis = [col - sum(col > other for other in removed) for col in self.basis]
+        self.nb_var_artif -= len(removed)
+        self.with_base_real = self.nb_var_artif > 0
+
+    def set_objective(self, coefficients):
+        """
+        Change some objective coefficients, the table being updated in place so that reoptimize
+        starts from the basis of the last solve
+        :param coefficients: dict of the index of a variable (from 0) and its new coefficient
+        """
+        self.check_not_presolved()
+        self.uncache()
+        basis = self.warm_basis()
+        for var, value in coefficients.items():
+            value = self.sense() * value
+            change = exact_number(value) - exact_number(self.objective[var])
+            self.objective[var] = value
+            if basis is not None:
+                change = change if self.exact else float(change)
+                if self.upper is not None and self.flipped[var]:  # The cost of upper - x
+                    self.table[0][var] += self.table[0][-2] * change
+                    self.table[0][-1] += self.table[0][-2] * change * self.upper[var]
+                else:
+                    self.table[0][var] -= self.table[0][-2] * change
+        if basis is not None and self.exact:
+            self.table[0] = integer_rows(self.table[:1])[0]
+        if basis is not None:
+            self.price_out(basis)
+
+    def set_rhs(self, values):
+        """
+        Change some right hand sides, the table being updated in place so that reoptimize
+        starts from the basis of the last solve
+        The column of the slack variable of a constraint is B^-1 of this constraint up to its sign,
+        so the b column is updated without any factorization
+        :param values: dict of the index of a constraint (from 0) and its new right hand side
+        """
+        self.check_not_presolved()
+        self.uncache()
+        basis = self.warm_basis()
+        for row, value in values.items():
+            if self.signs[row] == "=" and basis is not None:
+                raise ValueError("An equality has no slack variable to move its right hand side along")
+            change = exact_number(value) - exact_number(self.rhs[row])
+            self.rhs[row] = value
+            if basis is not None:
+                slack = self.table[:, self.nb_var + row]
+                self.table[:, -1] += slack * (change if self.exact else float(change)) * self.slack_sign(row)
+
+    def add_constraint(self, coefficients, sign, rhs):
+        """
+        Add a constraint to the PL, the table keeping its basis, completed by the slack variable of the
+        new constraint, so that reoptimize starts from it
+        :param coefficients: dict of the index of a variable (from 0) and its coefficient
+        :param sign: "<=" or ">="
+        :param rhs: right hand side
+        """
+        self.check_not_presolved()
+        self.uncache()
+        basis = self.warm_basis()
+        if basis is None:
+            raise ValueError("Constraints can only be added to the table of the tableau engine")
+        position = self.nb_var + len(self.signs)  # After the last slack variable
+        self.table = np.insert(self.table, position, 0, axis=1)
+        basis = [col + (col >= position) for col in basis]
+
+        number = exact_number if self.exact else float
+        row = np.zeros(len(self.table[0]), dtype=self.table.dtype)
+        for var, value in coefficients.items():
+            row[var] = number(value)
+        row[position] = self.slack_coefficient(sign)
+        row[-1] = number(rhs)
+        for var in coefficients:
+            if self.upper is not None and self.flipped[var]:  # The row is written with upper - x
+                row[-1] -= row[var] * self.upper[var]
+                row[var] = -row[var]
+        if self.exact:
+            row = integer_rows(row[None, :])[0]
+        for row_num, col in enumerate(basis, 1):  # Express the row with the non basic variables
+            if row[col] == 0:
+                continue
+            if self.exact:
+                row = row * self.table[row_num][col] - row[col] * self.table[row_num]
             else:
-                print("Dernier tableau:")
+                row = row - row[col] / self.table[row_num][col] * self.table[row_num]
+        if row[position] < 0:
+            row = -row
+        self.table = np.vstack([self.table, row])
+        self.signs.append(sign)
+        self.rhs.append(rhs)
+        self.basis = basis + [position]
+        if self.exact:
+            self.simplify()
+
+    def reoptimize(self):
+        """
+        Solve the PL again after set_objective or set_rhs, starting from the basis of the last solve
+        The dual simplex first makes the right hand side realisable again, then the primal simplex
+        makes the objective row optimal again, a few pivots being enough for small changes
+        A sparse PL, or one solved with the revised or interior engine, is solved again from scratch, and
+        a basis which is neither realisable nor dual realisable, after changes of both the objective and
+        the right hand side, or left by an infeasible first phase, is left for a first phase of the tableau
+        engine
+        :return: tracing.Result of the solve
+        """
+        self.nb_iteration = 0
+        self.optimal_val = None
+        self.trace = Trace(self.trace.keep_tableaux)
+        self.pricing.reset()
+        basis = self.warm_basis()
+        if basis is None:
+            return self.solve()
+        infeasible_phase1 = self.nb_var_artif and self.status == "infeasible"
+        if infeasible_phase1 or (not self.realisable(basis) and (self.table[0, :-1] > self.tol).any()):
+            if infeasible_phase1:  # Its artificial variables and objective row are still in the table
+                self.drive_out_artificials(len(self.table[0]) - self.nb_additional_col - self.nb_var_artif)
+                costs = [0] * len(self.table[0])
+                costs[:self.nb_var] = self.objective
+                self.set_objective_row(costs)
+            return self.solve("tableau")
+        self.stats = Stats()
+        self.reset_stall()
+        start = time.perf_counter()
+        self.solve_dual(basis)
+        return self.result(start)
+
+    def solve_dual(self, basis):
+        """
+        Pivot with the dual simplex from a dual realisable basis until the right hand side is realisable,
+        then with the primal simplex until the objective row is optimal again
+        :param basis: list of the basic column of each constraint row, the objective row being negative
+            on every column
+        """
+        with self.stopped_status():
+            while self.set_dual_pivot(basis):
+                self.check_iteration_limit()
                 self.nb_iteration += 1
-                print(self)
-                # self.simplify()
-                self.set_optimal_val()
+                self.trace.record(self.table, self.pivot, self.objective_value())
+                if self.callback is not None:
+                    self.callback(self)
+                if self.verbosity >= TRACE:
+                    print(self)
+                basis[self.pivot[0] - 1] = self.pivot[1]
+                self.transform()
+            self.solve_tableau(warm=True)
+
+    def choose_engine(self):
+        """
+        Engine of a PL solved with the "auto" engine
+        The dual simplex is chosen when the basis of the slack variables is dual realisable but not
+        realisable, as for a covering PL min c x with c >= 0 and A x >= b: it starts from this basis
+        without any artificial variable, where the tableau engine would need a first phase
+        :return: "revised" for a sparse PL, else "dual" or "tableau"
+        """
+        if self.sparse:
+            return "revised"
+        if self.basis is not None or "=" in self.signs \
+                or len(self.table[0]) < self.nb_var + len(self.signs) + self.nb_additional_col:
+            return "tableau"  # Already solved, not standardized or a row without slack variable
+        signs = np.array([self.slack_sign(row) for row in range(len(self.signs))])
+        if not (signs * self.table[1:, -1] < -self.tol).any():
+            return "tableau"  # The slack basis is realisable, no first phase is needed
+        positive = np.flatnonzero(self.table[0, :self.nb_var] > self.tol)
+        if all(self.column_upper(col) != np.inf for col in positive):  # Flipped to their upper bound
+            return "dual"
+        return "tableau"
+
+    def slack_basis(self):
+        """
+        Dual realisable basis of the slack variables: the rows of the >= constraints are negated so that
+        their slack column is a unit one, the variables of a positive cost are flipped to their upper bound
+        :return: list of the basic column of each constraint row
+        """
+        if len(self.table[0]) < self.nb_var + len(self.signs) + self.nb_additional_col:
+            raise ValueError("Standardize the PL before solving it with the dual simplex")
+        if "=" in self.signs:
+            raise ValueError("An equality has no slack variable to start the dual simplex from")
+        positive = np.flatnonzero(self.table[0, :self.nb_var] > self.tol)
+        if any(self.column_upper(col) == np.inf for col in positive):
+            raise ValueError("The basis of the slack variables is not dual realisable, use the tableau engine")
+        for row_num, sign in enumerate(self.signs, 1):
+            if sign == ">=":
+                self.table[row_num] = -self.table[row_num]
+        for col in positive:
+            self.flip(int(col))
+        self.basis = [self.nb_var + row for row in range(len(self.signs))]
+        return list(self.basis)
+
+    def check_not_presolved(self):
+        """
+        Changes are given with the indices of the original PL, which presolve may have removed
+        """
+        if self.postsolve is not None:
+            raise ValueError("A presolved PL can not be changed, create it again without presolve")
+
+    def uncache(self):
+        """
+        The PL is about to be changed, its cache key no longer stands for it
+        A PL answered by the cache has no solved table to start from, it is solved first
+        """
+        self.cache_key = None
+        if self.cache_entry is not None:
+            self.solve()
+
+    def warm_basis(self):
+        """
+        Basis of the table, every row being scaled by a positive number
+        :return: list of the basic column of each constraint row, None when the PL is solved by the
+            revised or interior engine, which have no table
+        """
+        if self.sparse or self.engine in ("revised", "interior"):
+            return None
+        if len(self.table[0]) < self.nb_var + len(self.signs) + self.nb_additional_col:
+            raise ValueError("Standardize the PL before changing it")
+        self.to_array()
+        basis = self.get_basis()
+        for row_num, col in enumerate(basis, 1):
+            if self.table[row_num][col] < 0:
+                self.table[row_num] = -self.table[row_num]
+        if self.table[0][-2] > 0:  # The z column holds minus the scale of the objective row
+            self.table[0] = -self.table[0]
+        return basis
+
+    def get_basis(self):
+        """
+        Basic column of each constraint row, the tracked basis or else a column which is zero in the
+        objective row and in every other row
+        :return: list of column indices, one for each constraint row
+        """
+        if self.basis is not None and len(self.basis) == len(self.table) - 1:
+            return list(self.basis)
+        rows = pricing_rules.unit_rows(self.table)
+        basis = [None] * (len(self.table) - 1)
+        for col in np.flatnonzero(rows > 0)[::-1]:  # The first unit column of a row is kept
+            basis[rows[col] - 1] = int(col)
+        if None in basis:
+            raise ValueError("The table has no basis")
+        return basis
+
+    def slack_sign(self, row):
+        """
+        Coefficient of the slack variable of a constraint
+        :param row: index of the constraint (from 0)
+        :return: 1 for <=, -1 for >=
+        """
+        return self.slack_coefficient(self.signs[row])
+
+    @staticmethod
+    def slack_coefficient(sign):
+        """
+        Coefficient of the slack variable of a constraint with this sign
+        :param sign: "<=" or ">="
+        :return: 1 for <=, -1 for >=
+        """
+        return 1 if sign == "<=" else -1
+
+    def price_out(self, basis):
+        """
+        Make the objective row zero on every basic column again, as after a pivot
+        :param basis: list of the basic column of each constraint row
+        """
+        for row_num, col in enumerate(basis, 1):
+            if col is None or self.table[0][col] == 0:
+                continue
+            if self.exact:  # Fraction free, the scale of the objective row stays positive
+                self.table[0] = self.table[0] * self.table[row_num][col] - self.table[0][col] * self.table[row_num]
+            else:
+                self.table[0] -= self.table[0][col] / self.table[row_num][col] * self.table[row_num]
 
+    def realisable(self, basis):
+        """
+        :param basis: list of the basic column of each constraint row
+        :return: boolean telling if every basic variable is between zero and its upper bound
+        """
+        return all(-self.tol <= self.table[row_num][-1] <= self.column_upper(col) * self.table[row_num][col] + self.tol
+                   for row_num, col in enumerate(basis, 1))
+
+    @timed("dual_pricing")
+    def set_dual_pivot(self, basis):
+        """
+        Choose the pivot of a dual simplex iteration: the first row with a negative right hand side,
+        then the column keeping every cost of the objective row negative
+        :param basis: list of the basic column of each constraint row
+        :return: boolean telling if a pivot was found, False if the right hand side is realisable
+        """
+        self.pivot = None
+        for row_num, col in enumerate(basis, 1):  # A variable above its upper bound is flipped below zero
+            if self.table[row_num][-1] > self.column_upper(col) * self.table[row_num][col] + self.tol:
+                self.flip(col)
+                self.table[row_num] = -self.table[row_num]
+        negative = self.table[1:, -1] < -self.tol
+        if not negative.any():
+            return False
+        if (self.table[0, :-1] > self.tol).any():  # Not dual realisable
+            raise ValueError("Change either the objective or the right hand side before reoptimize")
+        row_num = int(np.argmax(negative)) + 1
+        row = self.table[row_num, :-self.nb_additional_col]
+        candidates = row < -self.tol
+        if not candidates.any():
+            raise exceptions.SolutionNonRealisableError("Pas de solution realisable")
+        ratios = np.full(len(row), np.inf)
+        ratios[candidates] = self.table[0, :-self.nb_additional_col][candidates] / row[candidates]
+        self.pivot = (row_num, int(np.argmin(ratios)))
+        return True
+
+    def get_solution(self):
+        """
+        Values of the original variables read from the last table, mapped back through the postsolve
+        of a presolved PL
+        :return: list of values, the non basic variables being zero
+        """
+        if self.cache_entry is not None:
+            return list(self.cache_entry["solution"])
+        if self.revised_solution is not None:
+            solution = self.revised_solution
+            return self.postsolve.solution(solution).tolist() if self.postsolve is not None else list(solution)
+        solution = [0] * self.nb_var
+        for row_num, col in enumerate(self.get_basis(), 1):
+            if col < self.nb_var:
+                solution[col] = self.table[row_num][-1] / self.table[row_num][col]
+        for var in np.flatnonzero(self.flipped) if self.upper is not None else []:
+            solution[var] = self.upper[var] - solution[var]
+        if self.postsolve is not None:
+            return self.postsolve.solution(solution).tolist()
+        return solution
+
+    def check_sensitivity(self):
+        """
+        The sensitivity analysis reads the optimal table of the tableau or dual engine, with the indices
+        of the original PL
+        """
+        self.check_not_presolved()
+        if self.nb_additional_col != 2:
+            raise ValueError("The sensitivity analysis needs the z column of the table")
+        if self.cache_entry is not None:
+            self.uncache()  # Solved again, a cached PL has no table
+        if self.status != "optimal":
+            raise ValueError("The sensitivity analysis needs an optimal PL, its status is {}".format(self.status))
+        if self.warm_basis() is None:
+            raise ValueError("The sensitivity analysis reads the table, solve with the tableau or dual engine")
+
+    def normalized_table(self):
+        """
+        :return: tuple of a float copy of the table, normalized by sensitivity.normalize, and its basis
+        """
+        basis = self.get_basis()
+        return sensitivity.normalize(np.array(self.table, dtype=np.float64), basis), basis
+
+    def sensitivity(self):
+        """
+        Dual values, reduced costs and ranges of the costs and right hand sides, read from the optimal table
+        without any other solve
+        The dual value of a constraint is minus its sign times the reduced cost of its slack variable, and
+        the slack column is the column of B^-1 moving the basic values with its right hand side
+        :return: sensitivity.Sensitivity
+        """
+        self.check_sensitivity()
+        table, basis = self.normalized_table()
+        sense = self.sense()
+        flipped = self.flipped if self.upper is not None else np.zeros(self.nb_var, dtype=bool)
+
+        reduced_costs, cost_ranges = [], []
+        for col in range(self.nb_var):
+            direction = -1 if flipped[col] else 1  # The column holds upper - x
+            low, high = sensitivity.cost_range(table, basis, col, self.tol or 1e-9)
+            low, high = sorted((direction * low, direction * high))
+            cost = self.objective[col]  # Max form
+            low, high = sorted((sense * (cost + low), sense * (cost + high)))
+            reduced_costs.append(0. if col in basis else float(sense * direction * table[0][col]))
+            cost_ranges.append((float(low), float(high)))
+
+        values = table[1:, -1]
+        upper = np.array([float(self.column_upper(col)) for col in basis])
+        dual_values, rhs_ranges = [], []
+        for row, sign in enumerate(self.signs):
+            if sign == "=":
+                dual_values.append(None)
+                rhs_ranges.append(None)
+                continue
+            slack = self.slack_sign(row)
+            low, high, _, _ = sensitivity.rhs_range(values, slack * table[1:, self.nb_var + row], upper,
+                                                    self.tol or 1e-9)
+            dual_values.append(float(-sense * slack * table[0][self.nb_var + row]) + 0.)  # Not -0.
+            rhs_ranges.append((float(self.rhs[row] + low), float(self.rhs[row] + high)))
+        return sensitivity.Sensitivity(self.optimal_val, self.get_solution(), basis, dual_values, reduced_costs,
+                                       cost_ranges, rhs_ranges)
+
+    def sweep_copy(self, theta_max):
+        """
+        Copy of the solved PL pivoted by the parametric methods, in float64, the PL itself being left
+        as it is
+        :param theta_max: last value of the parameter
+        :return: PL
+        """
+        self.check_sensitivity()
+        if not np.isfinite(theta_max):
+            raise ValueError("theta_max should be finite")
+        work = copy.copy(self)
+        work.table, work.basis = self.normalized_table()
+        work.exact, work.tol = False, self.tol or 1e-9
+        work.objective, work.rhs, work.signs = list(self.objective), list(self.rhs), list(self.signs)
+        work.flipped = None if self.flipped is None else self.flipped.copy()
+        work.pricing = copy.deepcopy(self.pricing)
+        work.trace, work.stats = Trace(), Stats()
+        work.verbosity, work.callback, work.cache, work.cache_key = SILENT, None, None, None
+        work.nb_iteration = 0
+        work.reset_stall()
+        return work
+
+    def segment(self, start, end, move):
+        """
+        Segment of a parametric change, the table being moved to its end
+        :param start: value of the parameter at the start of the segment, the one of the table
+        :param end: value of the parameter at the end of the segment
+        :param move: function changing the table by a step of the parameter
+        :return: sensitivity.Segment
+        """
+        solution, optimal_val = self.get_solution(), float(self.objective_value())
+        move(end - start)
+        return sensitivity.Segment(float(start), float(end), self.get_basis(), solution, self.get_solution(),
+                                   optimal_val, float(self.objective_value()))
+
+    def parametric_rhs(self, direction, theta_max=1.):
+        """
+        Optimal solutions of the right hand sides b + theta d, theta going from 0 to theta_max
+        The basis stays optimal until a basic variable reaches zero or its bound, the dual simplex then
+        pivots it out and the next segment starts from the new basis
+        :param direction: dict of the index of a constraint (from 0) and its change d for each unit of theta
+        :param theta_max: last value of theta
+        :return: list of sensitivity.Segment, the last one ending before theta_max when the PL is not
+            realisable beyond it
+        """
+        if any(self.signs[row] == "=" and value for row, value in direction.items()):
+            raise ValueError("An equality has no slack variable to move its right hand side along")
+        work = self.sweep_copy(theta_max)
+        slacks = [work.nb_var + row for row in direction]
+        changes = np.array([value * self.slack_sign(row) for row, value in direction.items()], dtype=np.float64)
+        segments = []
+        theta = 0.
+        while True:
+            table, basis = work.table, work.get_basis()
+            column = table[:, slacks] @ changes  # B^-1 d, and the change of the objective row
+            upper = np.array([float(work.column_upper(col)) for col in basis])
+            _, step, _, row = sensitivity.rhs_range(table[1:, -1], column[1:], upper, work.tol)
+            end = min(theta + step, theta_max)
+
+            def move(length):
+                table[:, -1] += length * column
+            if end > theta:
+                segments.append(work.segment(theta, end, move))
+            theta = end
+            if theta >= theta_max:
+                return segments
+            work.check_iteration_limit()
+            work.nb_iteration += 1
+            row_num = row + 1
+            if column[row_num] > 0:  # The basic variable reaches its bound, flipped to zero
+                work.flip(basis[row])
+                table[row_num] = -table[row_num]
+            candidates = table[row_num, :-2] < -work.tol
+            if not candidates.any():  # The row can not leave: no realisable solution beyond theta
+                return segments
+            ratios = np.full(len(candidates), np.inf)
+            ratios[candidates] = table[0, :-2][candidates] / table[row_num, :-2][candidates]
+            work.pivot = (row_num, int(np.argmin(ratios)))
+            work.transform()
+            sensitivity.normalize(table, work.get_basis())
+
+    def parametric_objective(self, direction, theta_max=1.):
+        """
+        Optimal solutions of the costs c + theta e, theta going from 0 to theta_max
+        The basis stays optimal until a reduced cost becomes positive, its column then enters the basis
+        with the primal simplex and the next segment starts from the new basis
+        :param direction: dict of the index of a variable (from 0) and its change e for each unit of theta
+        :param theta_max: last value of theta
+        :return: list of sensitivity.Segment, the last one ending before theta_max when the PL is unbounded
+            beyond it
+        """
+        work = self.sweep_copy(theta_max)
+        segments = []
+        theta = 0.
+        while True:
+            table, basis = work.table, work.get_basis()
+            row = np.zeros(len(table[0]))  # Objective row of e, in the columns of the table
+            for var, value in direction.items():
+                row[var] = self.sense() * value
+                if work.upper is not None and work.flipped[var]:
+                    row[-1] -= row[var] * work.upper[var]
+                    row[var] = -row[var]
+            row -= row[basis] @ table[1:]  # Priced out
+            rising = row[:-2] > work.tol
+            ratios = np.full(len(rising), np.inf)
+            ratios[rising] = -table[0, :-2][rising] / row[:-2][rising]
+            col = int(np.argmin(ratios))
+            end = min(theta + max(ratios[col], 0.), theta_max)
+
+            def move(length):
+                table[0] += length * row
+            if end > theta:
+                segments.append(work.segment(theta, end, move))
+            theta = end
+            if theta >= theta_max:
+                return segments
+            work.check_iteration_limit()
+            work.nb_iteration += 1
+            if work.upper is None and work.column_is_all_negative(col):
+                return segments  # Unbounded beyond theta
+            try:
+                work.set_pivot_from_column(col)
+            except exceptions.SolutionNonBorneeError:
+                return segments
+            if work.pivot is not None:
+                work.transform()
+            sensitivity.normalize(table, work.get_basis())
+
+    def render_trace(self, iteration=None):
+        """
+        Render the tables kept during the solve, only when keep_tableaux was set
+        :param iteration: index of the only table to render, all of them if None
+        :return: string of the tables
+        """
+        return self.trace.render(self.format_table, iteration)
+
+    @timed("pricing")
     def set_pivot(self):
         """
         Return the coordinate of the pivot if it exists
         """
         self.pivot = None
-        while not self.is_all_negative_but_last(self.table[0]):  # Until there is no positive digit which
-            # column could contain a pivot
-            for col, value in enumerate(self.table[0]):
-                if value > 0 and not self.column_is_all_negative(col):  # There is a possible pivot in
-                    # the column since there is at least one positive number in this column
-                    self.set_pivot_from_column(col)
-                    break  # pivot found so get out of for loop
-            else:
-                raise exceptions.SolutionNonBorneeError("Solution non bornee")
-            break  # get out of while loop, did not enter else block
+        while self.pivot is None:  # A column whose variable flips to its upper bound needs no pivot
+            positive = self.table[0, :-1] > self.tol
+            if not positive.any():  # No positive digit, the table is optimal
+                return
+            if self.upper is None:
+                # Columns with a positive cost and at least one positive number could contain a pivot
+                candidates = positive & ~self.column_is_all_negative(slice(None, -1))
+                if not candidates.any():
+                    raise exceptions.SolutionNonBorneeError("Solution non bornee")
+            else:  # The bounds may stop a column of negative numbers, the ratio test tells
+                candidates = positive
+            self.set_pivot_from_column(self.pricing.choose(self.table, candidates))
 
     @staticmethod
     def is_all_negative_but_last(list):
         """
         Check if all elements but the last are negative
-        :param list: list of integers
+        :param list: list or array of numbers
         :return: boolean telling if all elements but last are negative
         """
-        is_all_negative = True
-        for i in list[:len(list) - 1]:  # Do not test for the last element of the list
-            if i > 0:
-                is_all_negative = False
-                break
-        return is_all_negative
+        return not (np.asarray(list)[:-1] > 0).any()  # Do not test for the last element of the list
 
     def column_is_all_negative(self, col):
         """
         Check wether the entire column is negative or equals to zero
-        :param col: index of the column to check
-        :return: boolean
+        :param col: index of the column to check, or a slice to check several columns at once
+        :return: boolean, or array of booleans when several columns are checked
         """
-        column_is_all_negative = True
-        for row in self.table[1:]:  # Spare the first row since it is the z row
-            if row[col] > 0:  # column col in row row
-                column_is_all_negative = False
-                break
-        return column_is_all_negative
+        return ~(self.table[1:, col] > self.tol).any(axis=0)  # Spare the first row since it is the z row
 
+    @timed("ratio_test")
     def set_pivot_from_column(self, col):
         """
         Return the row number of the pivot at this column
         :param col: index of the column
         """
-        pivot_candidates_over_b = [(row_num, row[-1] / row[col]) for row_num, row in enumerate(self.table[1:])
-                                   if row[col] > 0]
-        pivot = min(pivot_candidates_over_b, key=itemgetter(1))  # Evaluate the second element of each tuple
-        self.pivot = (pivot[0] + 1, col)  # we previously removed the first row so we add it to get
+        column = self.table[1:, col]
+        positive = column > self.tol
+        ratios = np.full(len(column), np.inf)
+        ratios[positive] = self.table[1:, -1][positive] / column[positive]
+        if self.upper is not None:
+            basis = self.get_basis()
+            # The basic variables with an upper bound increase up to it along a negative number
+            bounds = np.array([self.column_upper(basic) * self.table[row_num][basic]
+                               for row_num, basic in enumerate(basis, 1)], dtype=object)
+            rising = (column < -self.tol) & np.array([bound != np.inf for bound in bounds], dtype=bool)
+            ratios[rising] = (bounds[rising] - self.table[1:, -1][rising]) / -column[rising]
+            if self.column_upper(col) <= ratios.min(initial=np.inf):  # The entering variable reaches its bound first
+                if self.column_upper(col) == np.inf:
+                    raise exceptions.SolutionNonBorneeError("Solution non bornee")
+                self.flip(col)
+                self.stats.nb_bound_flip += 1
+                return
+        row_num = self.leaving(col, ratios) + 1  # we previously removed the first row so we add it to get
         # the absolute position
+        if self.upper is not None and column[row_num - 1] < 0:  # The basic variable leaves at its bound
+            self.flip(basis[row_num - 1])
+            self.table[row_num] = -self.table[row_num]
+        self.pivot = (row_num, col)
+
+    def leaving(self, col, ratios):
+        """
+        Leaving row among the minimum ratios, chosen by the pricing rule until the simplex stalls, then
+        by the lexicographic rule: the row of the smallest row of B^-1 divided by its pivot, B being the
+        basis when the simplex stalled. No two rows are then equal and no basis comes twice
+        :param col: index of the entering column
+        :param ratios: ndarray of the ratios of each constraint row, inf when the row can not leave
+        :return: index of the leaving row among the constraint rows (from 0)
+        """
+        if self.lex_columns is None:
+            return self.pricing.leaving(self.table, col, ratios)
+        ties = np.flatnonzero((ratios <= ratios.min() + self.tol) & (self.table[1:, col] > self.tol))
+        if len(ties) < 2:
+            return self.pricing.leaving(self.table, col, ratios)
+        number = Fraction if self.exact else np.divide
+        return int(min(ties, key=lambda row: [number(self.table[row + 1][lex], self.table[row + 1][col])
+                                              for lex in self.lex_columns]))
 
+    def column_upper(self, col):
+        """
+        Upper bound of the variable of a column
+        :param col: index of the column
+        :return: upper bound, inf for a column without bound (slack or artificial variables)
+        """
+        return self.upper[col] if self.upper is not None and col < self.nb_var else np.inf
+
+    def flip(self, col):
+        """
+        Substitute the variable of a column by its upper bound minus a new variable, so that the variable
+        at its upper bound is the new one at zero
+        Every row, the objective one included, moves the bound times its number to its right hand side
+        :param col: index of the column of a variable with an upper bound
+        """
+        bound = self.upper[col]
+        self.table[:, -1] -= self.table[:, col] * bound
+        self.table[:, col] = -self.table[:, col]
+        self.flipped[col] = not self.flipped[col]
+        if self.exact and not isinstance(bound, int):
+            self.table[:] = integer_rows(self.table)
+
+    @timed("transform")
     def transform(self):
         """
         Operate the transformation on the table given the pivot
+        The whole table is updated in place at once with a rank-1 update, the pivot row being kept
+        In exact mode the rows are then simplified so that their numbers do not grow with the pivots
         :param table: multidimensional array representing the PL table
         :param pivot: tuple of the row and column number of the pivot
         """
-        self.table = np.matrix(self.table)
-        pivot_row = self.table[self.pivot[0]]
-        for index, row in enumerate(self.table):
-            if index != self.pivot[0]:
-                self.table[index] = row * self.table[self.pivot] - pivot_row * row[0, self.pivot[1]]
+        self.pricing.update(self.table, self.pivot)
+        degenerate = self.stats.record_pivot(self.table, self.pivot, self.tol)
+        self.nb_stalled = self.nb_stalled + 1 if degenerate else 0
+        row_num, col = self.pivot
+        pivot_value = self.table[self.pivot]
+        if self.exact:  # Fraction free: row * pivot - pivot_row * row[col]
+            pivot_row = self.table[row_num].copy()
+            column = self.table[:, col].copy()
+            if pivot_value != 1:
+                self.table *= pivot_value
+            self.table -= np.outer(column, pivot_row)
+        else:
+            pivot_row = self.table[row_num] / pivot_value
+            self.table -= np.outer(self.table[:, col], pivot_row)
+        self.table[row_num] = pivot_row
+        if self.basis is not None:
+            self.basis[row_num - 1] = col
+        if self.exact and pivot_value < 0:  # Dual simplex pivot, keep every row scaled by a positive number
+            np.negative(self.table, out=self.table)
+        if self.exact:
+            self.simplify()
         self.pivot = None
-        self.table = self.table.tolist()
+        if self.nb_stalled >= self.stall_limit and self.lex_columns is None:
+            # Every row is lexicographically positive on the columns of the basis, scaled by a positive number
+            self.lex_columns = self.get_basis()
+            self.stats.nb_stall += 1
 
     def check_base_real(self):
         """
         Verify if the base is realisable
+        A crash basis is looked for first, then an artificial variable is added to every row left
+        without a basic column
         """
-        old_dim = len(self.table[0])
-        for row_num, row in enumerate(self.table):
-            for i in row[self.nb_var:-2]:  # check only the variable d ecart
-                if i == -1:
-                    self.var_artif_row_numbers.append(row_num)
-                    self.nb_var_artif += 1
-                    for r_num, r in enumerate(self.table):
-                        if r_num == row_num:
-                            r.insert(len(r) - 2, 1)
-                        else:
-                            r.insert(len(r) - 2, 0)
-        if old_dim != len(self.table[0]):
-            self.with_base_real = True
+        if self.sparse or self.nb_var_artif:  # Artificial variables are added by the revised engine
+            return
+        self.to_array()
+        self.basis = self.crash_basis()
+        self.var_artif_row_numbers = [row_num for row_num, col in enumerate(self.basis, 1) if col is None]
+        self.nb_var_artif = len(self.var_artif_row_numbers)
+        if not self.nb_var_artif:
+            return
+        position = len(self.table[0]) - self.nb_additional_col  # Before the z column
+        for index, row_num in enumerate(self.var_artif_row_numbers):
+            if self.table[row_num][-1] < 0:
+                self.table[row_num] = -self.table[row_num]
+            self.basis[row_num - 1] = position + index
+        artificials = np.zeros((len(self.table), self.nb_var_artif), dtype=self.table.dtype)
+        artificials[self.var_artif_row_numbers, np.arange(self.nb_var_artif)] = 1
+        self.table = np.concatenate([self.table[:, :position], artificials, self.table[:, position:]], axis=1)
+        self.with_base_real = True
+        if self.verbosity >= TRACE:
             print("Phase 1 \nRecherche d'une base realisable")
             print("Introduction de {} variables artificielles".format(self.nb_var_artif))
             print(self)
-            # table = phase1(table, var_artif_row)
+
+    def crash_basis(self):
+        """
+        Crash basis: every row is covered, when possible, by a column whose only number is in this row
+        and has the sign of its right hand side, the slack variables first
+        The rows are scaled so that their basic number is positive and the objective row is priced out
+        :return: list of the basic column of each constraint row, None for a row left uncovered
+        """
+        variables = self.table[:, :len(self.table[0]) - self.nb_additional_col]
+        nonzero = np.asarray(abs(variables[1:]) > self.tol, dtype=bool)
+        singletons = np.flatnonzero(nonzero.sum(axis=0) == 1)
+        free = np.asarray(variables[0, singletons] == 0, dtype=bool)
+        basis = [None] * (len(self.table) - 1)
+        for col in np.concatenate([singletons[free], singletons[~free]]):  # No pricing needed first
+            row_num = int(np.argmax(nonzero[:, col])) + 1
+            value, rhs = self.table[row_num][col], self.table[row_num][-1]
+            if basis[row_num - 1] is None and (abs(rhs) <= self.tol or (value > 0) == (rhs > 0)) \
+                    and rhs / value <= self.column_upper(col):
+                if value < 0:
+                    self.table[row_num] = -self.table[row_num]
+                basis[row_num - 1] = int(col)
+        self.price_out(basis)
+        return basis
 
     def simplify(self):
         """
         Simplifie chaque ligne du tableau si possible
+        Every row of an exact table is divided by the gcd of its numbers, all rows at once. A row pivoted
+        with the Bareiss updates being a multiple of the simplified one, the numbers stay at least as
+        small: their size grows polynomially instead of exponentially with the number of pivots
         """
-        original_table = copy.deepcopy(self.table)
-        for index, row in enumerate(self.table):
-            self.table[index] = [int(i / reduce(math.gcd, row)) for i in row]
-        if not original_table == self.table:
-            print("Simplified")
-            print(self)
+        gcds = np.gcd.reduce(self.table, axis=1)
+        gcds[gcds == 0] = 1  # A row of zeros is left as it is
+        self.table //= gcds[:, None]
+
+    def objective_value(self):
+        """
+        Current value of the objective read from the table
+        """
+        return self.sense() * self.table[0][-1] / self.table[0][-2] + self.offset()
+
+    def offset(self):
+        """
+        Constant of the objective left by the variables presolve eliminated
+        """
+        return 0 if self.postsolve is None else self.postsolve.offset
 
     def set_optimal_val(self):
         """
         Set the optimal value depending on the PL
         """
-        self.optimal_val = self.table[0][-1] / self.table[0][-2]
+        self.optimal_val = self.objective_value()
 
     def display_result(self):
         """
@@ -1,6 +1,11 @@
 import PL
-import tabulate
-import math
+import cuts
+import exceptions
+import pricing
+import reader
+from sparse import CSCMatrix
+from tracing import timed
+import numpy as np
 import copy
 
 
@@ -10,39 +15,71 @@ class PLInt(PL.PL):
     It does not work when solving a PL solution non bornee
     Attributes:
         pseudo_pivot: position of the pseudo pivot
+        cuts: cuts.CutPool holding the table with the cuts added by the pseudo pivots
     """
 
-    def __init__(self, file):
+    native_bounds = False  # The upper bounds are rows, the pseudo pivots do not flip variables
+
+    def __init__(self, file, verbosity=PL.TRACE, keep_tableaux=False, problem=None, capacity=16,
+                 max_iterations=10000, patience=8):
         """
         Add the new attribute pseudo_pivot for this class
+        The table is always pivoted with exact integers, by the all integer dual simplex of the first phase
+        when the basis of the slack variables is not realisable, then by the primal simplex which makes the cuts
         :param file:
+        :param verbosity: SILENT, SUMMARY or TRACE
+        :param keep_tableaux: keep a copy of every table in the trace to render them afterwards
+        :param problem: reader.Problem already parsed, used instead of the file
+        :param capacity: number of cuts the table has room for before it grows
+        :param max_iterations: number of iterations after which the solve stops, the pseudo pivots
+            being able to cycle whatever the ratio test
+        :param patience: number of pivots a cut stays inactive before it is purged
         """
-        super().__init__(file)
+        super().__init__(file, exact=True, verbosity=verbosity, keep_tableaux=keep_tableaux, engine="tableau",
+                         problem=problem, max_iterations=max_iterations)
         self.pseudo_pivot = None
+        self.cuts = cuts.CutPool(capacity, patience)
 
     def fill_additional_column(self):
         """
-        Add the b column to the table and set the number of additional column
+        Set the number of additional column, the table built by load only has the b column
         Do not add a z column
         """
         self.nb_additional_col = 1
-        self.table[0].append(0)  # Fill the b column
 
     def __str__(self):
         """
         display the table in a more human readable way
         """
-        printed_table = copy.deepcopy(self.table)
         nb_iteration = ""
+        if self.nb_iteration != 0:
+            nb_iteration = "Tableau {}\n".format(self.nb_iteration)
+
+        printed_table = self.format_table(self.table, self.pivot, self.pseudo_pivot)
+        self.pseudo_pivot = None
 
-        if self.pivot is not None:  # Add the pivot [] recognizer
-            printed_table[self.pivot[0]][self.pivot[1]] = "({})".format(
-                printed_table[self.pivot[0]][self.pivot[1]])
+        return nb_iteration + printed_table
 
-        if self.pseudo_pivot is not None:  # Add the pseudo-pivot recognizer
-            printed_table[self.pseudo_pivot[0]][self.pseudo_pivot[1]] = "[{}]".format(
-                printed_table[self.pseudo_pivot[0]][self.pseudo_pivot[1]])
-            self.pseudo_pivot = None
+    def format_table(self, table, pivot=None, pseudo_pivot=None):
+        """
+        display a table of the PL in a more human readable way
+        :param table: multidimensional array representing the table of the PL
+        :param pivot: tuple of the row and column number of the pivot to highlight
+        :param pseudo_pivot: tuple of the row and column number of the pseudo pivot to highlight
+        :return: string of the table
+        """
+        import tabulate  # Only needed to display, kept out of the import of the module
+        if isinstance(table, np.ndarray):
+            printed_table = table.tolist()
+        else:
+            printed_table = copy.deepcopy(table)
+
+        if pivot is not None:  # Add the pivot [] recognizer
+            printed_table[pivot[0]][pivot[1]] = "({})".format(printed_table[pivot[0]][pivot[1]])
+
+        if pseudo_pivot is not None:  # Add the pseudo-pivot recognizer
+            printed_table[pseudo_pivot[0]][pseudo_pivot[1]] = "[{}]".format(
+                printed_table[pseudo_pivot[0]][pseudo_pivot[1]])
 
         lines = ['--' for i in printed_table[0]]
         printed_table.insert(1, lines)  # Insert the lines with -- after the first row
@@ -53,10 +90,25 @@ class PLInt(PL.PL):
                 headers[-self.nb_var_artif + i] = 'y{}'.format(i)
         headers.extend(['b'])
 
-        if self.nb_iteration != 0:
-            nb_iteration = "Tableau {}\n".format(self.nb_iteration)
+        return tabulate.tabulate(printed_table, headers=headers, tablefmt="psql")
 
-        return nb_iteration + tabulate.tabulate(printed_table, headers=headers, tablefmt="psql")
+    def to_array(self):
+        """
+        Keep the table in the buffer of the cut pool, the pivots being applied in place
+        """
+        super().to_array()
+        self.table = self.cuts.attach(self.table)
+
+    def set_pivot(self):
+        """
+        Purge the cuts inactive for long enough before looking for the pivot, so that the table does not
+        keep growing
+        """
+        nb_purged = self.cuts.nb_purged
+        self.table = self.cuts.purge()
+        if self.cuts.nb_purged != nb_purged:  # The columns moved, the next pivot takes the new basis
+            self.lex_columns = None
+        super().set_pivot()
 
     def set_pivot_from_column(self, col):
         """
@@ -67,20 +119,143 @@ class PLInt(PL.PL):
 
         pivot_value = self.table[self.pivot[0]][self.pivot[1]]
         self.pseudo_pivot = (self.pivot[0], self.pivot[1])
-        if pivot_value != 1:
-            for row in self.table:
-                row.insert(-1, 0)  # Append 0 before the b column
-            new_constraint = [math.floor(i/pivot_value) for i in self.table[self.pivot[0]]]
-            self.table.append(new_constraint)
-            self.table[-1][-2] = 1
+        if pivot_value != 1:  # The cut gets a slack column before the b column
+            self.table = self.cuts.add(self.table[self.pivot[0]] // pivot_value)
             self.pivot = len(self.table) - 1, col  # we change the pivot row by the last row
 
-    def set_optimal_val(self):
+    def load(self, problem):
+        """
+        Load the PL, each equality being split into a <= and a >= constraint so that every row has a slack
+        variable to start the first phase from
+        :param problem: reader.Problem
+        """
+        if "=" in problem.signs:
+            matrix = problem.matrix.toarray() if isinstance(problem.matrix, CSCMatrix) \
+                else np.asarray(problem.matrix).reshape(len(problem.rhs), len(problem.objective))
+            equalities = [row for row, sign in enumerate(problem.signs) if sign == "="]
+            signs = ["<=" if sign == "=" else sign for sign in problem.signs] + [">="] * len(equalities)
+            problem = reader.Problem(problem.max_min, problem.objective, np.vstack([matrix, matrix[equalities]]),
+                                     signs, np.concatenate([problem.rhs, np.asarray(problem.rhs)[equalities]]),
+                                     problem.names, problem.upper)
+        super().load(problem)
+
+    def phase1(self):
+        """
+        Phase 1 with the all integer dual simplex of Gomory, from the basis of the slack variables
+        The rows of the >= constraints are negated so that their slack column is a unit one. When a right
+        hand side is then negative, the objective row becomes minus the sum of the variables, which makes
+        every column lexicographically positive, and the dual pivots make the right hand side realisable.
+        The second phase starts from this integer realisable basis with the objective of the PL
+        :return: boolean telling if the PL has an integer realisable solution, the status being set otherwise
+        """
+        self.to_array()
+        for row_num, sign in enumerate(self.signs, 1):
+            if sign == ">=":
+                self.table[row_num] = -self.table[row_num]
+        if not (self.table[1:, -1] < 0).any():
+            return True
+        costs = self.table[0, :self.nb_var].copy()
+        nb_col = len(self.table[0]) - 1
+        self.table[0] = 0
+        self.table[0, :self.nb_var] = -1
+        if self.verbosity >= PL.TRACE:
+            print("Phase 1 \nRecherche d'une base realisable entiere")
+        try:
+            while self.set_integer_dual_pivot(nb_col):
+                self.check_iteration_limit()
+                self.nb_iteration += 1
+                self.trace.record(self.table, self.pivot, self.objective_value())
+                if self.callback is not None:
+                    self.callback(self)
+                if self.verbosity >= PL.TRACE:
+                    print(self)
+                self.transform()
+        except exceptions.SolutionNonRealisableError:
+            self.status = "infeasible"
+            if self.verbosity >= PL.SUMMARY:
+                print("Pas de solution realisable")
+            return False
+        self.nb_iteration_phase1 = self.nb_iteration
+        self.pricing.reset()
+        self.reset_stall()
+
+        phase2_costs = np.zeros(len(self.table[0]) - 1, dtype=object)
+        phase2_costs[:self.nb_var] = costs
+        self.set_costs(phase2_costs)
+        if self.verbosity >= PL.TRACE:
+            print("Phase 2")
+            print(self)
+        return True
+
+    @timed("dual_pricing")
+    def set_integer_dual_pivot(self, nb_col):
+        """
+        Choose the pivot of an all integer dual iteration: the first row with a negative right hand side is
+        divided by its largest negative number in absolute value and rounded down, a cut whose number is -1
+        in every column where the row is negative, the row itself when these numbers are all -1. The pivot
+        is the -1 of the lexicographically smallest of these columns, so that the columns stay
+        lexicographically positive and no basis comes twice
+        :param nb_col: number of columns of the variables of the PL, the columns of the cuts coming after
+        :return: boolean telling if a pivot was found, False if the right hand side is realisable
+        """
+        self.pivot = None
+        negative = self.table[1:, -1] < 0
+        if not negative.any():
+            return False
+        row_num = int(np.argmax(negative)) + 1
+        row = self.table[row_num, :-1]
+        candidates = np.flatnonzero(np.asarray(row < 0, dtype=bool))
+        if not len(candidates):
+            raise exceptions.SolutionNonRealisableError("Pas de solution realisable")
+        basic_rows = {col: basic_row for basic_row, col in enumerate(self.get_basis(), 1) if col < nb_col}
+
+        def column(col):  # Decrease of the objective and of each variable when the variable of col increases
+            return [-self.table[0][col]] + [self.table[basic_rows[var]][col] if var in basic_rows else -int(var == col)
+                                            for var in range(nb_col)]
+
+        col = int(min(candidates, key=column))
+        self.pivot = (row_num, col)
+        if row.min() != -1:  # The cut gets a slack column before the b column
+            self.table = self.cuts.add(self.table[row_num] // -row.min())
+            self.pivot = (len(self.table) - 1, col)
+        return True
+
+    def get_basis(self):
+        """
+        Basic column of each constraint row, read from the table since the cuts add rows: every pivot
+        being 1, a basic column is a unit column whose number is 1
+        :return: list of column indices, one for each constraint row
+        """
+        rows = pricing.unit_rows(self.table)
+        basis = [None] * (len(self.table) - 1)
+        for col in np.flatnonzero(rows > 0)[::-1]:  # The first unit column of a row is kept
+            if self.table[rows[col]][col] == 1:
+                basis[rows[col] - 1] = int(col)
+        if None in basis:
+            raise ValueError("The table has no basis")
+        return basis
+
+    def set_costs(self, costs):
+        """
+        Replace the objective row, priced out on the basic columns, the table having no z column
+        :param costs: ndarray of the objective coefficient of every column but b
+        """
+        basis = self.get_basis()
+        self.table[0, :-1] = costs
+        self.table[0, -1] = 0
+        self.price_out(basis)
+
+    def simplify(self):
+        """
+        Keep the rows as they are: every pivot is 1 so the numbers do not grow, and the objective row,
+        without a z column, could not hold a scale
+        """
+
+    def objective_value(self):
         """
-        Set the optimal value depending on the PL
-        :return:
+        Current value of the objective read from the table, there is no z column
         """
-        self.optimal_val = -self.table[0][-1]
+        return -self.sense() * self.table[0][-1]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,321 @@
+import unittest
+import numpy as np
+import PL
+import reader
+
+
+class PLTest(unittest.TestCase):
+
+    def solve(self, file, **kwargs):
+        my_PL = PL.PL(file, verbosity=PL.SILENT, **kwargs)
+        my_PL.standardize()
+        my_PL.solve()
+        return my_PL
+
+    def test_solve(self):
+        """
+        solve should find the optimal value of the bundled problems in float and exact mode
+        :return:
+        """
+        for file, optimal_val in [('file2.txt', 52 / 9), ('file3.txt', 20), ('file4.txt', 14.4),
+                                  ('file5.txt', 27.5)]:
+            for exact in (False, True):
+                self.assertAlmostEqual(self.solve(file, exact=exact).optimal_val, optimal_val)
+
+    def test_table_is_array(self):
+        """
+        The table should be kept as a contiguous ndarray during the solve
+        :return:
+        """
+        self.assertEqual(self.solve('file2.txt').table.dtype, float)
+        self.assertEqual(self.solve('file2.txt', exact=True).table.dtype, object)
+
+    def test_add_constraint(self):
+        """
+        add_constraint should keep the basis of the table and reoptimize with the dual simplex
+        :return:
+        """
+        for exact in (False, True):
+            my_PL = self.solve('file2.txt', exact=exact)
+            my_PL.add_constraint({1: 1}, "<=", 1)
+            my_PL.reoptimize()
+            self.assertAlmostEqual(my_PL.optimal_val, 5)
+            my_PL.add_constraint({0: 1}, ">=", 1)
+            my_PL.reoptimize()
+            self.assertAlmostEqual(my_PL.optimal_val, 4.5)
+            self.assertEqual(my_PL.signs, ["<=", "<=", "<=", ">="])
+
+    def test_exact_growth(self):
+        """
+        The exact table should keep small integers, simplified after every pivot
+        :return:
+        """
+        rng = np.random.default_rng(1)
+        matrix, rhs, objective = rng.integers(1, 20, (30, 30)), rng.integers(50, 100, 30), rng.integers(1, 20, 30)
+        problem = reader.Problem("max", objective, matrix, ["<="] * 30, rhs)
+        my_PL = PL.PL(verbosity=PL.SILENT, exact=True, problem=problem)
+        my_PL.standardize()
+        my_PL.solve()
+        self.assertGreater(my_PL.nb_iteration, 20)
+        self.assertLess(max(abs(value).bit_length() for value in my_PL.table.ravel()), 64)
+        float_PL = PL.PL(verbosity=PL.SILENT, problem=problem)
+        float_PL.standardize()
+        float_PL.solve()
+        self.assertAlmostEqual(my_PL.optimal_val, float_PL.optimal_val)
+
+    def test_two_phase(self):
+        """
+        The table method should look for a base realisable first, artificial variables being only
+        added to the rows the crash basis could not cover
+        :return:
+        """
+        for exact in (False, True):
+            my_PL = self.solve('file4.txt', exact=exact, pricing="dantzig")
+            self.assertAlmostEqual(my_PL.optimal_val, 14.4)
+            self.assertEqual(my_PL.var_artif_row_numbers, [1, 3])
+            self.assertEqual(my_PL.nb_var_artif, 0)
+            self.assertGreater(my_PL.nb_iteration_phase1, 0)
+        self.assertEqual(self.solve('file5.txt').nb_iteration_phase1, 0)
+        for text, status, optimal_val in [('min 1 1\n1 2 >= 4\n3 1 >= 6', "optimal", 2.8),
+                                          ('max 1 2\n1 1 = 3\n1 -1 <= -1\n0 1 <= 5', "optimal", 6),
+                                          ('max 1 1\n1 1 <= 2\n1 1 >= 3', "infeasible", None)]:
+            my_PL = PL.PL(verbosity=PL.SILENT, problem=reader.parse_problem(text))
+            my_PL.standardize()
+            my_PL.solve()
+            self.assertEqual(my_PL.status, status)
+            self.assertAlmostEqual(my_PL.optimal_val, optimal_val)
+
+    def test_trace(self):
+        """
+        The trace should record every iteration and render the tables only when kept
+        :return:
+        """
+        my_PL = self.solve('file2.txt')
+        self.assertEqual(len(my_PL.trace), my_PL.nb_iteration)
+        self.assertIsNone(my_PL.trace.pivots[-1])
+        self.assertAlmostEqual(my_PL.trace.objective_values[-1], my_PL.optimal_val)
+        self.assertRaises(ValueError, my_PL.render_trace)
+        my_PL = self.solve('file2.txt', keep_tableaux=True)
+        self.assertEqual(len(my_PL.trace.tableaux), my_PL.nb_iteration)
+        self.assertIn('[', my_PL.render_trace(0))
+
+    def test_revised_engine(self):
+        """
+        The revised engine should find the same optimal value as the table method
+        :return:
+        """
+        for file in ['file.txt', 'file2.txt', 'file3.txt', 'file4.txt', 'file5.txt']:
+            my_PL = PL.PL(file, verbosity=PL.SILENT, engine="revised")
+            my_PL.solve()
+            self.assertAlmostEqual(my_PL.optimal_val, self.solve(file).optimal_val)
+        self.assertRaises(ValueError, PL.PL, 'file2.txt', engine="unknown")
+        for sparse in (False, True):  # No constraint, no basis to factorize
+            my_PL = PL.PL(verbosity=PL.SILENT, engine="revised", sparse=sparse, problem=reader.parse_problem('max -1 0'))
+            self.assertEqual(my_PL.solve().solution, [0, 0])
+            my_PL = PL.PL(verbosity=PL.SILENT, engine="revised", sparse=sparse, problem=reader.parse_problem('max 1 0'))
+            self.assertEqual(my_PL.solve().status, "unbounded")
+
+    def test_sparse(self):
+        """
+        A sparse PL should only keep the non zero coefficients and find the same optimal value
+        :return:
+        """
+        for file in ['file2.txt', 'file3.txt', 'file4.txt', 'file5.txt']:
+            my_PL = PL.PL(file, verbosity=PL.SILENT, sparse=True)
+            my_PL.standardize()
+            my_PL.solve()
+            self.assertEqual(my_PL.table, [])
+            self.assertAlmostEqual(my_PL.optimal_val, self.solve(file).optimal_val)
+        my_PL = PL.PL('file4.txt', verbosity=PL.SILENT, sparse=True)
+        self.assertEqual(my_PL.matrix.nnz, 12)
+        self.assertEqual(my_PL.matrix.column(1).tolist(), [-1, 1, 2])
+        self.assertRaises(ValueError, my_PL.solve, "tableau")
+
+    def test_min(self):
+        """
+        A min problem should be solved as the max of the opposite objective
+        :return:
+        """
+        problem = reader.parse_problem('min 1 1\n1 2 >= 4\n3 1 >= 6')
+        for sparse in (False, True):
+            my_PL = PL.PL(verbosity=PL.SILENT, engine="revised", sparse=sparse, problem=problem)
+            my_PL.solve()
+            self.assertAlmostEqual(my_PL.optimal_val, 2.8)
+
+    def test_reoptimize(self):
+        """
+        reoptimize should start from the last basis and find the optimal value of the changed PL
+        :return:
+        """
+        for exact in (False, True):
+            my_PL = self.solve('file5.txt', exact=exact)
+            my_PL.set_objective({0: 4})
+            my_PL.reoptimize()
+            self.assertAlmostEqual(my_PL.optimal_val, 32)
+            self.assertEqual(my_PL.get_solution(), [3, 4])
+            my_PL.set_rhs({2: 4})  # The basis is no longer realisable, solved by the dual simplex
+            my_PL.reoptimize()
+            self.assertAlmostEqual(my_PL.optimal_val, 16)
+            self.assertEqual(my_PL.nb_iteration, 2)
+            my_PL.set_rhs({2: -1})
+            result = my_PL.reoptimize()
+            self.assertEqual(my_PL.status, "infeasible")
+            self.assertIsNone(result.optimal_val)  # Not the value of the previous solve
+            self.assertIsNone(my_PL.optimal_val)
+            my_PL.set_objective({0: 1, 1: 5})  # Both changed before reoptimize
+            my_PL.set_rhs({2: 2})
+            my_PL.reoptimize()
+            self.assertAlmostEqual(my_PL.optimal_val, 5)
+            my_PL.set_objective({1: 1})
+            my_PL.set_rhs({0: -1, 2: 14})
+            self.assertEqual(my_PL.reoptimize().status, "infeasible")
+            my_PL.set_objective({0: 3})
+            my_PL.set_rhs({0: 7})
+            my_PL.reoptimize()
+            self.assertAlmostEqual(my_PL.optimal_val, 18)
+        my_PL = self.solve('file4.txt')
+        my_PL.set_rhs({1: 9})
+        my_PL.reoptimize()
+        self.assertAlmostEqual(my_PL.optimal_val, 16.6)
+        my_PL = PL.PL(verbosity=PL.SILENT, problem=reader.parse_problem('max 1 2\n1 1 >= 1\n1 3 <= 6'))
+        my_PL.standardize()
+        my_PL.set_rhs({0: 2})  # Never solved
+        my_PL.reoptimize()
+        self.assertAlmostEqual(my_PL.optimal_val, 6)
+        my_PL = PL.PL('file5.txt', verbosity=PL.SILENT, sparse=True)
+        my_PL.set_objective({0: 4})
+        my_PL.reoptimize()
+        self.assertAlmostEqual(my_PL.optimal_val, 32)
+
+    def test_stats(self):
+        """
+        solve should return the result with the timers and counters of the solve, calling the callback
+        at each pivot
+        :return:
+        """
+        tables = []
+        my_PL = PL.PL('file2.txt', verbosity=PL.SILENT, callback=lambda pl: tables.append(pl.table.shape))
+        my_PL.standardize()
+        result = my_PL.solve()
+        self.assertEqual(result.status, "optimal")
+        self.assertAlmostEqual(result.optimal_val, my_PL.optimal_val)
+        self.assertEqual(len(result.solution), 3)
+        self.assertEqual(result.stats.nb_pivot, len(tables))
+        self.assertEqual(set(result.stats.times), {"pricing", "ratio_test", "transform"})
+        self.assertEqual(result.stats.max_shape, max(tables))
+        self.assertLessEqual(sum(result.stats.times.values()), result.stats.wall_time)
+        result = PL.PL('file2.txt', verbosity=PL.SILENT, engine="revised").solve()
+        self.assertAlmostEqual(result.solution[1], 11 / 9)
+        self.assertEqual(my_PL.stats.nb_degenerate, 0)
+        my_PL = PL.PL(verbosity=PL.SILENT, problem=reader.parse_problem('max 1 1\n1 -1 <= 0\n-1 2 <= 0\n1 1 <= 4'))
+        my_PL.standardize()
+        self.assertEqual(my_PL.solve().stats.nb_degenerate, 2)  # The optimum is the degenerate vertex 0
+
+    def test_upper_bounds(self):
+        """
+        Upper bounds should be kept out of the table, the variables flipping to their bound, and give
+        the optimum of the PL with a row for each bound
+        :return:
+        """
+        text = 'max 5 4 3\nub 1 2 -\n2 3 1 <= 5\n4 1 2 <= 11\n3 4 2 >= 1'
+        for exact in (False, True):
+            my_PL = PL.PL(verbosity=PL.SILENT, problem=reader.parse_problem(text), exact=exact)
+            my_PL.standardize()
+            result = my_PL.solve()
+            self.assertAlmostEqual(result.optimal_val, 15)
+            self.assertEqual(result.solution, [0, 0, 5])
+            self.assertEqual(my_PL.table.shape[0], 4)  # No row for the bounds
+            self.assertEqual(result.stats.nb_bound_flip, 1)
+            my_PL.set_objective({2: 1})
+            my_PL.reoptimize()
+            self.assertAlmostEqual(my_PL.optimal_val, 9)
+            self.assertEqual(my_PL.get_solution(), [1, 1, 0])  # x1 at its upper bound
+            my_PL.add_constraint({2: 1}, ">=", 1)
+            my_PL.reoptimize()
+            self.assertAlmostEqual(my_PL.optimal_val, 26 / 3)
+        for engine in ("revised", "tableau"):
+            my_PL = PL.PL(verbosity=PL.SILENT, problem=reader.parse_problem(text), engine=engine, presolve=True)
+            my_PL.standardize()
+            my_PL.solve()
+            self.assertAlmostEqual(my_PL.optimal_val, 15)
+
+    def test_bounds_only(self):
+        """
+        A PL with upper bounds and no constraint should flip its variables to their bounds
+        :return:
+        """
+        for exact in (False, True):
+            my_PL = PL.PL(verbosity=PL.SILENT, problem=reader.parse_problem('max 1 1\nub 2 3\n'), engine="tableau",
+                          exact=exact)
+            my_PL.standardize()
+            result = my_PL.solve()
+            self.assertAlmostEqual(result.optimal_val, 5)
+            self.assertEqual(result.solution, [2, 3])
+            my_PL = PL.PL(verbosity=PL.SILENT, problem=reader.parse_problem('max 1 1\nub 2 -'), engine="tableau",
+                          exact=exact)
+            my_PL.standardize()
+            self.assertEqual(my_PL.solve().status, "unbounded")
+
+    def test_anti_cycling(self):
+        """
+        Beale's PL cycles with the largest cost rule, the lexicographic ratio test should stop the cycle
+        and the iteration cap should stop the solve otherwise
+        :return:
+        """
+        problem = reader.parse_problem('max 0.75 -150 0.02 -6\n0.25 -60 -0.04 9 <= 0\n0.5 -90 -0.02 3 <= 0\n'
+                                       '0 0 1 0 <= 1')
+        for exact in (False, True):
+            my_PL = PL.PL(verbosity=PL.SILENT, problem=problem, exact=exact, pricing="dantzig", stall_limit=10)
+            my_PL.standardize()
+            result = my_PL.solve()
+            self.assertAlmostEqual(result.optimal_val, 0.05)
+            self.assertEqual(result.stats.nb_stall, 1)
+            my_PL = PL.PL(verbosity=PL.SILENT, problem=problem, exact=exact, pricing="dantzig", stall_limit=1000,
+                          max_iterations=100)
+            my_PL.standardize()
+            self.assertEqual(my_PL.solve().status, "iteration_limit")
+        my_PL = PL.PL(verbosity=PL.SILENT, problem=problem, engine="revised", stall_limit=10)
+        my_PL.solve()
+        self.assertAlmostEqual(my_PL.optimal_val, 0.05)
+        my_PL = PL.PL('file2.txt', verbosity=PL.SILENT, engine="revised", max_iterations=1)
+        my_PL.solve()
+        self.assertEqual(my_PL.status, "iteration_limit")
+
+
+    def test_dual(self):
+        """
+        A covering PL should be solved by the dual simplex from the slack basis, without any artificial
+        variable, and find the optimal value of the tableau engine
+        :return:
+        """
+        problem = reader.parse_problem('min 1 2 3\n1 1 0 >= 4\n0 1 1 >= 3\n1 0 1 >= 5\n1 1 1 <= 10')
+        for exact in (False, True):
+            my_PL = PL.PL(verbosity=PL.SILENT, problem=problem, exact=exact)
+            my_PL.standardize()
+            self.assertEqual(my_PL.choose_engine(), "dual")
+            my_PL.solve()
+            self.assertAlmostEqual(my_PL.optimal_val, 11)
+            self.assertEqual(my_PL.nb_var_artif, 0)
+            self.assertEqual(my_PL.get_solution(), [3, 1, 2])
+            self.assertAlmostEqual(self.solve('file.txt', problem=problem, engine="tableau").optimal_val, 11)
+        self.assertEqual(self.solve('file5.txt').nb_var_artif, 0)  # Realisable at the slack basis: primal
+        my_PL = PL.PL('file4.txt', verbosity=PL.SILENT)
+        my_PL.standardize()
+        self.assertEqual(my_PL.choose_engine(), "tableau")  # Positive costs without upper bound
+        self.assertRaises(ValueError, my_PL.solve, "dual")
+
+    def test_large_integers(self):
+        """
+        Integers beyond the range of int64 should not wrap around in the table
+        :return:
+        """
+        problem = reader.parse_problem('max 1 1\n1 1 <= 1e19\n1 0 <= 5e18')
+        for engine, exact in (("tableau", False), ("tableau", True), ("revised", False)):
+            my_PL = PL.PL(verbosity=PL.SILENT, problem=problem, engine=engine, exact=exact)
+            my_PL.standardize()
+            self.assertEqual(my_PL.solve().status, "optimal")
+            self.assertEqual(my_PL.optimal_val, 1e19)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Solve many PL files over a pool of processes, printing one JSON line per PL as soon as it is solved
+Usage: python batch.py [-w WORKERS] [--engine ENGINE] [--pricing RULE]... [--manifest FILE] SOURCE...
+A source is a PL file, a directory or a glob pattern
+Each PL is solved once for every pricing rule given, to compare their number of iterations
+"""
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import sys
+import time
+import PL
+import pricing as pricing_rules
+
+problem_extensions = (".txt", ".mps", ".lpb")
+
+
+def iter_problem_files(sources=(), manifest=None):
+    """
+    Files of the PL to solve, lazily so that a huge batch is never listed in memory: the files of a
+    directory or a glob pattern come in the order of the file system, the results being in completion
+    order anyway
+    :param sources: files, directories (their .txt, .mps and .lpb files) or glob patterns
+    :param manifest: file listing one PL file per line
+    :return: generator of file names
+    """
+    for source in sources:
+        if os.path.isdir(source):
+            with os.scandir(source) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.lower().endswith(problem_extensions):
+                        yield entry.path
+        elif any(char in source for char in "*?["):
+            yield from glob.iglob(source)
+        else:
+            yield source  # A missing file is reported as an error by solve_file
+    if manifest is not None:
+        with open(manifest, encoding='utf-8') as my_file:
+            for line in my_file:
+                if line.strip() and not line.startswith("#"):
+                    yield line.strip()
+
+
+def solve_file(file, engine="auto", pricing="first"):
+    """
+    Solve one PL file, run in a worker process
+    :param file: file containing the PL
+    :param engine: "tableau", "revised", "dual", "interior" or "auto", the last one letting the PL choose
+    :param pricing: name of the pricing rule of the tableau engine
+    :return: dict of the file, pricing rule, status, optimal value, number of iterations and wall time
+        in seconds
+    """
+    start = time.perf_counter()
+    result = {"file": file, "pricing": pricing, "status": None, "optimal_val": None, "nb_iteration": 0}
+    try:
+        my_PL = PL.PL(file, verbosity=PL.SILENT, engine=engine, pricing=pricing)
+        my_PL.standardize()
+        my_PL.solve()
+    except Exception as e:  # A broken file should not stop the batch
+        result["status"] = "error"
+        result["error"] = "{}: {}".format(type(e).__name__, e)
+    else:
+        result["status"] = my_PL.status
+        result["optimal_val"] = None if my_PL.optimal_val is None else float(my_PL.optimal_val)
+        result["nb_iteration"] = my_PL.nb_iteration
+    result["wall_time"] = time.perf_counter() - start
+    return result
+
+
+def run_batch(files, workers=None, max_pending=None, engine="auto", pricings=("first",)):
+    """
+    Solve PL files over a pool of processes
+    At most max_pending PL are submitted at once so that memory does not grow with the batch
+    :param files: iterable of file names
+    :param workers: number of processes, the number of CPUs if None
+    :param max_pending: number of PL submitted at once, twice the number of workers if None
+    :param engine: "tableau", "revised", "dual", "interior" or "auto", the last one letting the PL choose
+    :param pricings: names of the pricing rules, every PL being solved once with each of them
+    :return: generator of the results of solve_file in completion order
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    files = iter(files)
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        pending = set()
+        for file in files:
+            for rule in pricings:
+                pending.add(executor.submit(solve_file, file, engine, rule))
+                if len(pending) >= max_pending:
+                    done, pending = concurrent.futures.wait(pending,
+                                                            return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+        for future in concurrent.futures.as_completed(pending):
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve PL files in parallel, one JSON line per PL")
+    parser.add_argument("sources", nargs="*", help="PL files, directories or glob patterns")
+    parser.add_argument("--manifest", help="file listing one PL file per line")
+    parser.add_argument("-w", "--workers", type=int, help="number of processes, the number of CPUs by default")
+    parser.add_argument("--max-pending", type=int, help="number of PL submitted at once")
+    parser.add_argument("--engine", choices=PL.PL.engines, default="auto")
+    parser.add_argument("--pricing", action="append", choices=list(pricing_rules.rules),
+                        help="pricing rule of the tableau engine, repeat it to compare several rules")
+    args = parser.parse_args(argv)
+    if not args.sources and args.manifest is None:
+        parser.error("give at least one source or a manifest")
+
+    files = iter_problem_files(args.sources, args.manifest)
+    for result in run_batch(files, args.workers, args.max_pending, args.engine, args.pricing or ["first"]):
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+import batch
+
+
+class BatchTest(unittest.TestCase):
+
+    def test_iter_problem_files(self):
+        """
+        iter_problem_files should expand directories, glob patterns and manifests
+        :return:
+        """
+        directory = tempfile.mkdtemp()
+        for name in ('b.txt', 'a.mps', 'notes.md'):
+            open(os.path.join(directory, name), 'w').close()
+        manifest = os.path.join(directory, 'manifest')
+        with open(manifest, 'w') as my_file:
+            my_file.write('# comment\nfile2.txt\n\nfile3.txt\n')
+        files = list(batch.iter_problem_files([directory], manifest))  # In the order of the file system
+        self.assertEqual(sorted(files[:2]), [os.path.join(directory, 'a.mps'), os.path.join(directory, 'b.txt')])
+        self.assertEqual(files[2:], ['file2.txt', 'file3.txt'])
+        files = list(batch.iter_problem_files(['file?.txt', 'no_file.txt']))
+        self.assertEqual(sorted(files[:-1]), ['file2.txt', 'file3.txt', 'file4.txt', 'file5.txt'])
+        self.assertEqual(files[-1], 'no_file.txt')
+
+    def test_run_batch(self):
+        """
+        run_batch should solve every file in completion order and report broken files
+        :return:
+        """
+        files = ['file2.txt', 'file4.txt', 'file5.txt', 'no_file.txt']
+        results = {result['file']: result for result in batch.run_batch(files, workers=2, max_pending=2)}
+        self.assertEqual(sorted(results), sorted(files))
+        self.assertEqual(results['file5.txt']['status'], 'optimal')
+        self.assertAlmostEqual(results['file5.txt']['optimal_val'], 27.5)
+        self.assertAlmostEqual(results['file4.txt']['optimal_val'], 14.4)
+        self.assertEqual(results['no_file.txt']['status'], 'error')
+        self.assertGreater(results['file2.txt']['nb_iteration'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
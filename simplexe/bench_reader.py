@@ -0,0 +1,47 @@
+"""
+Parse throughput of reader.read_problem on a generated file
+Usage: python bench_reader.py [size in MB] [number of variables] [percentage of non zero coefficients]
+"""
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import reader
+
+
+def generate(path, size_mb, nb_var, density=10, seed=0):
+    """
+    Write a random PL of about size_mb megabytes in the text format
+    :param path: file to write
+    :param size_mb: size of the file in megabytes
+    :param nb_var: number of variables
+    :param density: percentage of non zero coefficients
+    :param seed: seed of the random generator
+    """
+    rng = np.random.default_rng(seed)
+    with open(path, "w", encoding="utf-8") as my_file:
+        my_file.write("max " + " ".join(map(str, rng.integers(-9, 10, nb_var))) + "\n")
+        while my_file.tell() < size_mb * 1e6:
+            block = rng.integers(-99, 100, (10000, nb_var)) * (rng.random((10000, nb_var)) * 100 < density)
+            rhs = rng.integers(0, 1000, 10000)
+            lines = [" ".join(map(str, row)) + (" <= " if value % 2 else " >= ") + str(value)
+                     for row, value in zip(block.tolist(), rhs.tolist())]
+            my_file.write("\n".join(lines) + "\n")
+
+
+def main(size_mb=200, nb_var=50, density=10):
+    path = os.path.join(tempfile.mkdtemp(), "bench.txt")
+    generate(path, size_mb, nb_var, density)
+    size = os.path.getsize(path) / 1e6
+    for sparse in (False, True):
+        start = time.perf_counter()
+        problem = reader.read_problem(path, sparse=sparse)
+        elapsed = time.perf_counter() - start
+        print("{:6} {:8.1f} MB {:9d} rows {:7.2f} s {:8.1f} MB/s".format(
+            "sparse" if sparse else "dense", size, len(problem.rhs), elapsed, size / elapsed))
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
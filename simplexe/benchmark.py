@@ -0,0 +1,234 @@
+"""
+Time the solvers on generated families of PL and write the results to a JSON file
+Usage: python benchmark.py [-o OUTPUT] [--seed SEED] [--repeat N] [--family NAME]... [--compare OLD]
+Every PL is generated from the seed, so that two versions of the solvers time the same PL: compare
+the JSON file of a version with the one of another version to spot the regressions
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import numpy as np
+import PL
+import PLInt
+import simplexe
+from tracing import Trace, SILENT
+
+
+def write_problem(path, max_min, objective, matrix, signs, rhs):
+    """
+    Write a PL in the text format
+    :param path: file to write
+    :param max_min: "max" or "min"
+    :param objective: list of the objective coefficients
+    :param matrix: list of the rows of the constraints
+    :param signs: list of the sign of each constraint
+    :param rhs: list of the right hand sides
+    """
+    with open(path, "w", encoding="utf-8") as my_file:
+        my_file.write(" ".join([max_min] + [str(value) for value in objective]) + "\n")
+        for row, sign, value in zip(matrix, signs, rhs):
+            my_file.write(" ".join([str(coefficient) for coefficient in row] + [sign, str(value)]) + "\n")
+
+
+def dense_problem(rng, nb_row, nb_var):
+    """
+    Random PL with positive coefficients, realisable at 0 and bounded
+    :return: tuple of the arguments of write_problem but the path
+    """
+    matrix = rng.integers(1, 10, (nb_row, nb_var))
+    rhs = matrix.sum(axis=1) * rng.integers(1, 5, nb_row)
+    return "max", rng.integers(1, 10, nb_var).tolist(), matrix.tolist(), ["<="] * nb_row, rhs.tolist()
+
+
+def sparse_problem(rng, nb_row, nb_var, density=0.1):
+    """
+    Random PL with a tenth of non zero coefficients, the last row bounding the sum of the variables
+    :return: tuple of the arguments of write_problem but the path
+    """
+    matrix = rng.integers(1, 10, (nb_row, nb_var)) * (rng.random((nb_row, nb_var)) < density)
+    matrix[-1] = 1
+    rhs = rng.integers(10, 100, nb_row)
+    return "max", rng.integers(1, 10, nb_var).tolist(), matrix.tolist(), ["<="] * nb_row, rhs.tolist()
+
+
+def degenerate_problem(rng, nb_row, nb_var):
+    """
+    Random PL whose first half of the constraints goes through 0, so that many pivots do not move
+    :return: tuple of the arguments of write_problem but the path
+    """
+    matrix = rng.integers(-5, 10, (nb_row, nb_var))
+    matrix[-1] = rng.integers(1, 10, nb_var)  # Bounded
+    rhs = rng.integers(10, 100, nb_row)
+    rhs[:nb_row // 2] = 0
+    return "max", rng.integers(1, 10, nb_var).tolist(), matrix.tolist(), ["<="] * nb_row, rhs.tolist()
+
+
+def klee_minty(rng, nb_row, nb_var):
+    """
+    Klee-Minty cube, on which the largest cost rule visits every one of its 2^n vertices
+    max sum 2^(n-j) x_j st 2 sum_{j<i} 2^(i-j) x_j + x_i <= 5^i, of optimal value 5^n
+    :return: tuple of the arguments of write_problem but the path
+    """
+    matrix = [[2 ** (i - j + 1) if j < i else int(i == j) for j in range(nb_var)] for i in range(nb_row)]
+    return ("max", [2 ** (nb_var - j - 1) for j in range(nb_var)], matrix, ["<="] * nb_row,
+            [5 ** (i + 1) for i in range(nb_row)])
+
+
+def integer_problem(rng, nb_row, nb_var):
+    """
+    Small random PL with positive integer coefficients, for the integer solver
+    :return: tuple of the arguments of write_problem but the path
+    """
+    matrix = rng.integers(1, 9, (nb_row, nb_var))
+    return ("max", rng.integers(1, 9, nb_var).tolist(), matrix.tolist(), ["<="] * nb_row,
+            rng.integers(5, 30, nb_row).tolist())
+
+
+# Name of the family: generator, sizes (number of constraints, number of variables), solvers
+families = {
+    "dense": (dense_problem, [(10, 10), (30, 30), (60, 60)], ("PL", "simplexe")),
+    "sparse": (sparse_problem, [(20, 40), (60, 120)], ("PL", "simplexe")),
+    "degenerate": (degenerate_problem, [(10, 10), (30, 30)], ("PL", "simplexe")),
+    "klee_minty": (klee_minty, [(4, 4), (6, 6), (8, 8)], ("PL", "simplexe")),
+    "integer": (integer_problem, [(2, 3), (3, 4)], ("PL", "PLInt")),
+    "large": (dense_problem, [(1000, 100), (2000, 100)], ("PL", "interior")),  # Thousands of rows
+}
+# Families only run when they are named, the tableau taking more than a minute on each of their PL
+slow_families = ("large",)
+
+
+def time_pl(file, solver):
+    """
+    Time the parse, the standard form and the solve of a PL with the PL or PLInt class
+    :param file: file containing the PL
+    :param solver: "PL", "PLInt" or "interior" for the PL class with the interior engine
+    :return: dict of the times in seconds, the status, the optimal value and the number of iterations
+    """
+    start = time.perf_counter()
+    if solver == "PLInt":
+        my_PL = PLInt.PLInt(file, verbosity=SILENT)
+    elif solver == "interior":
+        my_PL = PL.PL(file, verbosity=SILENT, engine="interior")
+    else:
+        my_PL = PL.PL(file, verbosity=SILENT)
+    parsed = time.perf_counter()
+    my_PL.standardize()
+    standardized = time.perf_counter()
+    my_PL.solve()
+    solved = time.perf_counter()
+    return {"parse": parsed - start, "standardize": standardized - parsed, "solve": solved - standardized,
+            "status": my_PL.status, "optimal_val": None if my_PL.optimal_val is None else float(my_PL.optimal_val),
+            "nb_iteration": my_PL.nb_iteration}
+
+
+def time_simplexe(file):
+    """
+    Time the parse, the standard form and the solve of a PL with the functions of simplexe
+    The functions do not return the solution, the optimal value is read from the trace
+    :param file: file containing the PL
+    :return: dict of the times in seconds, the status returned by process, the optimal value and the number
+    of iterations
+    """
+    start = time.perf_counter()
+    max_min, signs, table = simplexe.get_data(file)
+    nb_var = len(table[0][:-2])
+    parsed = time.perf_counter()
+    simplexe.standardize(signs, table)
+    standardized = time.perf_counter()
+    trace = Trace()
+    status = simplexe.process(nb_var, table, verbosity=SILENT, trace=trace)
+    solved = time.perf_counter()
+    result = {"parse": parsed - start, "standardize": standardized - parsed, "solve": solved - standardized,
+              "status": status, "optimal_val": None, "nb_iteration": len(trace)}
+    if status == "optimal":
+        result["optimal_val"] = float(trace.objective_values[-1])
+    return result
+
+
+def run_suite(names=None, seed=0, repeat=1, directory=None):
+    """
+    Generate the PL of the families and time every solver of the family on them
+    The best time of the repetitions is kept, it is the least disturbed by the machine
+    :param names: names of the families, all of them but slow_families if None
+    :param seed: seed of the random generator of each PL
+    :param repeat: number of times each PL is solved
+    :param directory: directory of the generated files, a temporary one if None
+    :return: list of dict of the family, size, solver and the results of time_pl or time_simplexe
+    """
+    directory = directory or tempfile.mkdtemp()
+    results = []
+    for name in names or [name for name in families if name not in slow_families]:
+        generator, sizes, solvers = families[name]
+        for nb_row, nb_var in sizes:
+            path = os.path.join(directory, "{}_{}x{}.txt".format(name, nb_row, nb_var))
+            write_problem(path, *generator(np.random.default_rng(seed), nb_row, nb_var))
+            for solver in solvers:
+                runs = []
+                for _ in range(repeat):
+                    try:
+                        runs.append(time_simplexe(path) if solver == "simplexe" else time_pl(path, solver))
+                    except Exception as e:  # A failing solver is a result too
+                        runs.append({"status": "error", "error": "{}: {}".format(type(e).__name__, e)})
+                        break
+                best = min(runs, key=lambda run: run.get("solve", float("inf")))
+                results.append(dict(family=name, size=[nb_row, nb_var], solver=solver, **best))
+    return results
+
+
+def compare(results, old_results, threshold=1.2):
+    """
+    Compare the total times with those of a previous run
+    :param results: list of results of run_suite
+    :param old_results: list of results of run_suite of the previous run
+    :param threshold: ratio of the times above which a run is a regression
+    :return: list of tuples of the family, size, solver, old total time, new total time and ratio
+    """
+    def total(result):
+        return result.get("parse", 0) + result.get("standardize", 0) + result.get("solve", 0)
+
+    old = {(result["family"], tuple(result["size"]), result["solver"]): result for result in old_results}
+    regressions = []
+    for result in results:
+        key = (result["family"], tuple(result["size"]), result["solver"])
+        if key in old and "solve" in result and "solve" in old[key]:
+            ratio = total(result) / max(total(old[key]), 1e-9)
+            if ratio > threshold:
+                regressions.append(key + (total(old[key]), total(result), ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the solvers on generated families of PL")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="JSON file of the results")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="number of times each PL is solved")
+    parser.add_argument("--family", action="append", choices=list(families),
+                        help="family to run, all but the large one by default")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare with")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.family, args.seed, args.repeat)
+    report = {"python": platform.python_version(), "numpy": np.__version__, "seed": args.seed,
+              "repeat": args.repeat, "results": results}
+    with open(args.output, "w", encoding="utf-8") as my_file:
+        json.dump(report, my_file, indent=1)
+    for result in results:
+        print("{:11} {:>8} {:9} {:10} {:8.4f} s {:6} iterations".format(
+            result["family"], "{}x{}".format(*result["size"]), result["solver"], result["status"],
+            result.get("solve", float("nan")), result.get("nb_iteration", 0)))
+
+    if args.compare is not None:
+        with open(args.compare, encoding="utf-8") as my_file:
+            regressions = compare(results, json.load(my_file)["results"])
+        for family, size, solver, old, new, ratio in regressions:
+            print("Regression {} {}x{} {}: {:.4f} s -> {:.4f} s ({:.2f}x)".format(family, *size, solver, old, new, ratio))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+import benchmark
+
+
+class BenchmarkTest(unittest.TestCase):
+
+    def test_families(self):
+        """
+        The generated PL should depend on the seed only
+        :return:
+        """
+        for name, (generator, sizes, solvers) in benchmark.families.items():
+            first = generator(np.random.default_rng(3), *sizes[0])
+            self.assertEqual(first, generator(np.random.default_rng(3), *sizes[0]))
+            self.assertEqual(len(first[2]), sizes[0][0])
+            self.assertEqual(len(first[1]), sizes[0][1])
+
+    def test_run_suite(self):
+        """
+        run_suite should time every step of every solver, the Klee-Minty cube reaching 5^n
+        :return:
+        """
+        results = benchmark.run_suite(["klee_minty", "integer"], directory=tempfile.mkdtemp())
+        self.assertEqual([(result["family"], result["solver"]) for result in results[:2]],
+                         [("klee_minty", "PL"), ("klee_minty", "simplexe")])
+        for result in results:
+            self.assertGreaterEqual(result["solve"], 0)
+            self.assertEqual(result["status"], "optimal")
+            if result["family"] == "klee_minty":
+                self.assertEqual(result["optimal_val"], 5 ** result["size"][0])
+        json.dumps(results)
+
+        slower = [dict(result, solve=result["solve"] + 1) for result in results]
+        self.assertEqual(len(benchmark.compare(slower, results)), len(results))
+        self.assertEqual(benchmark.compare(results, slower), [])
+
+    def test_simplexe_status(self):
+        """
+        time_simplexe should report the status of process, which stops after the first phase
+        :return:
+        """
+        problems = [(("max", [1, 1], [[1, 1]], ["<="], [2]), "optimal", 2),
+                    (("max", [1, 0], [[1, -1]], ["<="], [1]), "unbounded", None),
+                    (("max", [1, 1], [[1, 1], [1, 1]], ["<=", ">="], [3, 1]), "feasible", None),
+                    (("max", [1, 1], [[1, 1], [1, 1]], ["<=", ">="], [1, 2]), "infeasible", None)]
+        path = os.path.join(tempfile.mkdtemp(), 'pl.txt')
+        for problem, status, optimal_val in problems:
+            benchmark.write_problem(path, *problem)
+            result = benchmark.time_simplexe(path)
+            self.assertEqual(result["status"], status)
+            self.assertEqual(result["optimal_val"], optimal_val)
+
+    def test_main(self):
+        """
+        main should write the results to a JSON file and fail on a regression
+        :return:
+        """
+        output = os.path.join(tempfile.mkdtemp(), 'bench.json')
+        self.assertEqual(benchmark.main(['-o', output, '--repeat', '1', '--family', 'klee_minty']), 0)
+        with open(output) as my_file:
+            report = json.load(my_file)
+        self.assertEqual(len(report['results']), 6)
+        for result in report['results']:
+            result['solve'] = result['parse'] = result['standardize'] = 0
+        with open(output, 'w') as my_file:
+            json.dump(report, my_file)
+        self.assertEqual(benchmark.main(['-o', output + '2', '--repeat', '1', '--family', 'klee_minty',
+                                         '--compare', output]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
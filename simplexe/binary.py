@@ -0,0 +1,146 @@
+"""
+Binary format of a PL, memory mapped by the reader so that a large PL loads without being parsed nor copied
+Usage: python binary.py [--sparse] INPUT OUTPUT, INPUT being a PL in the text format or in MPS format
+A file is a header of HEADER_SIZE bytes followed by sections, each one starting at a multiple of ALIGNMENT:
+    header: magic, flags (min, sparse, upper), number of rows, of variables and of non zeros
+    objective: float64[nb_var]
+    rhs: float64[nb_row]
+    upper: float64[nb_var], only with the upper flag, inf for no bound
+    signs: int8[nb_row], 1 for <=, -1 for >= and 0 for =
+    dense matrix: float64[nb_row, nb_var] row after row, or
+    sparse matrix: data float64[nnz], indices int64[nnz], indptr int64[nb_var + 1] of a CSCMatrix
+Every number is little endian. The sparse matrix is stored by columns since it is the storage of the
+solvers, the arrays being then used as they are mapped
+"""
+import argparse
+import struct
+import numpy as np
+import reader
+from sparse import CSCMatrix
+
+MAGIC = b"LPBIN\x00\x00\x01"
+HEADER = struct.Struct("<8sIIqqq")
+HEADER_SIZE = 64
+ALIGNMENT = 64  # A cache line, the start of the file being page aligned by the mapping
+MIN, SPARSE, UPPER = 1, 2, 4
+sign_codes = {"<=": 1, ">=": -1, "=": 0}
+code_signs = np.array(["=", "<=", ">="])  # Indexed by the code, -1 being the last one
+
+
+def layout(flags, nb_row, nb_var, nnz):
+    """
+    Sections of a file
+    :param flags: MIN, SPARSE and UPPER flags of the PL
+    :param nb_row: number of constraints
+    :param nb_var: number of variables
+    :param nnz: number of non zeros of a sparse matrix
+    :return: list of tuples of the name, dtype, shape and offset of each section, and the size of the file
+    """
+    sections = [("objective", "<f8", (nb_var,)), ("rhs", "<f8", (nb_row,))]
+    if flags & UPPER:
+        sections.append(("upper", "<f8", (nb_var,)))
+    sections.append(("signs", "i1", (nb_row,)))
+    if flags & SPARSE:
+        sections += [("data", "<f8", (nnz,)), ("indices", "<i8", (nnz,)), ("indptr", "<i8", (nb_var + 1,))]
+    else:
+        sections.append(("matrix", "<f8", (nb_row, nb_var)))
+    placed, offset = [], HEADER_SIZE
+    for name, dtype, shape in sections:
+        placed.append((name, dtype, shape, offset))
+        offset += -(-np.dtype(dtype).itemsize * int(np.prod(shape)) // ALIGNMENT) * ALIGNMENT
+    return placed, offset
+
+
+def write_problem(problem, file, sparse=None):
+    """
+    Write a PL in the binary format, the variable names being left out
+    :param problem: reader.Problem
+    :param file: file written
+    :param sparse: store the matrix as a CSCMatrix, as it is stored in the problem if None
+    """
+    matrix = problem.matrix
+    if sparse is None:
+        sparse = isinstance(matrix, CSCMatrix)
+    if sparse and not isinstance(matrix, CSCMatrix):
+        matrix = CSCMatrix.from_dense(matrix)
+    elif not sparse and isinstance(matrix, CSCMatrix):
+        matrix = matrix.toarray()
+    nb_row, nb_var = len(problem.rhs), len(problem.objective)
+    flags = (MIN if problem.max_min.lower() == "min" else 0) | (SPARSE if sparse else 0) \
+        | (UPPER if problem.upper is not None else 0)
+    nnz = matrix.nnz if sparse else 0
+    arrays = {"objective": problem.objective, "rhs": problem.rhs, "upper": problem.upper,
+              "signs": [sign_codes[sign] for sign in problem.signs]}
+    if sparse:
+        arrays.update(data=matrix.data, indices=matrix.indices, indptr=matrix.indptr)
+    else:
+        arrays["matrix"] = np.asarray(matrix, dtype=np.float64).reshape(nb_row, nb_var)
+
+    sections, size = layout(flags, nb_row, nb_var, nnz)
+    with open(file, "wb") as my_file:
+        my_file.write(HEADER.pack(MAGIC, flags, 0, nb_row, nb_var, nnz).ljust(HEADER_SIZE, b"\0"))
+        for name, dtype, shape, offset in sections:
+            my_file.seek(offset)
+            my_file.write(np.ascontiguousarray(arrays[name], dtype=dtype).reshape(shape).tobytes())
+        my_file.truncate(size)
+
+
+def read_problem(file):
+    """
+    Map a PL written by write_problem, the arrays of the Problem being read only views of the file
+    The pages are read when the solver uses them and are shared by every process mapping the same file,
+    only the list of the signs being built
+    :param file: file in the binary format
+    :return: reader.Problem, its matrix being a CSCMatrix if the file is sparse
+    """
+    try:
+        mapped = np.memmap(file, dtype=np.uint8, mode="r")
+    except (IOError, OSError):
+        raise FileNotFoundError("File not found. Try to check the name you provided.")
+    if len(mapped) < HEADER_SIZE:
+        raise ValueError("{} is not a binary PL file".format(file))
+    magic, flags, _, nb_row, nb_var, nnz = HEADER.unpack(bytes(mapped[:HEADER.size]))
+    if magic != MAGIC:
+        raise ValueError("{} is not a binary PL file".format(file))
+    sections, size = layout(flags, nb_row, nb_var, nnz)
+    if len(mapped) < size:
+        raise ValueError("{} is truncated".format(file))
+
+    arrays = {}
+    for name, dtype, shape, offset in sections:
+        nbytes = np.dtype(dtype).itemsize * int(np.prod(shape))
+        arrays[name] = mapped[offset:offset + nbytes].view(dtype).reshape(shape)
+    if flags & SPARSE:
+        matrix = CSCMatrix(arrays["data"], arrays["indices"], arrays["indptr"], (nb_row, nb_var))
+    else:
+        matrix = arrays["matrix"]
+    return reader.Problem("min" if flags & MIN else "max", arrays["objective"], matrix,
+                          code_signs[arrays["signs"]].tolist(), arrays["rhs"], upper=arrays.get("upper"))
+
+
+def convert(source, file, sparse=None):
+    """
+    Convert a PL file to the binary format
+    :param source: file in the text format, or in MPS format if it ends with .mps
+    :param file: binary file written
+    :param sparse: store the matrix as a CSCMatrix, only for MPS files if None
+    """
+    if source.lower().endswith(".mps"):
+        problem = reader.read_mps(source, sparse=sparse is not False)
+    else:
+        problem = reader.read_problem(source, sparse=bool(sparse))
+    write_problem(problem, file, sparse)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a PL file to the memory mapped binary format")
+    parser.add_argument("source", help="PL in the text format, or in MPS format if it ends with .mps")
+    parser.add_argument("file", help="binary file written, .lpb by convention")
+    parser.add_argument("--sparse", action="store_true", default=None, help="store the matrix by columns")
+    parser.add_argument("--dense", action="store_false", dest="sparse", help="store the whole matrix")
+    args = parser.parse_args(argv)
+    convert(args.source, args.file, args.sparse)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import binary
+import reader
+import PL
+from sparse import CSCMatrix
+
+
+class BinaryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def convert(self, source, sparse=None):
+        """
+        :param source: PL file converted
+        :param sparse: storage of the matrix, as in binary.convert
+        :return: name of the binary file
+        """
+        file = os.path.join(self.directory, os.path.basename(source) + ".lpb")
+        binary.convert(source, file, sparse)
+        return file
+
+    def test_round_trip(self):
+        """
+        read_problem should give back the PL written, dense or sparse, with its bounds
+        """
+        text = "min 1 -2 0\nub 4 inf 2\n1 0 3 <= 7\n0 -1 2 >= 1.5\n2 1 0 = 3"
+        problem = reader.parse_problem(text)
+        for sparse in (False, True):
+            file = os.path.join(self.directory, "round_trip.lpb")
+            binary.write_problem(problem, file, sparse)
+            self.assertEqual(os.path.getsize(file) % binary.ALIGNMENT, 0)
+            mapped = binary.read_problem(file)
+            self.assertEqual(mapped.max_min, "min")
+            self.assertEqual(mapped.signs, ["<=", ">=", "="])
+            np.testing.assert_array_equal(mapped.objective, problem.objective)
+            np.testing.assert_array_equal(mapped.rhs, problem.rhs)
+            np.testing.assert_array_equal(mapped.upper, problem.upper)
+            self.assertEqual(isinstance(mapped.matrix, CSCMatrix), sparse)
+            matrix = mapped.matrix.toarray() if sparse else mapped.matrix
+            np.testing.assert_array_equal(matrix, problem.matrix)
+
+    def test_zero_copy(self):
+        """
+        The arrays of a mapped PL should be read only views of the file, used by a sparse PL as they are
+        """
+        file = self.convert("file4.txt", sparse=True)
+        problem = binary.read_problem(file)
+        for array in (problem.objective, problem.rhs, problem.matrix.data, problem.matrix.indptr):
+            self.assertIsInstance(array.base, np.memmap)
+            self.assertFalse(array.flags.writeable)
+        my_PL = PL.PL(problem=problem, verbosity=PL.SILENT, sparse=True)
+        self.assertIs(my_PL.matrix, problem.matrix)
+
+    def test_solve(self):
+        """
+        A PL should have the same optimum from its binary file as from its text file
+        """
+        for source, value in (("file4.txt", 14.4), ("file5.txt", 27.5)):
+            for sparse in (False, True):
+                my_PL = PL.PL(self.convert(source, sparse), verbosity=PL.SILENT, sparse=sparse)
+                my_PL.standardize()
+                my_PL.solve()
+                self.assertAlmostEqual(float(my_PL.optimal_val), value)
+
+    def test_not_binary(self):
+        """
+        read_problem should refuse a file which is not in the binary format
+        """
+        with self.assertRaises(ValueError):
+            binary.read_problem("file4.txt")
+        file = self.convert("file4.txt")
+        with open(file, "r+b") as my_file:
+            my_file.truncate(binary.HEADER_SIZE + 8)
+        with self.assertRaises(ValueError):
+            binary.read_problem(file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import concurrent.futures
+import copy
+import heapq
+import itertools
+import math
+import PL
+
+tol = 1e-6
+
+
+def branch(my_PL, var, sign, value):
+    """
+    Child node: the PL of the parent with one more bound on a variable, solved from the parent basis
+    with the dual simplex
+    :param my_PL: solved PL of the parent node, left unchanged
+    :param var: index of the branching variable
+    :param sign: "<=" or ">="
+    :param value: bound of the variable
+    :return: solved PL of the child node
+    """
+    child = copy.deepcopy(my_PL)
+    child.add_constraint({var: 1}, sign, value)
+    child.reoptimize()
+    return child
+
+
+class BranchAndBound:
+    """
+    Integer PL solved by branch and bound on the PL relaxation
+    The open nodes are kept in a best bound queue, a node being pruned once its bound is not better
+    than the incumbent, and the children of a batch of nodes are solved in parallel
+    Attributes:
+        root: PL relaxation of the problem
+        integers: list of the index of the integer variables
+        workers: number of processes solving the nodes, the nodes being solved in this process if 1
+        max_nodes: number of nodes solved before stopping with the incumbent, no limit if None
+        status: None before the solve, then "optimal", "unbounded", "infeasible" or "node_limit"
+        optimal_val: value of the incumbent
+        solution: list of the values of the variables of the incumbent
+        nb_node: number of PL solved
+    """
+
+    def __init__(self, file='file_integer.txt', integers=None, workers=1, max_nodes=None, **kwargs):
+        """
+        Create the PL relaxation
+        :param file: file containing the PL
+        :param integers: index of the integer variables, all of them if None
+        :param workers: number of processes solving the nodes, the number of CPUs if None
+        :param max_nodes: number of nodes solved before stopping with the incumbent, no limit if None
+        :param kwargs: arguments of PL, the relaxation always using the tableau engine
+        """
+        kwargs.setdefault("verbosity", PL.SILENT)
+        self.root = PL.PL(file, engine="tableau", **kwargs)
+        self.integers = list(range(self.root.nb_var)) if integers is None else list(integers)
+        self.workers = workers
+        self.max_nodes = max_nodes
+        self.status = None
+        self.optimal_val = None
+        self.solution = None
+        self.nb_node = 0
+
+    def fractional_variable(self, solution):
+        """
+        Integer variable to branch on, the most fractional one
+        :param solution: list of the values of the variables
+        :return: index of the variable, None if the solution is integer
+        """
+        distances = [(abs(solution[var] - round(solution[var])), var) for var in self.integers]
+        distance, var = max(distances, default=(0, None))
+        return var if distance > tol else None
+
+    def solve(self):
+        """
+        Solve the integer PL
+        :return: optimal value, None if there is no integer solution
+        """
+        self.root.standardize()
+        self.root.solve()
+        self.nb_node = 1
+        if self.root.status != "optimal":
+            self.status = self.root.status
+            return None
+
+        sense = self.root.sense()
+        incumbent = -math.inf  # Bounds are compared as a max problem
+        counter = itertools.count()  # Ties of the queue are broken by the order of creation
+        queue = [(-sense * self.root.optimal_val, next(counter), self.root)]
+        executor = concurrent.futures.ProcessPoolExecutor(self.workers) if self.workers != 1 else None
+        try:
+            while queue:
+                if self.max_nodes is not None and self.nb_node >= self.max_nodes:
+                    self.status = "node_limit"
+                    break
+                nodes = []
+                while queue and len(nodes) < (self.workers or 1) * 2:
+                    bound, _, node = heapq.heappop(queue)
+                    if -bound <= incumbent + tol:  # The best open bound can not beat the incumbent
+                        queue = []
+                        break
+                    solution = node.get_solution()
+                    var = self.fractional_variable(solution)
+                    if var is None:
+                        incumbent, self.optimal_val, self.solution = -bound, node.optimal_val, solution
+                        continue
+                    nodes.extend([(node, var, "<=", math.floor(solution[var])),
+                                  (node, var, ">=", math.ceil(solution[var]))])
+                if executor is None:
+                    children = [branch(*arguments) for arguments in nodes]
+                else:
+                    children = executor.map(branch, *zip(*nodes)) if nodes else []
+                for child in children:
+                    self.nb_node += 1
+                    if child.status == "optimal" and sense * child.optimal_val > incumbent + tol:
+                        heapq.heappush(queue, (-sense * child.optimal_val, next(counter), child))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        if self.status is None:
+            self.status = "optimal" if self.solution is not None else "infeasible"
+        return self.optimal_val
+
+    def display_result(self):
+        """
+        Display the optimal value and the solution of the integer PL
+        """
+        print("Valeur optimale = {}".format(self.optimal_val))
+        print("Solution = {}".format(self.solution))
+
+
+if __name__ == "__main__":
+    my_BB = BranchAndBound('file_integer.txt')
+    my_BB.solve()
+    my_BB.display_result()
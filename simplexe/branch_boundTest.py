@@ -0,0 +1,51 @@
+import itertools
+import unittest
+import numpy as np
+import branch_bound
+import reader
+
+
+class BranchAndBoundTest(unittest.TestCase):
+
+    def test_solve(self):
+        """
+        solve should find the integer optimum of file_integer.txt, with one or several processes
+        :return:
+        """
+        for workers in (1, 2):
+            my_BB = branch_bound.BranchAndBound('file_integer.txt', workers=workers)
+            self.assertAlmostEqual(my_BB.solve(), 12)
+            self.assertEqual(my_BB.status, "optimal")
+            self.assertEqual([round(value) for value in my_BB.solution], [0, 0, 3, 2])
+
+    def test_enumeration(self):
+        """
+        The optimum should be the one found by enumerating every integer point
+        :return:
+        """
+        rng = np.random.default_rng(0)
+        for _ in range(10):
+            matrix, rhs, objective = rng.integers(1, 10, (3, 3)), rng.integers(10, 30, 3), rng.integers(-3, 10, 3)
+            problem = reader.Problem("max", objective, matrix, ["<="] * 3, rhs)
+            best = max(objective @ point for point in itertools.product(range(31), repeat=3)
+                       if np.all(matrix @ point <= rhs))
+            for exact in (False, True):
+                self.assertAlmostEqual(branch_bound.BranchAndBound(problem=problem, exact=exact).solve(), best)
+
+    def test_status(self):
+        """
+        Unbounded and infeasible integer PL should be reported
+        :return:
+        """
+        my_BB = branch_bound.BranchAndBound(problem=reader.parse_problem('max 1 1\n1 -1 <= 2'))
+        my_BB.solve()
+        self.assertEqual(my_BB.status, "unbounded")
+        my_BB = branch_bound.BranchAndBound(problem=reader.parse_problem('max 1\n2 = 1'))
+        self.assertIsNone(my_BB.solve())
+        self.assertEqual(my_BB.status, "infeasible")
+        my_BB = branch_bound.BranchAndBound(problem=reader.parse_problem('min 1 1\n2 2 >= 3'), integers=[0])
+        self.assertAlmostEqual(my_BB.solve(), 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
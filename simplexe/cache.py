@@ -0,0 +1,170 @@
+"""
+Cache of the solutions of PL already solved, keyed by a hash of their data
+A PL given to PL.PL with cache=SolutionCache(...) looks its solution up before solving it, so that a PL
+submitted again costs a hash instead of a simplex
+"""
+import collections
+import hashlib
+import os
+import pickle
+import tempfile
+import numpy as np
+from sparse import CSCMatrix
+
+
+def problem_key(problem, **options):
+    """
+    Canonical hash of a parsed PL, the same whatever the order of the keyword options, the storage of
+    the matrix (dense or CSCMatrix) and the type of the numbers (int or float)
+    :param problem: reader.Problem
+    :param options: settings changing the solution found, like exact or the engine
+    :return: string of the hexadecimal sha256 digest
+    """
+    objective = np.asarray(problem.objective, dtype=np.float64)
+    rhs = np.asarray(problem.rhs, dtype=np.float64)
+    matrix = problem.matrix
+    if not isinstance(matrix, CSCMatrix):
+        matrix = CSCMatrix.from_dense(np.asarray(matrix, dtype=np.float64).reshape(len(rhs), len(objective)))
+    digest = hashlib.sha256()
+    header = (problem.max_min.lower(), list(problem.signs), matrix.shape, problem.upper is not None,
+              sorted(options.items()))
+    digest.update(repr(header).encode("utf-8"))
+    arrays = [objective, rhs, matrix.data, matrix.indices, matrix.indptr]
+    if problem.upper is not None:
+        arrays.append(np.asarray(problem.upper, dtype=np.float64))
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+class SolutionCache:
+    """
+    Two tiers cache of the solutions of PL
+    The memory tier keeps the pickled entries of the most recently used PL, the least recently used ones
+    being evicted once max_bytes is reached. The disk tier, when a directory is given, keeps every entry
+    in a file of its own, written to a temporary file then renamed, so that several processes can share
+    the directory: a reader sees a whole entry or none
+    Attributes:
+        max_bytes: size of the pickled entries above which the memory tier evicts
+        directory: directory of the disk tier, None to keep the entries in memory only
+        entries: OrderedDict of the key and pickled entry, the most recently used last
+        nb_bytes: size of the pickled entries in memory
+        hits: number of entries found, in memory or on disk
+        misses: number of entries not found
+        nb_evicted: number of entries evicted from memory
+    """
+
+    def __init__(self, max_bytes=64 * 2 ** 20, directory=None):
+        """
+        :param max_bytes: size of the memory tier in bytes
+        :param directory: directory of the disk tier, created if needed, None for no disk tier
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.entries = collections.OrderedDict()
+        self.nb_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.nb_evicted = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries or (self.directory is not None and os.path.exists(self.path(key)))
+
+    def path(self, key):
+        """
+        :param key: key of an entry
+        :return: file of the entry in the disk tier, in a sub directory named after its first characters
+        """
+        return os.path.join(self.directory, key[:2], key + ".pkl")
+
+    def get(self, key):
+        """
+        Entry of a key, an entry found on disk being put in memory
+        :param key: key given by problem_key
+        :return: dict of the entry, None if there is none
+        """
+        data = self.entries.get(key)
+        if data is not None:
+            self.entries.move_to_end(key)
+        elif self.directory is not None:
+            data = self.read(key)
+            if data is not None:
+                self.remember(key, data)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pickle.loads(data)  # A new copy each time, the caller can not change the cache
+
+    def put(self, key, entry):
+        """
+        Store an entry in both tiers
+        :param key: key given by problem_key
+        :param entry: dict of the outcome of a solve
+        """
+        data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        self.remember(key, data)
+        if self.directory is not None:
+            self.write(key, data)
+
+    def remember(self, key, data):
+        """
+        Put a pickled entry in memory, evicting the least recently used ones beyond max_bytes
+        An entry larger than max_bytes is not kept in memory
+        :param key: key of the entry
+        :param data: bytes of the pickled entry
+        """
+        if key in self.entries:
+            self.nb_bytes -= len(self.entries.pop(key))
+        if len(data) > self.max_bytes:
+            return
+        self.entries[key] = data
+        self.nb_bytes += len(data)
+        while self.nb_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.nb_bytes -= len(evicted)
+            self.nb_evicted += 1
+
+    def read(self, key):
+        """
+        :param key: key of the entry
+        :return: bytes of the pickled entry on disk, None if there is none or it can not be read
+        """
+        try:
+            with open(self.path(key), "rb") as my_file:
+                data = my_file.read()
+            pickle.loads(data)  # A broken file is a miss, it is written again by the next solve
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        return data
+
+    def write(self, key, data):
+        """
+        Write an entry on disk atomically: into a temporary file of the same directory, then renamed
+        :param key: key of the entry
+        :param data: bytes of the pickled entry
+        """
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as my_file:
+                my_file.write(data)
+                my_file.flush()
+                os.fsync(my_file.fileno())
+            os.replace(temporary, path)  # Atomic, a concurrent writer of the same key writes the same entry
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def clear(self):
+        """
+        Empty the memory tier, the disk tier being left as it is
+        """
+        self.entries.clear()
+        self.nb_bytes = 0
@@ -0,0 +1,110 @@
+import os
+import pickle
+import tempfile
+import unittest
+import cache
+import reader
+import PL
+from sparse import CSCMatrix
+
+
+class CacheTest(unittest.TestCase):
+
+    def test_problem_key(self):
+        """
+        problem_key should not depend on the storage of the matrix nor on the type of the numbers, but on
+        every number, sign and option
+        """
+        problem = reader.parse_problem("max 1 3 1\n2 4 1 <= 7\n3 -1 2 <= 3")
+        key = cache.problem_key(problem, exact=False)
+        same = reader.Problem("MAX", [1., 3., 1.], CSCMatrix.from_dense([[2, 4, 1], [3, -1, 2]]), ["<=", "<="],
+                              [7, 3])
+        self.assertEqual(cache.problem_key(same, exact=False), key)
+        self.assertNotEqual(cache.problem_key(problem, exact=True), key)
+        changed = reader.parse_problem("max 1 3 1\n2 4 1 <= 7\n3 -1 2 >= 3")
+        self.assertNotEqual(cache.problem_key(changed, exact=False), key)
+        changed = reader.parse_problem("max 1 3 1\n2 4 1 <= 7\n3 -1 2 <= 4")
+        self.assertNotEqual(cache.problem_key(changed, exact=False), key)
+
+    def test_lru(self):
+        """
+        The memory tier should evict the least recently used entries once it is full
+        """
+        size = len(pickle.dumps({"value": "a" * 50}, protocol=pickle.HIGHEST_PROTOCOL))
+        solutions = cache.SolutionCache(max_bytes=2 * size)
+        for key in "abc":
+            solutions.put(key, {"value": key * 50})
+            solutions.get("a")  # a is kept as the most recently used
+        self.assertIn("a", solutions)
+        self.assertNotIn("b", solutions)
+        self.assertEqual(solutions.nb_bytes, 2 * size)
+        self.assertEqual(solutions.nb_evicted, 1)
+        self.assertIsNone(solutions.get("b"))
+        self.assertEqual((solutions.hits, solutions.misses), (3, 1))
+
+    def test_disk(self):
+        """
+        The disk tier should give the entries back to another cache sharing its directory
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            cache.SolutionCache(directory=directory).put("abcd", {"optimal_val": 1.5})
+            solutions = cache.SolutionCache(directory=directory)
+            self.assertEqual(solutions.get("abcd"), {"optimal_val": 1.5})
+            self.assertEqual(len(solutions), 1)
+            self.assertEqual(os.listdir(os.path.join(directory, "ab")), ["abcd.pkl"])  # No temporary file left
+            with open(solutions.path("abcd"), "wb") as my_file:
+                my_file.write(b"broken")
+            self.assertIsNone(cache.SolutionCache(directory=directory).get("abcd"))
+
+    def test_solve(self):
+        """
+        A PL solved again should be answered by the cache with the outcome of the first solve
+        """
+        solutions = cache.SolutionCache()
+        first = PL.PL('file4.txt', verbosity=PL.SILENT, cache=solutions)
+        first.standardize()
+        result = first.solve()
+        second = PL.PL('file4.txt', verbosity=PL.SILENT, cache=solutions)
+        second.standardize()
+        cached = second.solve()
+        self.assertIsNotNone(second.cache_entry)
+        self.assertEqual(solutions.hits, 1)
+        self.assertEqual(cached.optimal_val, result.optimal_val)
+        self.assertEqual(cached.solution, result.solution)
+        self.assertEqual(cached.nb_iteration, result.nb_iteration)
+        self.assertEqual(second.get_solution(), result.solution)
+        self.assertEqual(second.cache_entry["basis"], first.get_basis())
+
+        second.set_objective({0: 10})  # The PL changed, it is solved again
+        self.assertIsNone(second.cache_key)
+        second.reoptimize()
+        expected = PL.PL('file4.txt', verbosity=PL.SILENT)
+        expected.standardize()
+        expected.set_objective({0: 10})
+        expected.solve()
+        self.assertAlmostEqual(second.optimal_val, expected.optimal_val)
+        self.assertEqual(solutions.hits, 1)
+
+    def test_options(self):
+        """
+        PL solved with options changing their outcome should get entries of their own
+        """
+        solutions = cache.SolutionCache()
+        results = {}
+        for pricing in ("first", "dantzig"):
+            my_PL = PL.PL('file2.txt', verbosity=PL.SILENT, cache=solutions, pricing=pricing)
+            my_PL.standardize()
+            results[pricing] = my_PL.solve()
+            self.assertIsNone(my_PL.cache_entry)
+        self.assertEqual(len(solutions), 2)
+        self.assertNotEqual(results["first"].nb_iteration, results["dantzig"].nb_iteration)
+        for options in ({"crossover": False}, {"max_iterations": 100}, {"stall_limit": 10}):
+            my_PL = PL.PL('file2.txt', verbosity=PL.SILENT, cache=solutions, engine="interior", **options)
+            my_PL.solve()
+            self.assertIsNone(my_PL.cache_entry)
+        self.assertEqual(len(solutions), 5)
+        self.assertEqual(solutions.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
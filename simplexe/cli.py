@@ -0,0 +1,174 @@
+"""
+lp-solve: solve PL given as files or as a stream of PL on stdin, printing one line per PL
+Usage: lp-solve [FILE ...] [--engine ENGINE] [--exact] [--max-iterations N] [--text] [--server ADDRESS]
+Without files, or with the file -, the PL are read from stdin one after the other, each one starting at its
+"max" or "min" line, and each one is solved as soon as the next one starts, so that a pipeline gets its
+answers while it is still writing
+A file is read in the format of its extension as PL(file) does, MPS for .mps and binary for .lpb
+With --server the PL are sent to a running server.py, given as the path of its Unix socket or as
+HOST:PORT, and numpy is only imported to read a .mps or .lpb file: the command then starts in the time
+of python itself
+The module only imports the standard library, PL being imported by the first local solve
+"""
+import argparse
+import json
+import sys
+
+IMPORT_BUDGET = 0.05  # Seconds that "import cli" may take, checked by cliTest
+headers = ("max", "min")
+file_formats = (".mps", ".lpb")  # Read by PL.read_file, the other files being in the text format
+
+
+def iter_problems(stream, name="stdin"):
+    """
+    Split a stream of PL in the text format, each PL starting at its "max" or "min" line
+    :param stream: text stream
+    :param name: name of the stream, the PL being named name:1, name:2...
+    :return: generator of tuples of the name and the text of each PL
+    """
+    lines = []
+    number = 0
+    for line in stream:
+        words = line.split(None, 1)
+        if words and words[0].lower() in headers and lines:
+            number += 1
+            yield "{}:{}".format(name, number), "".join(lines)
+            lines = []
+        if words or lines:
+            lines.append(line)
+    if lines:
+        yield "{}:{}".format(name, number + 1), "".join(lines)
+
+
+def iter_sources(files, stdin=None):
+    """
+    PL of the command line, a file standing for one PL and - for the stream of stdin
+    :param files: list of file names, stdin being read if it is empty
+    :param stdin: text stream read for -, sys.stdin if None
+    :return: generator of tuples of the name and the text of each PL, the text being None for a file
+        in one of file_formats, or of the name and the error when a file can not be read
+    """
+    for file in files or ["-"]:
+        if file == "-":
+            yield from iter_problems(stdin or sys.stdin)
+            continue
+        if file.lower().endswith(file_formats):  # Read by the solver, as PL(file) would
+            yield file, None
+            continue
+        try:
+            with open(file, encoding='utf-8') as my_file:
+                yield file, my_file.read()
+        except OSError as e:
+            yield file, e
+
+
+def local_solver(options):
+    """
+    :param options: dict of the engine, exact and max_iterations
+    :return: function solving in this process the text of a PL, or its file when the text is None
+    """
+    import server  # Imports numpy, only paid for when solving locally
+
+    def solve(text, file):
+        return server.solve_file(file, **options) if text is None else server.solve_text(text, **options)
+
+    return solve
+
+
+def connect(address):
+    """
+    :param address: path of the Unix socket of the server, or HOST:PORT
+    :return: client.Client connected to the server
+    """
+    import client
+
+    host, _, port = address.rpartition(":")
+    if port.isdigit():
+        return client.Client(host=host or "127.0.0.1", port=int(port))
+    return client.Client(address)
+
+
+def remote_solver(connection, options):
+    """
+    The server reads the text format only: a file in one of file_formats is read here, numpy being
+    then imported, and sent as text
+    :param connection: client.Client connected to the server
+    :param options: dict of the engine, exact and max_iterations
+    :return: function solving on the server the text of a PL, or its file when the text is None
+    """
+    def solve(text, file):
+        if text is None:
+            try:
+                import PL
+                import reader
+
+                text = reader.format_problem(PL.read_file(file))
+            except Exception as e:
+                return {"status": "error", "error": "{}: {}".format(type(e).__name__, e)}
+        return connection.solve(text, **options)
+
+    return solve
+
+
+def format_answer(name, answer, text=False):
+    """
+    :param name: name of the PL
+    :param answer: dict of the answer of server.solve_text
+    :param text: human readable line instead of JSON
+    :return: string of the line printed for the PL
+    """
+    if not text:
+        return json.dumps(dict(name=name, **answer))
+    if answer["status"] == "optimal":
+        return "{}: optimal {:g} [{}]".format(name, answer["optimal_val"],
+                                              " ".join("{:g}".format(value) for value in answer["solution"]))
+    if answer.get("error"):
+        return "{}: {} {}".format(name, answer["status"], answer["error"])
+    return "{}: {}".format(name, answer["status"])
+
+
+def main(argv=None, stdin=None, stdout=None):
+    """
+    :param argv: list of the arguments, sys.argv[1:] if None
+    :param stdin: text stream read for -, sys.stdin if None
+    :param stdout: text stream written to, sys.stdout if None
+    :return: exit code, 1 if a PL could not be read or solved, 0 otherwise
+    """
+    parser = argparse.ArgumentParser(prog="lp-solve", description="Solve PL, one line per PL")
+    parser.add_argument("files", nargs="*", help="files of PL, in MPS format for .mps, in the binary format for "
+                                                 ".lpb and in the text format otherwise, - or nothing for stdin")
+    parser.add_argument("--engine", help="tableau, revised, dual, interior or auto")
+    parser.add_argument("--exact", action="store_true", help="pivot with exact integers")
+    parser.add_argument("--max-iterations", type=int, help="number of iterations after which a solve stops")
+    parser.add_argument("--text", action="store_true", help="human readable lines instead of JSON")
+    parser.add_argument("--server", help="solve on a server.py, path of its Unix socket or HOST:PORT")
+    args = parser.parse_args(argv)
+    stdout = stdout or sys.stdout
+
+    options = {"engine": args.engine, "exact": args.exact, "max_iterations": args.max_iterations}
+    solve = connection = None
+    code = 0
+    try:
+        for name, problem in iter_sources(args.files, stdin):
+            if isinstance(problem, Exception):
+                answer = {"status": "error", "error": "{}: {}".format(type(problem).__name__, problem)}
+            else:
+                if solve is None:  # Nothing imported nor connected before the first PL
+                    if args.server:
+                        connection = connect(args.server)
+                        solve = remote_solver(connection, options)
+                    else:
+                        solve = local_solver(options)
+                answer = solve(problem, name)
+            if answer["status"] == "error":
+                code = 1
+            stdout.write(format_answer(name, answer, args.text) + "\n")
+            stdout.flush()
+    finally:
+        if connection is not None:
+            connection.close()
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
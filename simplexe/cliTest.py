@@ -0,0 +1,85 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+import cli
+
+
+class CliTest(unittest.TestCase):
+
+    def test_iter_problems(self):
+        """
+        iter_problems should split a stream at each max or min line, blank lines included or not
+        """
+        stream = io.StringIO("\nmax 1 2\n1 1 <= 4\n\nMIN 1\n1 >= 2\nmax 3\n1 <= 1\n")
+        self.assertEqual(list(cli.iter_problems(stream)),
+                         [("stdin:1", "max 1 2\n1 1 <= 4\n\n"), ("stdin:2", "MIN 1\n1 >= 2\n"),
+                          ("stdin:3", "max 3\n1 <= 1\n")])
+
+    def test_main(self):
+        """
+        main should print one line per PL of the files and of stdin, in their order
+        """
+        stdout = io.StringIO()
+        code = cli.main(["file5.txt", "-", "no_file.txt", "--text"],
+                        stdin=io.StringIO("max 1 2\n1 1 <= 4\nmax 1 1\n1 -1 <= 1\n"), stdout=stdout)
+        self.assertEqual(code, 1)
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(lines[:3], ["file5.txt: optimal 27.5 [0 5.5]", "stdin:1: optimal 8 [0 4]",
+                                     "stdin:2: unbounded"])
+        self.assertTrue(lines[3].startswith("no_file.txt: error"))
+
+        stdout = io.StringIO()
+        with open("file4.txt") as my_file:
+            self.assertEqual(cli.main(["--engine", "revised"], stdin=my_file, stdout=stdout), 0)
+        self.assertAlmostEqual(cli.json.loads(stdout.getvalue())["optimal_val"], 14.4)
+
+    def test_file_formats(self):
+        """
+        A .mps or .lpb file should be read in its format, locally and when sent to a server
+        """
+        import binary
+        import serverTest
+
+        file = os.path.join(tempfile.mkdtemp(), "file5.lpb")
+        binary.convert("file5.txt", file)
+        stdout = io.StringIO()
+        self.assertEqual(cli.main([file, "--text"], stdout=stdout), 0)
+        self.assertEqual(stdout.getvalue(), "{}: optimal 27.5 [0 5.5]\n".format(file))
+
+        path = os.path.join(tempfile.mkdtemp(), "lp.sock")
+        solve_server, _ = serverTest.ServerTest.start(self, path, workers=1, use_threads=True)
+        stdout = io.StringIO()
+        self.assertEqual(cli.main([file, "file4.txt", "--text", "--server", path], stdout=stdout), 0)
+        self.assertEqual(stdout.getvalue().splitlines()[0], "{}: optimal 27.5 [0 5.5]".format(file))
+        self.assertEqual(solve_server.nb_solved, 2)
+        for _ in range(100):  # The connection is closed at the end of main, then by the server
+            if not solve_server.connections:
+                break
+            time.sleep(0.01)
+        self.assertEqual(solve_server.connections, set())
+
+    def test_import_budget(self):
+        """
+        Importing cli should take less than IMPORT_BUDGET without numpy, and PL should not import tabulate
+        """
+        code = "import sys, time; start = time.perf_counter(); import {}; " \
+               "print(time.perf_counter() - start, 'numpy' in sys.modules, 'tabulate' in sys.modules)"
+        directory = os.path.dirname(os.path.abspath(cli.__file__))
+
+        def run(module):
+            output = subprocess.run([sys.executable, "-c", code.format(module)], cwd=directory, check=True,
+                                    capture_output=True, text=True).stdout.split()
+            return float(output[0]), output[1] == "True", output[2] == "True"
+
+        seconds = min(run("cli")[0] for _ in range(3))  # The best of a few runs, the machine being shared
+        self.assertLess(seconds, cli.IMPORT_BUDGET)
+        self.assertEqual(run("cli")[1:], (False, False))
+        self.assertEqual(run("PLInt")[1:], (True, False))
+
+
+if __name__ == '__main__':
+    unittest.main()
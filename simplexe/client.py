@@ -0,0 +1,136 @@
+"""
+Client of server.SolveServer
+Only the standard library is imported, so that a service sending PL to the server never pays for numpy
+    with Client("/tmp/lp.sock") as client:
+        answer = client.solve("max 1 2\\n1 1 <= 4\\n")
+"""
+import itertools
+import json
+import socket
+
+DEFAULT_PORT = 7640  # Same as server.DEFAULT_PORT, not imported since the server imports numpy
+
+
+class Client:
+    """
+    Connection to a solve server, sending one JSON line per PL and reading one JSON line per answer
+    A Client is not shared between threads, each thread opening its own connection
+    Attributes:
+        sock: socket connected to the server
+        my_file: binary file reading the answers from the socket
+        ids: counter giving the id of each request
+    """
+
+    def __init__(self, path=None, host="127.0.0.1", port=DEFAULT_PORT, connect_timeout=None):
+        """
+        Connect to the server, on a Unix socket if a path is given and on TCP otherwise
+        :param path: file of the Unix socket
+        :param host: address of the server with TCP
+        :param port: TCP port
+        :param connect_timeout: seconds given to the connection, the answers being waited for as long as
+            the server takes, which answers "timeout" itself
+        """
+        if path is not None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address = path
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # A request is a single write
+            address = (host, port)
+        self.sock.settimeout(connect_timeout)
+        try:
+            self.sock.connect(address)
+        except OSError:
+            self.sock.close()
+            raise
+        self.sock.settimeout(None)
+        self.my_file = self.sock.makefile("rb")
+        self.ids = itertools.count(1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Close the connection
+        """
+        self.my_file.close()
+        self.sock.close()
+
+    @staticmethod
+    def request(problem, engine=None, exact=False, max_iterations=None, timeout=None):
+        """
+        :param problem: string of the PL in the text format
+        :param engine: name of the engine, the default of PL.PL if None
+        :param exact: pivot with exact integers
+        :param max_iterations: number of iterations after which the solve stops, no limit if None
+        :param timeout: seconds given to the PL by the server, the default of the server if None
+        :return: dict of the request, without its id
+        """
+        request = {"problem": problem, "engine": engine, "exact": exact, "max_iterations": max_iterations}
+        if timeout is not None:
+            request["timeout"] = timeout
+        return request
+
+    def send(self, request):
+        """
+        :param request: dict given by request
+        :return: id given to the request
+        """
+        request_id = next(self.ids)
+        self.sock.sendall(json.dumps(dict(request, id=request_id)).encode("utf-8") + b"\n")
+        return request_id
+
+    def receive(self, request_id):
+        """
+        :param request_id: id of the request answered next
+        :return: dict of the answer
+        """
+        line = self.my_file.readline()
+        if not line:
+            raise ConnectionError("Connection closed by the server")
+        answer = json.loads(line)
+        if answer.get("id") not in (request_id, None):  # None when the request could not be read
+            raise ConnectionError("Answer to request {} while waiting for {}".format(answer.get("id"), request_id))
+        return answer
+
+    def solve(self, problem, **options):
+        """
+        Solve a PL on the server
+        :param problem: string of the PL in the text format
+        :param options: engine, exact, max_iterations and timeout, as in request
+        :return: dict of the status, "optimal", "unbounded", "infeasible", "iteration_limit", "timeout"
+            or "error", the optimal value, the solution, the number of iterations and the wall time of
+            the solve, with an error message when the status is "timeout" or "error"
+        """
+        return self.receive(self.send(self.request(problem, **options)))
+
+    def solve_file(self, file, **options):
+        """
+        Solve a PL file on the server, the file being read by the client
+        :param file: file containing the PL in the text format
+        :param options: engine, exact, max_iterations and timeout, as in request
+        :return: dict of the answer, as solve
+        """
+        with open(file, encoding='utf-8') as my_file:
+            return self.solve(my_file.read(), **options)
+
+    def solve_many(self, problems, window=16, **options):
+        """
+        Solve several PL, up to window of them being sent before their answers are read so that the
+        round trips overlap with the solves
+        :param problems: iterable of the strings of the PL
+        :param window: number of requests sent ahead of the answers
+        :param options: engine, exact, max_iterations and timeout, as in request
+        :return: generator of the answers, in the order of the PL
+        """
+        pending = []
+        for problem in problems:
+            pending.append(self.send(self.request(problem, **options)))
+            if len(pending) >= window:
+                yield self.receive(pending.pop(0))
+        for request_id in pending:
+            yield self.receive(request_id)
@@ -0,0 +1,133 @@
+import numpy as np
+
+
+class CutPool:
+    """
+    Table of an integer PL kept in a buffer allocated ahead, with room for the cuts and their slack
+    columns
+    A cut adds a row and a slack column put before the b column: only the b column is moved and the
+    new row is written, the buffer doubling when it is full. A cut whose slack variable is back in the
+    basis is inactive, it is purged with its column by moving the last cut in its place
+    Attributes:
+        buffer: ndarray holding the table in its top left corner, None until a table is attached
+        nb_row: number of rows of the table
+        nb_col: number of columns of the table, b included
+        columns: index of the slack column of each cut
+        ages: number of pivots in a row each cut has been inactive
+        nb_purged: number of cuts purged since the table was attached
+    """
+
+    def __init__(self, capacity=16, patience=8):
+        """
+        :param capacity: number of cuts the buffer can hold before it grows
+        :param patience: number of pivots a cut stays inactive before it is purged
+        """
+        self.capacity = capacity
+        self.patience = patience
+        self.buffer = None
+        self.nb_row = 0
+        self.nb_col = 0
+        self.columns = []
+        self.ages = []
+        self.nb_purged = 0
+
+    def table(self):
+        """
+        :return: view of the table in the buffer, pivoted in place by the PL
+        """
+        return self.buffer[:self.nb_row, :self.nb_col]
+
+    def attach(self, table):
+        """
+        Copy a table into a new buffer, unless it is already the view of the buffer
+        :param table: ndarray of the table, without any cut
+        :return: view of the table in the buffer
+        """
+        if self.buffer is not None and table.base is self.buffer and table.shape == (self.nb_row, self.nb_col):
+            return table
+        self.nb_row, self.nb_col = table.shape
+        self.buffer = np.zeros((self.nb_row + self.capacity, self.nb_col + self.capacity), dtype=table.dtype)
+        self.buffer[:self.nb_row, :self.nb_col] = table
+        self.columns = []
+        self.ages = []
+        self.nb_purged = 0
+        return self.table()
+
+    def is_full(self):
+        """
+        :return: boolean telling if the buffer has no room left for a cut
+        """
+        return self.nb_row == len(self.buffer) or self.nb_col == self.buffer.shape[1]
+
+    def grow(self):
+        """
+        Double the room left for the cuts
+        """
+        self.capacity = max(self.capacity, len(self.columns), 1) * 2
+        buffer = np.zeros((self.nb_row + self.capacity, self.nb_col + self.capacity), dtype=self.buffer.dtype)
+        buffer[:self.nb_row, :self.nb_col] = self.table()
+        self.buffer = buffer
+
+    def add(self, row):
+        """
+        Add a cut, its slack column being put before the b column
+        :param row: cut as a row of the table, the coefficient of its slack variable being 1
+        :return: view of the table in the buffer, the cut being the last row
+        """
+        if self.is_full():
+            self.grow()
+        slack = self.nb_col - 1
+        self.buffer[:self.nb_row, slack + 1] = self.buffer[:self.nb_row, slack]  # Move b
+        self.buffer[:self.nb_row, slack] = 0
+        self.buffer[self.nb_row, :slack] = row[:-1]
+        self.buffer[self.nb_row, slack] = 1
+        self.buffer[self.nb_row, slack + 1] = row[-1]
+        self.columns.append(slack)
+        self.ages.append(0)
+        self.nb_row += 1
+        self.nb_col += 1
+        return self.table()
+
+    def inactive(self):
+        """
+        Cuts whose slack column is basic: zero in the objective row and in every other row
+        :return: list of tuples of the row number and the index of the slack column of each cut
+        """
+        table = self.table()
+        cuts = []
+        for col in self.columns:
+            nonzero = np.flatnonzero(np.asarray(table[1:, col] != 0, dtype=bool))
+            if table[0, col] == 0 and len(nonzero) == 1:
+                cuts.append((int(nonzero[0]) + 1, col))
+        return cuts
+
+    def purge(self):
+        """
+        Count one more pivot for the inactive cuts, then remove with their row and slack column the
+        ones inactive for patience pivots, every inactive one if the buffer is full, the last row and
+        the last cut taking their places
+        :return: view of the table in the buffer
+        """
+        inactive = {col for _, col in self.inactive()}
+        self.ages = [age + 1 if col in inactive else 0 for col, age in zip(self.columns, self.ages)]
+        full = self.is_full()
+        cuts = [(row_num, col) for row_num, col in self.inactive()
+                if full or self.ages[self.columns.index(col)] >= self.patience]
+        while cuts:  # The places of the other cuts may change, they are looked for again
+            row_num, col = cuts[0]
+            last_row, last_col = self.nb_row - 1, self.nb_col - 2
+            self.buffer[row_num, :self.nb_col] = self.buffer[last_row, :self.nb_col]
+            self.buffer[last_row, :self.nb_col] = 0
+            self.nb_row -= 1
+            self.buffer[:self.nb_row, col] = self.buffer[:self.nb_row, last_col]
+            self.buffer[:self.nb_row, last_col] = self.buffer[:self.nb_row, last_col + 1]  # Move b
+            self.buffer[:, last_col + 1] = 0
+            self.nb_col -= 1
+            index = self.columns.index(col)
+            del self.columns[index], self.ages[index]
+            if last_col in self.columns:
+                self.columns[self.columns.index(last_col)] = col
+            self.nb_purged += 1
+            cuts = [(row_num, col) for row_num, col in self.inactive()
+                    if full or self.ages[self.columns.index(col)] >= self.patience]
+        return self.table()
@@ -0,0 +1,100 @@
+import unittest
+import numpy as np
+import cuts
+import PL
+import PLInt
+import reader
+
+
+class CutsTest(unittest.TestCase):
+
+    def test_add(self):
+        """
+        add should put the slack column of the cut before the b column and grow the buffer when full
+        """
+        pool = cuts.CutPool(capacity=1)
+        table = pool.attach(np.array([[1, 2, 0, 0], [3, 4, 1, 5]], dtype=object))
+        table = pool.add(np.array([1, 1, 0, 2], dtype=object))
+        self.assertEqual(table.tolist(), [[1, 2, 0, 0, 0], [3, 4, 1, 0, 5], [1, 1, 0, 1, 2]])
+        table = pool.add(np.array([0, 1, 0, 0, 1], dtype=object))
+        self.assertEqual(table.tolist(), [[1, 2, 0, 0, 0, 0], [3, 4, 1, 0, 0, 5], [1, 1, 0, 1, 0, 2],
+                                          [0, 1, 0, 0, 1, 1]])
+        self.assertIs(table.base, pool.buffer)
+        self.assertEqual(pool.columns, [3, 4])
+        self.assertIs(pool.attach(table), table)
+
+    def test_purge(self):
+        """
+        purge should remove the cuts whose slack column is basic with the row of their slack
+        """
+        pool = cuts.CutPool(patience=1)
+        pool.attach(np.array([[1, 2, 0, 0], [3, 4, 1, 5]], dtype=object))
+        pool.add(np.array([1, 1, 0, 2], dtype=object))
+        table = pool.add(np.array([0, 1, 0, 0, 1], dtype=object))
+        table[0, 4] = -1  # The second cut is active
+        table = pool.purge()
+        self.assertEqual(table.tolist(), [[1, 2, 0, -1, 0], [3, 4, 1, 0, 5], [0, 1, 0, 1, 1]])
+        self.assertEqual(pool.columns, [3])
+        self.assertEqual(pool.nb_purged, 1)
+
+    def test_patience(self):
+        """
+        purge should keep an inactive cut for patience pivots, unless the buffer is full
+        """
+        pool = cuts.CutPool(capacity=2, patience=2)
+        pool.attach(np.array([[1, 2, 0, 0], [3, 4, 1, 5]], dtype=object))
+        pool.add(np.array([1, 1, 0, 2], dtype=object))
+        self.assertEqual(len(pool.purge()), 3)
+        self.assertEqual(pool.ages, [1])
+        self.assertEqual(len(pool.purge()), 2)
+        self.assertEqual(pool.columns, [])
+        pool.add(np.array([1, 1, 0, 2], dtype=object))
+        pool.add(np.array([0, 1, 0, 0, 1], dtype=object))
+        self.assertTrue(pool.is_full())
+        self.assertEqual(len(pool.purge()), 2)
+        self.assertEqual(pool.nb_purged, 3)
+
+    def test_integer_solve(self):
+        """
+        PLInt should find the integer optimum while purging its inactive cuts
+        """
+        my_PL = PLInt.PLInt('file_integer.txt', verbosity=PL.SILENT, capacity=1)
+        my_PL.standardize()
+        my_PL.solve()
+        self.assertEqual(my_PL.optimal_val, 12)
+        self.assertLessEqual(len(my_PL.table), 3 + len(my_PL.cuts.columns))
+
+    def test_no_cycle(self):
+        """
+        The cuts should not be purged so early that the pseudo pivots make them again and cycle
+        """
+        for file, optimal_val in (("file3.txt", 20), ("file4.txt", 12)):
+            for capacity in (1, 16):
+                my_PL = PLInt.PLInt(file, verbosity=PL.SILENT, capacity=capacity)
+                my_PL.standardize()
+                my_PL.solve()
+                self.assertEqual(my_PL.status, "optimal")
+                self.assertEqual(my_PL.optimal_val, optimal_val)
+
+    def test_first_phase(self):
+        """
+        PLInt should reach an integer realisable basis with the all integer dual simplex when the basis of
+        the slack variables is not realisable, and tell when there is no integer solution
+        """
+        for text, status, optimal_val in (('max 1 1\n2 2 <= 7\n1 0 >= 1', "optimal", 3),
+                                          ('max -1 -1\n1 1 >= 3\n2 0 = 2', "optimal", -3),
+                                          ('max 1 0\n2 0 = 1\n1 1 <= 3', "infeasible", None),
+                                          ('max 1 1\n1 1 <= 1\n1 1 >= 2', "infeasible", None)):
+            my_PL = PLInt.PLInt("", verbosity=PL.SILENT, problem=reader.parse_problem(text))
+            my_PL.standardize()
+            my_PL.solve()
+            self.assertEqual((my_PL.status, my_PL.optimal_val), (status, optimal_val))
+        my_PL = PLInt.PLInt('file4.txt', verbosity=PL.SILENT)
+        my_PL.standardize()
+        result = my_PL.solve()
+        self.assertEqual(result.solution, [3, 2, 0, 0])
+        self.assertGreater(my_PL.nb_iteration_phase1, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,3 +8,15 @@ class SolutionNonBorneeError(Exception):
     """
     Raised when there is no solution
     """
+
+
+class SolutionNonRealisableError(Exception):
+    """
+    Raised when the constraints can not be satisfied
+    """
+
+
+class IterationLimitError(Exception):
+    """
+    Raised when the simplex reaches its maximum number of iterations
+    """
@@ -0,0 +1,272 @@
+import numpy as np
+import exceptions
+from revised import RevisedSimplex, slack_coefficients
+from sparse import CSCMatrix
+
+
+def triangular_solve(lower, rhs, transpose=False, block_size=64):
+    """
+    Solve L x = rhs, or L^T x = rhs, block of rows by block of rows so that most of the work is a
+    matrix product
+    :param lower: lower triangular ndarray L
+    :param rhs: ndarray
+    :param transpose: solve with L^T, which is upper triangular
+    :param block_size: number of rows solved at once
+    :return: ndarray x
+    """
+    size = len(rhs)
+    x = np.zeros(size)
+    if not transpose:
+        for start in range(0, size, block_size):
+            end = min(start + block_size, size)
+            x[start:end] = np.linalg.solve(lower[start:end, start:end],
+                                           rhs[start:end] - lower[start:end, :start] @ x[:start])
+    else:
+        upper = lower.T
+        for end in range(size, 0, -block_size):
+            start = max(end - block_size, 0)
+            x[start:end] = np.linalg.solve(upper[start:end, start:end],
+                                           rhs[start:end] - upper[start:end, end:] @ x[end:])
+    return x
+
+
+def cholesky(matrix):
+    """
+    Cholesky factorization of a symmetric matrix, a small multiple of the identity being added when it
+    is not positive definite, as with redundant rows
+    :param matrix: symmetric ndarray, changed by the regularization
+    :return: lower triangular ndarray L, L L^T = matrix
+    """
+    regularization = 1e-14 * max(1., np.abs(np.diag(matrix)).max(initial=0))
+    while True:
+        try:
+            return np.linalg.cholesky(matrix)
+        except np.linalg.LinAlgError:
+            matrix[np.diag_indices_from(matrix)] += regularization
+            regularization *= 100
+
+
+def cholesky_solve(lower, rhs):
+    """
+    Solve L L^T x = rhs
+    :param lower: lower triangular ndarray L
+    :param rhs: ndarray
+    :return: ndarray x
+    """
+    return triangular_solve(lower, triangular_solve(lower, rhs), transpose=True)
+
+
+class InteriorPoint:
+    """
+    Primal-dual interior point method for max c x subject to A x (<=, >= or =) b, x >= 0
+    The PL is put in the standard form min -c x subject to A x + S s = b, x, s >= 0, the slack
+    variables s having the column S of the signs. Each iteration is a Mehrotra predictor-corrector step
+    on the primal x, the duals y and the reduced costs z, the two directions being found with the same
+    Cholesky factorization of the normal equations A X Z^-1 A^T dy = r. The points are inside the
+    positive orthant and only tend to the optimum, the crossover then finds an optimal basis with a
+    few pivots of the revised simplex, so that the optimal value is the one of the simplex
+    Attributes:
+        nb_var: number of original variables
+        objective, matrix, signs, rhs: PL as given, kept for the crossover
+        standard: dense ndarray of the standard form constraints, the variables then the slack variables
+        slack_rows: row of each slack variable
+        cost: objective coefficients of the standard form, as a min problem
+        b: right hand side
+        tol: relative residuals and duality gap under which the point is optimal
+        max_iterations: number of iterations after which the method gives up
+        crossover: boolean telling if an optimal basis is looked for from the last point
+        max_pivots: number of pivots of the crossover after which IterationLimitError is raised, no limit
+            if None
+        x, y, z: primal, dual and reduced costs of the last point, of the standard form
+        basis: list of the basic column of each row found by the crossover (columns of RevisedSimplex),
+            None without crossover
+        solution: values of the original variables at the optimum
+        optimal_val: optimal value
+        nb_iteration: number of interior point iterations
+        crossover_iterations: number of pivots of the crossover
+    """
+
+    def __init__(self, objective, matrix, signs, rhs, tol=1e-8, max_iterations=100, crossover=True,
+                 max_pivots=None):
+        """
+        :param objective: list of the objective coefficients
+        :param matrix: multidimensional list, ndarray or CSCMatrix of the constraint coefficients
+        :param signs: list of the constraint signs, "<=", ">=" or "="
+        :param rhs: list of the right hand sides
+        :param tol: relative residuals and duality gap under which the point is optimal
+        :param max_iterations: number of iterations after which the method gives up, solving the PL
+            with the revised simplex when crossover is set, raising IterationLimitError otherwise
+        :param crossover: look for an optimal basis from the last point
+        :param max_pivots: number of pivots of the crossover after which IterationLimitError is raised,
+            no limit if None
+        """
+        self.objective = np.asarray(objective, dtype=np.float64)
+        self.b = np.asarray(rhs, dtype=np.float64)
+        self.nb_var = len(self.objective)
+        if isinstance(matrix, CSCMatrix):
+            matrix = matrix.toarray()
+        self.matrix = np.asarray(matrix, dtype=np.float64).reshape(len(self.b), self.nb_var)
+        self.signs = list(signs)
+        self.slack_rows = np.array([row for row, sign in enumerate(signs) if sign != "="], dtype=np.int64)
+        nb_row, nb_slack = len(self.b), len(self.slack_rows)
+        self.standard = np.zeros((nb_row, self.nb_var + nb_slack))
+        self.standard[:, :self.nb_var] = self.matrix
+        self.standard[self.slack_rows, self.nb_var + np.arange(nb_slack)] = \
+            [slack_coefficients[signs[row]] for row in self.slack_rows]
+        self.cost = np.zeros(self.nb_var + nb_slack)
+        self.cost[:self.nb_var] = -self.objective
+        self.tol = tol
+        self.max_iterations = max_iterations
+        self.crossover = crossover
+        self.max_pivots = max_pivots
+        self.x = self.y = self.z = None
+        self.basis = None
+        self.solution = None
+        self.optimal_val = None
+        self.nb_iteration = 0
+        self.crossover_iterations = 0
+
+    def factorize(self, scaling):
+        """
+        Factorize the normal equations A D A^T dy = r
+        Only the original columns are multiplied, the slack columns adding their D to the diagonal
+        :param scaling: ndarray of the diagonal D
+        :return: function solving A D A^T dy = r
+        """
+        normal = (self.matrix * scaling[:self.nb_var]) @ self.matrix.T
+        normal[self.slack_rows, self.slack_rows] += scaling[self.nb_var:]  # S D S^T is diagonal
+        lower = cholesky(normal)
+        return lambda rhs: cholesky_solve(lower, rhs)
+
+    def starting_point(self):
+        """
+        Mehrotra's starting point: the least squares solutions of A x = b and A^T y + z = c, moved inside
+        the positive orthant
+        """
+        A, b, c = self.standard, self.b, self.cost
+        solve = self.factorize(np.ones(A.shape[1]))
+        x = A.T @ solve(b)
+        y = solve(A @ c)
+        z = c - A.T @ y
+        x += max(-1.5 * x.min(initial=0), 0) + 1e-3
+        z += max(-1.5 * z.min(initial=0), 0) + 1e-3
+        product = x @ z
+        self.x = x + 0.5 * product / z.sum()
+        self.y = y
+        self.z = z + 0.5 * product / x.sum()
+
+    def direction(self, solve, scaling, primal_residual, dual_residual, complementarity):
+        """
+        Newton direction of A dx = -rb, A^T dy + dz = -rc and Z dx + X dz = r
+        :param solve: function solving A D A^T dy = r, given by factorize
+        :param scaling: ndarray of the diagonal D = X Z^-1
+        :param primal_residual: rb = A x - b
+        :param dual_residual: rc = A^T y + z - c
+        :param complementarity: r
+        :return: tuple of dx, dy and dz
+        """
+        rhs = -primal_residual - self.standard @ (complementarity / self.z + scaling * dual_residual)
+        dy = solve(rhs)
+        dz = -dual_residual - self.standard.T @ dy
+        dx = (complementarity - self.x * dz) / self.z
+        return dx, dy, dz
+
+    @staticmethod
+    def step_length(values, direction):
+        """
+        Largest step keeping the values non negative, at most 1
+        :param values: positive ndarray
+        :param direction: ndarray
+        :return: float
+        """
+        negative = direction < 0
+        return min(1., (-values[negative] / direction[negative]).min(initial=np.inf))
+
+    def iterate(self):
+        """
+        Mehrotra predictor-corrector iterations until the point is optimal
+        :return: boolean telling if the point is optimal, False when the iterates diverge, the PL being
+            infeasible or unbounded, or when max_iterations is reached
+        """
+        self.starting_point()
+        A, b, c = self.standard, self.b, self.cost
+        size = A.shape[1]
+        b_norm, c_norm = 1 + np.abs(b).max(initial=0), 1 + np.abs(c).max(initial=0)
+        divergence = 1e10 * max(b_norm, c_norm)
+        while True:
+            primal_residual = A @ self.x - b
+            dual_residual = A.T @ self.y + self.z - c
+            primal_val, dual_val = c @ self.x, b @ self.y
+            if np.abs(primal_residual).max(initial=0) <= self.tol * b_norm \
+                    and np.abs(dual_residual).max(initial=0) <= self.tol * c_norm \
+                    and abs(primal_val - dual_val) <= self.tol * (1 + abs(primal_val)):
+                return True
+            if self.nb_iteration >= self.max_iterations or np.abs(self.x).max() > divergence \
+                    or np.abs(self.y).max(initial=0) > divergence:
+                return False
+            self.nb_iteration += 1
+            mu = self.x @ self.z / size
+            scaling = self.x / self.z
+            solve = self.factorize(scaling)
+            # Predictor: affine scaling direction, towards mu = 0
+            dx, dy, dz = self.direction(solve, scaling, primal_residual, dual_residual, -self.x * self.z)
+            primal_step, dual_step = self.step_length(self.x, dx), self.step_length(self.z, dz)
+            affine_mu = (self.x + primal_step * dx) @ (self.z + dual_step * dz) / size
+            centering = (affine_mu / mu) ** 3
+            # Corrector: second order term of the complementarity and centering
+            dx, dy, dz = self.direction(solve, scaling, primal_residual, dual_residual,
+                                        -self.x * self.z - dx * dz + centering * mu)
+            primal_step = 0.99 * self.step_length(self.x, dx)
+            dual_step = 0.99 * self.step_length(self.z, dz)
+            self.x = self.x + primal_step * dx
+            self.y = self.y + dual_step * dy
+            self.z = self.z + dual_step * dz
+
+    def solve(self):
+        """
+        Solve the PL, then look for an optimal basis with the crossover
+        Without crossover, a diverging PL is reported unbounded when its primal grows and infeasible
+        otherwise, which is only a guess: the crossover solves such a PL with the revised simplex instead
+        :return: optimal value
+        """
+        optimal = self.iterate()
+        if self.crossover:
+            return self.cross_over(optimal)
+        if not optimal:
+            if self.nb_iteration >= self.max_iterations:
+                raise exceptions.IterationLimitError("Nombre maximal d'iterations atteint")
+            if np.abs(self.x).max() > np.abs(self.y).max(initial=0):
+                raise exceptions.SolutionNonBorneeError("Solution non bornee")
+            raise exceptions.SolutionNonRealisableError("Pas de solution realisable")
+        self.solution = self.x[:self.nb_var]
+        self.optimal_val = float(self.objective @ self.solution)
+        return self.optimal_val
+
+    def cross_over(self, optimal):
+        """
+        Optimal basis from the last point: the columns of the largest x / z are taken as the basis of
+        the revised simplex, which pivots to an optimal vertex from it. The revised simplex solves the PL
+        from scratch when the point is not optimal or the basis is singular or not realisable
+        :param optimal: boolean telling if the last point is optimal
+        :return: optimal value
+        """
+        revised = RevisedSimplex(self.objective, self.matrix, self.signs, self.b, max_iterations=self.max_pivots)
+        try:
+            if optimal and len(self.b):  # Without any row there is no basis to start from
+                nb_row = len(self.b)
+                columns = np.concatenate([np.arange(self.nb_var), self.nb_var + self.slack_rows])  # Of the revised one
+                order = np.argsort(-self.x / self.z, kind="stable")[:nb_row]
+                try:
+                    revised.solve_from(columns[order].tolist())
+                except ValueError:
+                    revised = RevisedSimplex(self.objective, self.matrix, self.signs, self.b,
+                                             max_iterations=self.max_pivots)
+                    revised.solve()
+            else:
+                revised.solve()
+        finally:
+            self.crossover_iterations = revised.nb_iteration
+        self.basis = revised.basis
+        self.solution = revised.x
+        self.optimal_val = revised.optimal_val
+        return self.optimal_val
@@ -0,0 +1,82 @@
+import unittest
+import numpy as np
+import exceptions
+import interior
+import reader
+import PL
+from revised import RevisedSimplex
+
+
+class InteriorTest(unittest.TestCase):
+
+    def test_triangular_solve(self):
+        """
+        triangular_solve should solve with L and with its transpose, block by block
+        :return:
+        """
+        rng = np.random.default_rng(0)
+        lower = np.tril(rng.random((10, 10))) + np.eye(10)
+        rhs = rng.random(10)
+        np.testing.assert_allclose(lower @ interior.triangular_solve(lower, rhs, block_size=3), rhs)
+        np.testing.assert_allclose(lower.T @ interior.triangular_solve(lower, rhs, transpose=True, block_size=3), rhs)
+
+    def test_solve(self):
+        """
+        The interior point method should find the optimal value and an optimal basis of the revised simplex
+        :return:
+        """
+        for file in ['file2.txt', 'file3.txt', 'file4.txt', 'file5.txt']:
+            problem = reader.read_problem(file)
+            data = (problem.objective, problem.matrix, problem.signs, problem.rhs)
+            revised = RevisedSimplex(*data)
+            revised.solve()
+            method = interior.InteriorPoint(*data)
+            self.assertAlmostEqual(method.solve(), revised.optimal_val)
+            self.assertEqual(sorted(method.basis), sorted(revised.basis))
+            self.assertLess(method.nb_iteration, 30)
+            method = interior.InteriorPoint(*data, crossover=False)
+            self.assertAlmostEqual(method.solve(), revised.optimal_val, places=5)
+            self.assertIsNone(method.basis)
+
+    def test_not_optimal(self):
+        """
+        The crossover should report the infeasible and unbounded PL found by the revised simplex, and stop
+        after max_pivots pivots
+        :return:
+        """
+        method = interior.InteriorPoint([1, 1], [[1, 1], [1, 1]], ["<=", ">="], [1, 2])
+        self.assertRaises(exceptions.SolutionNonRealisableError, method.solve)
+        method = interior.InteriorPoint([1, 1], [[1, -1]], ["<="], [1])
+        self.assertRaises(exceptions.SolutionNonBorneeError, method.solve)
+        method = interior.InteriorPoint([3, 2, 4], [[1, 1, 2], [2, 0, 3], [2, 1, 3]], ["<="] * 3, [4, 5, 7],
+                                        max_iterations=1, max_pivots=1)  # The revised simplex needs 3 pivots
+        self.assertRaises(exceptions.IterationLimitError, method.solve)
+        self.assertEqual(method.crossover_iterations, 1)
+        method = interior.InteriorPoint([-1, 0], np.zeros((0, 2)), [], [])  # No row, no basis
+        self.assertEqual(method.solve(), 0)
+        self.assertEqual(method.solution.tolist(), [0, 0])
+
+    def test_engine(self):
+        """
+        The interior engine of PL should find the optimal value of the tableau engine, a min problem and
+        upper bounds included
+        :return:
+        """
+        for file in ['file2.txt', 'file3.txt', 'file4.txt', 'file5.txt']:
+            my_PL = PL.PL(file, verbosity=PL.SILENT, engine="interior")
+            expected = PL.PL(file, verbosity=PL.SILENT, engine="tableau")
+            expected.standardize()
+            expected.solve()
+            result = my_PL.solve()
+            self.assertEqual(result.status, "optimal")
+            self.assertAlmostEqual(result.optimal_val, expected.optimal_val)
+        problem = reader.parse_problem('min 1 2 3\n1 1 0 >= 4\n0 1 1 >= 3\n1 0 1 >= 5')
+        problem.upper = np.array([2., np.inf, np.inf])
+        my_PL = PL.PL(verbosity=PL.SILENT, problem=problem, engine="interior")
+        result = my_PL.solve()
+        self.assertAlmostEqual(result.optimal_val, 15)
+        np.testing.assert_allclose(result.solution, [2, 2, 3], atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
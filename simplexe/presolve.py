@@ -0,0 +1,383 @@
+import numpy as np
+from reader import Problem
+from sparse import CSCMatrix
+
+tol = 1e-9
+
+
+class Postsolve:
+    """
+    Record of the reductions made by presolve, to map a solution of the reduced PL back to the
+    original variables
+    Attributes:
+        nb_var: number of variables of the original PL
+        columns: ndarray of the original index of each variable of the reduced PL
+        rows: ndarray of the original index of each constraint of the reduced PL
+        col_scales: ndarray of the scale of each variable of the reduced PL, x = col_scales * reduced x
+        row_scales: ndarray of the scale of each constraint of the reduced PL
+        steps: list of the eliminated variables, ("fix", col, value) or
+            ("substitute", col, cols, coefficients, rhs, pivot) for x_col = (rhs - coefficients . x_cols) / pivot
+        offset: constant added to the objective by the eliminated variables
+    """
+
+    def __init__(self, nb_var):
+        self.nb_var = nb_var
+        self.columns = np.arange(nb_var)
+        self.rows = None
+        self.col_scales = np.ones(nb_var)
+        self.row_scales = None
+        self.steps = []
+        self.offset = 0.
+
+    def solution(self, reduced):
+        """
+        Values of the original variables
+        :param reduced: values of the variables of the reduced PL
+        :return: ndarray of the values of the original variables
+        """
+        x = np.zeros(self.nb_var)
+        x[self.columns] = self.col_scales * np.asarray(reduced, dtype=np.float64)
+        for step in reversed(self.steps):  # An eliminated variable only depends on variables kept longer
+            if step[0] == "fix":
+                x[step[1]] = step[2]
+            else:
+                kind, col, cols, coefficients, rhs, pivot = step
+                x[col] = (rhs - coefficients @ x[cols]) / pivot
+        return x
+
+
+def presolve(problem, scaling=True):
+    """
+    Reduce a PL before it is standardized
+    Empty and duplicate rows are removed, singleton rows fix their variable or are dropped when they
+    are implied, singleton columns of an equality are substituted, dominated columns are fixed to zero
+    and constraints implied by the bounds the other constraints give to the variables are dropped
+    An infeasible or unbounded part of the PL is left as it is, for the solver to report it
+    The reductions work on the columns of a CSCMatrix, a dense matrix being given back dense
+    :param problem: reader.Problem
+    :param scaling: scale the rows and columns of the reduced PL with scale
+    :return: tuple of the reduced reader.Problem and its Postsolve
+    """
+    sense = -1 if problem.max_min.lower() == "min" else 1
+    sparse = isinstance(problem.matrix, CSCMatrix)
+    matrix = problem.matrix if sparse else CSCMatrix.from_dense(
+        np.asarray(problem.matrix, dtype=np.float64).reshape(len(problem.rhs), len(problem.objective)))
+    reduction = Reduction(sense * np.array(problem.objective, dtype=np.float64), matrix, problem.signs,
+                          np.array(problem.rhs, dtype=np.float64))
+    reduction.run()
+
+    rows, cols = np.flatnonzero(reduction.active_rows), np.flatnonzero(reduction.active_cols)
+    postsolve = Postsolve(len(problem.objective))
+    postsolve.columns, postsolve.rows = cols, rows
+    postsolve.col_scales = np.ones(len(cols))
+    postsolve.row_scales = np.ones(len(rows))
+    postsolve.steps = reduction.steps
+    postsolve.offset = sense * reduction.offset
+    matrix = reduction.reduced_matrix()
+    reduced = Problem(problem.max_min, sense * reduction.objective[cols], matrix if sparse else matrix.toarray(),
+                      [reduction.signs[row] for row in rows], reduction.rhs[rows],
+                      None if problem.names is None else [problem.names[col] for col in cols])
+    if scaling:
+        reduced, postsolve.row_scales, postsolve.col_scales = scale(reduced)
+    return reduced, postsolve
+
+
+sign_directions = {"<=": 1., ">=": -1., "=": 0.}
+
+
+class Reduction:
+    """
+    Presolve state of a PL written as a max problem, rows and columns being deactivated instead of
+    removed so that they keep their original index
+    The matrix is a CSCMatrix whose entries keep their place: a reduction only changes their values,
+    the coefficient of a substituted variable becoming an explicit zero
+    Attributes:
+        objective, signs, rhs: data of the PL, updated by the reductions
+        matrix: CSCMatrix of the constraints, a copy of the data of the given one
+        rows, cols: ndarray of the row and column of each entry of the matrix
+        active_rows, active_cols: boolean ndarray of the rows and columns still in the PL
+        steps: list of the eliminated variables, see Postsolve
+        offset: constant added to the objective by the eliminated variables
+    """
+
+    def __init__(self, objective, matrix, signs, rhs):
+        self.objective = objective
+        self.matrix = CSCMatrix(np.array(matrix.data, dtype=np.float64), matrix.indices, matrix.indptr, matrix.shape)
+        self.rows = self.matrix.indices
+        self.cols = np.repeat(np.arange(self.matrix.shape[1]), np.diff(self.matrix.indptr))
+        self.signs = list(signs)
+        self.rhs = rhs
+        self.active_rows = np.ones(len(rhs), dtype=bool)
+        self.active_cols = np.ones(len(objective), dtype=bool)
+        self.steps = []
+        self.offset = 0.
+
+    def run(self):
+        """
+        Apply the reductions until none applies any more
+        """
+        reductions = [self.remove_empty_rows, self.remove_singleton_rows, self.fix_dominated_columns,
+                      self.substitute_singleton_columns, self.merge_duplicate_rows, self.drop_implied_rows]
+        while any([reduction() for reduction in reductions]):
+            pass
+
+    def active(self):
+        """
+        Non zero entries of the active rows and columns
+        :return: boolean ndarray over the entries of the matrix
+        """
+        return self.active_rows[self.rows] & self.active_cols[self.cols] & (self.matrix.data != 0)
+
+    def row_counts(self, entries):
+        """
+        :param entries: boolean ndarray over the entries of the matrix
+        :return: ndarray of the number of entries of each row
+        """
+        return np.bincount(self.rows[entries], minlength=len(self.rhs))
+
+    def row_entries(self, entries):
+        """
+        Entries of each row, the matrix being read by rows
+        :param entries: boolean ndarray over the entries of the matrix
+        :return: list of the ndarray of the entries of each row, by increasing column
+        """
+        entries = np.flatnonzero(entries)
+        entries = entries[np.argsort(self.rows[entries], kind="stable")]
+        return np.split(entries, np.searchsorted(self.rows[entries], np.arange(1, len(self.rhs))))
+
+    def directions(self):
+        """
+        :return: ndarray of 1 for a <= row, -1 for a >= row and 0 for an equality
+        """
+        return np.array([sign_directions[sign] for sign in self.signs], dtype=np.float64)
+
+    def reduced_matrix(self):
+        """
+        :return: CSCMatrix of the active rows and columns
+        """
+        active = self.active()
+        rows, cols = np.cumsum(self.active_rows) - 1, np.cumsum(self.active_cols) - 1
+        return CSCMatrix.from_triplets(rows[self.rows[active]], cols[self.cols[active]], self.matrix.data[active],
+                                       (int(self.active_rows.sum()), int(self.active_cols.sum())))
+
+    def fix(self, col, value):
+        """
+        Fix a variable, moving its column to the right hand side
+        :param col: index of the variable
+        :param value: value of the variable
+        """
+        start, stop = self.matrix.indptr[col], self.matrix.indptr[col + 1]
+        self.rhs[self.rows[start:stop]] -= self.matrix.data[start:stop] * value
+        self.offset += self.objective[col] * value
+        self.active_cols[col] = False
+        self.steps.append(("fix", col, value))
+
+    def remove_empty_rows(self):
+        """
+        Drop the rows without any coefficient which hold for every x
+        :return: boolean telling if a row was dropped
+        """
+        empty = self.active_rows & (self.row_counts(self.active()) == 0)
+        holds = np.array([(sign == "<=" and rhs >= -tol) or (sign == ">=" and rhs <= tol) or abs(rhs) <= tol
+                          for sign, rhs in zip(self.signs, self.rhs)], dtype=bool)
+        dropped = empty & holds
+        self.active_rows &= ~dropped
+        return bool(dropped.any())
+
+    def remove_singleton_rows(self):
+        """
+        A singleton row bounds its variable: a zero upper bound or an equality fixes it, a non positive
+        lower bound is implied by x >= 0
+        :return: boolean telling if a row was dropped
+        """
+        active = self.active()
+        entries = np.flatnonzero(active & (self.row_counts(active) == 1)[self.rows])
+        changed = False
+        for entry in entries[np.argsort(self.rows[entries], kind="stable")]:
+            row, col, coefficient = int(self.rows[entry]), int(self.cols[entry]), self.matrix.data[entry]
+            if not self.active_cols[col]:  # Fixed by a previous singleton row of this pass
+                continue
+            value = self.rhs[row] / coefficient
+            upper = (self.signs[row] == "<=") == (coefficient > 0)
+            if self.signs[row] == "=" or upper:
+                if value < -tol or (self.signs[row] != "=" and value > tol):
+                    continue  # Infeasible, or an upper bound which has to stay a constraint
+                self.fix(col, max(value, 0.))
+            elif value > tol:
+                continue  # A positive lower bound has to stay a constraint
+            self.active_rows[row] = False
+            changed = True
+        return changed
+
+    def fix_dominated_columns(self):
+        """
+        Fix to zero the variables which can only lower the objective and tighten the constraints
+        :return: boolean telling if a variable was fixed
+        """
+        direction = self.directions()[self.rows]
+        oriented = self.matrix.data * direction
+        helps = self.active() & ((oriented < 0) | (direction == 0))
+        dominated = self.active_cols & (self.objective <= 0) \
+            & (np.bincount(self.cols[helps], minlength=len(self.objective)) == 0)
+        for col in np.flatnonzero(dominated):
+            self.fix(int(col), 0.)
+        return bool(dominated.any())
+
+    def substitute_singleton_columns(self):
+        """
+        A variable appearing in a single equality only is its slack variable: it is substituted, the
+        equality becoming an inequality
+        :return: boolean telling if a variable was substituted
+        """
+        active = self.active()
+        counts = np.bincount(self.cols[active], minlength=len(self.objective))
+        row_entries = self.row_entries(active)
+        changed = False
+        for entry in np.flatnonzero(active & (counts == 1)[self.cols]):
+            row, col = int(self.rows[entry]), int(self.cols[entry])
+            if self.signs[row] != "=" or not self.active_cols[col]:
+                continue
+            pivot = self.matrix.data[entry]
+            others = row_entries[row][row_entries[row] != entry]
+            coefficients = self.matrix.data[others]
+            self.steps.append(("substitute", col, self.cols[others], coefficients, self.rhs[row], pivot))
+            self.offset += self.objective[col] * self.rhs[row] / pivot
+            self.objective[self.cols[others]] -= self.objective[col] / pivot * coefficients
+            self.matrix.data[entry] = 0
+            self.active_cols[col] = False
+            self.signs[row] = "<=" if pivot > 0 else ">="  # Not an equality any more this pass
+            changed = True
+        return changed
+
+    def merge_duplicate_rows(self):
+        """
+        Merge the rows which are a positive multiple of each other, keeping the tightest bounds
+        :return: boolean telling if a row was removed
+        """
+        groups = {}
+        for row, entries in enumerate(self.row_entries(self.active())):
+            if len(entries) == 0:
+                continue
+            values = self.matrix.data[entries]
+            scale = abs(values[0])
+            key = (tuple(self.cols[entries].tolist()), tuple(np.round(values / scale, 12).tolist()))
+            groups.setdefault(key, []).append((row, scale, entries))
+        changed = False
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            lower, upper = -np.inf, np.inf
+            for row, scale, _ in group:
+                if self.signs[row] != "<=":
+                    lower = max(lower, self.rhs[row] / scale)
+                if self.signs[row] != ">=":
+                    upper = min(upper, self.rhs[row] / scale)
+            if lower > upper + tol:
+                continue  # Infeasible, left for the solver
+            if upper - lower <= tol:
+                bounds = [("=", upper)]
+            else:
+                bounds = [(sign, value) for sign, value in (("<=", upper), (">=", lower)) if np.isfinite(value)]
+            for (row, scale, entries), (sign, value) in zip(group, bounds):
+                self.matrix.data[entries] /= scale
+                self.signs[row] = sign
+                self.rhs[row] = value
+            for row, _, _ in group[len(bounds):]:
+                self.active_rows[row] = False
+            changed = changed or len(group) > len(bounds)
+        return changed
+
+    def drop_implied_rows(self):
+        """
+        Drop the inequalities implied by the upper bounds that the other constraints give to the
+        variables, a row only being dropped when the rows proving it are kept
+        :return: boolean telling if a row was dropped
+        """
+        if not self.active_rows.any() or not self.active_cols.any():
+            return False
+        active = self.active()
+        direction = self.directions()
+        # Rows with non negative coefficients only, written as a x <= b, bound each of their variables
+        oriented = self.matrix.data * direction[self.rows]
+        bounding = self.active_rows & (direction != 0) & (self.row_counts(active & (oriented < 0)) == 0) \
+            & (self.rhs * direction >= 0)
+        positive = active & (oriented > 0)
+        bounded = positive & bounding[self.rows]
+        bounds = np.full(len(oriented), np.inf)
+        bounds[bounded] = (self.rhs * direction)[self.rows[bounded]] / oriented[bounded]
+
+        # Best and second best bound of each variable, with their row, -1 when there is none
+        order = np.lexsort((bounds, self.cols))  # The entries of a column keep their place in the CSC order
+        first, lengths = self.matrix.indptr[:-1], np.diff(self.matrix.indptr)
+        best_rows, second_rows = np.full(len(first), -1), np.full(len(first), -1)
+        best, second = np.full(len(first), np.inf), np.full(len(first), np.inf)
+        for rows, values, shift in ((best_rows, best, 0), (second_rows, second, 1)):
+            has = lengths > shift
+            rows[has] = self.rows[order[first[has] + shift]]
+            values[has] = bounds[order[first[has] + shift]]
+
+        row_entries = self.row_entries(positive)
+        protected, dropped = set(), set()
+        for row in np.flatnonzero(self.active_rows & (direction != 0)):
+            if row in protected:
+                continue
+            cols = self.cols[row_entries[row]]
+            sources = np.where(best_rows[cols] == row, second_rows[cols], best_rows[cols])
+            upper = np.where(best_rows[cols] == row, second[cols], best[cols])
+            if not np.all(np.isfinite(upper)) or dropped & set(sources.tolist()):
+                continue
+            if oriented[row_entries[row]] @ upper <= self.rhs[row] * direction[row] + tol:
+                dropped.add(row)
+                protected.update(sources.tolist())
+        self.active_rows[list(dropped)] = False
+        return bool(dropped)
+
+
+def scale(problem, passes=4):
+    """
+    Scale the rows and columns of a PL by powers of 2, so that no rounding is added: a few geometric
+    passes then an equilibration bring every coefficient close to 1
+    Only the non zeros are read, a row or column without any being left as it is
+    :param problem: reader.Problem, its matrix being dense or a CSCMatrix
+    :param passes: number of geometric passes
+    :return: tuple of the scaled reader.Problem, the scale of each row and of each column,
+        x = col_scales * scaled x
+    """
+    nb_row, nb_var = len(problem.rhs), len(problem.objective)
+    sparse = isinstance(problem.matrix, CSCMatrix)
+    matrix = problem.matrix if sparse else CSCMatrix.from_dense(
+        np.asarray(problem.matrix, dtype=np.float64).reshape(nb_row, nb_var))
+    rows, cols = matrix.indices, np.repeat(np.arange(nb_var), np.diff(matrix.indptr))
+    values = np.abs(matrix.data)
+    row_scales, col_scales = np.ones(nb_row), np.ones(nb_var)
+
+    def extremes(values, index, size):
+        big, small = np.zeros(size), np.full(size, np.inf)
+        np.maximum.at(big, index[values != 0], values[values != 0])
+        np.minimum.at(small, index[values != 0], values[values != 0])
+        return big, small
+
+    def geometric(values, index, size):
+        big, small = extremes(values, index, size)
+        scales = np.ones(size)
+        full = big > 0
+        scales[full] = 1 / np.sqrt(big[full] * small[full])
+        return scales
+
+    for _ in range(passes):
+        row_scales *= geometric(values * row_scales[rows] * col_scales[cols], rows, nb_row)
+        col_scales *= geometric(values * row_scales[rows] * col_scales[cols], cols, nb_var)
+    big = extremes(values * row_scales[rows] * col_scales[cols], rows, nb_row)[0]  # Equilibration
+    row_scales /= np.where(big > 0, big, 1)
+    big = extremes(values * row_scales[rows] * col_scales[cols], cols, nb_var)[0]
+    col_scales /= np.where(big > 0, big, 1)
+    row_scales, col_scales = 2. ** np.round(np.log2(row_scales)), 2. ** np.round(np.log2(col_scales))
+
+    if sparse:
+        scaled = CSCMatrix(matrix.data * row_scales[rows] * col_scales[cols], matrix.indices, matrix.indptr,
+                           matrix.shape)
+    else:
+        scaled = np.asarray(problem.matrix, dtype=np.float64).reshape(nb_row, nb_var) * row_scales[:, None] \
+            * col_scales
+    return Problem(problem.max_min, np.asarray(problem.objective) * col_scales, scaled, list(problem.signs),
+                   np.asarray(problem.rhs) * row_scales, problem.names), row_scales, col_scales
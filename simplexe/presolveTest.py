@@ -0,0 +1,112 @@
+import unittest
+import warnings
+import numpy as np
+import presolve
+import reader
+import PL
+from sparse import CSCMatrix
+
+redundant = """max 3 2 0 -1 4 1
+1 1 0 0 0 0 <= 4
+2 2 0 0 0 0 <= 10
+1 0 0 0 0 0 <= 3
+0 0 0 0 0 0 <= 1
+0 1 1 0 0 0 = 2
+0 0 0 0 1 0 = 1.5
+1 1 0 1 0 1 <= 6
+0 0 0 0 0 1 <= 8
+1 0 0 0 0 0 >= -2"""
+
+
+class PresolveTest(unittest.TestCase):
+
+    def test_presolve(self):
+        """
+        presolve should remove the empty, duplicate, singleton and implied rows and the fixed, dominated
+        and substituted columns
+        :return:
+        """
+        reduced, postsolve = presolve.presolve(reader.parse_problem(redundant), scaling=False)
+        self.assertEqual(postsolve.columns.tolist(), [0, 1, 5])
+        self.assertEqual(postsolve.rows.tolist(), [0, 2, 4, 6])
+        self.assertEqual(reduced.signs, ["<=", "<=", "<=", "<="])
+        self.assertEqual(reduced.rhs.tolist(), [4, 3, 2, 6])
+        self.assertEqual(reduced.objective.tolist(), [3, 2, 1])
+        self.assertEqual(postsolve.offset, 6)  # x5 = 1.5 is fixed, x3 = 2 - x2 is substituted
+        self.assertEqual(postsolve.solution([3, 1, 2]).tolist(), [3, 1, 1, 0, 1.5, 2])
+
+    def test_infeasible_left(self):
+        """
+        An infeasible row should be left for the solver to report it
+        :return:
+        """
+        reduced, postsolve = presolve.presolve(reader.parse_problem('max 1 1\n0 0 >= 1\n1 1 <= 2'))
+        self.assertEqual(postsolve.rows.tolist(), [0, 1])
+
+    def test_sparse(self):
+        """
+        A CSCMatrix should be reduced and scaled without being made dense
+        :return:
+        """
+        problem = reader.parse_problem(redundant, sparse=True)
+        reduced, postsolve = presolve.presolve(problem)
+        self.assertIsInstance(reduced.matrix, CSCMatrix)
+        dense, _ = presolve.presolve(reader.parse_problem(redundant))
+        self.assertEqual(reduced.matrix.toarray().tolist(), dense.matrix.tolist())
+        self.assertEqual(postsolve.rows.tolist(), [0, 2, 4, 6])
+
+    def test_empty(self):
+        """
+        A PL whose variables are all eliminated should be solved by every engine from its postsolve
+        :return:
+        """
+        for engine in ["tableau", "revised", "interior"]:
+            my_PL = PL.PL(problem=reader.parse_problem("max -1 0\n-4 3 <= 6\n-1 -2 <= 8\n"), verbosity=PL.SILENT,
+                          engine=engine, presolve=True)
+            my_PL.standardize()
+            result = my_PL.solve()
+            self.assertEqual(result.status, "optimal")
+            self.assertEqual(result.optimal_val, 0)
+            self.assertEqual(result.solution, [0, 0])
+        my_PL = PL.PL(problem=reader.parse_problem("max -1\n1 <= 2\n0 >= 1"), verbosity=PL.SILENT, engine="revised",
+                      presolve=True)
+        self.assertEqual(my_PL.solve().status, "infeasible")
+
+    def test_scale(self):
+        """
+        scale should bring the coefficients close to 1 with powers of 2
+        :return:
+        """
+        problem = reader.parse_problem('max 1 1000\n1000 2000 <= 4000\n0.001 0.004 <= 1')
+        scaled, row_scales, col_scales = presolve.scale(problem)
+        self.assertTrue(np.all(np.log2(row_scales) == np.round(np.log2(row_scales))))
+        self.assertLess(np.abs(scaled.matrix).max() / np.abs(scaled.matrix[scaled.matrix != 0]).min(), 8)
+        with warnings.catch_warnings():  # An empty row or column is not divided by zero
+            warnings.simplefilter("error")
+            scaled, row_scales, col_scales = presolve.scale(reader.parse_problem('max 1 1 0\n0 0 0 <= 1\n2 8 0 <= 4'))
+        self.assertEqual(row_scales[0], 1)
+        self.assertEqual(col_scales[2], 1)
+
+    def test_solve(self):
+        """
+        A presolved PL should find the optimal value and solution of the original one
+        :return:
+        """
+        for kwargs in [{}, {"exact": True}, {"engine": "revised"}]:
+            my_PL = PL.PL(problem=reader.parse_problem(redundant), verbosity=PL.SILENT, presolve=True, **kwargs)
+            my_PL.standardize()
+            my_PL.solve()
+            self.assertAlmostEqual(my_PL.optimal_val, 19)
+        self.assertEqual(my_PL.nb_var, 3)
+        for file in ['file2.txt', 'file3.txt', 'file4.txt', 'file5.txt']:
+            my_PL = PL.PL(file, verbosity=PL.SILENT, presolve=True)
+            my_PL.standardize()
+            my_PL.solve()
+            original = PL.PL(file, verbosity=PL.SILENT, engine="revised")
+            original.solve()
+            self.assertAlmostEqual(my_PL.optimal_val, original.optimal_val)
+        self.assertRaises(ValueError, my_PL.set_rhs, {0: 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import numpy as np
+
+
+def unit_rows(table):
+    """
+    Row of each column of the table which is a unit column up to the scale of its row: zero in the
+    objective row and in every other row, those are the basic columns
+    :param table: ndarray of the table, the last column being b
+    :return: ndarray giving for each column its row (from 1), -1 if the column is not a unit one
+    """
+    nonzero = np.asarray(table[1:, :-1] != 0, dtype=bool)
+    unit = (nonzero.sum(axis=0) == 1) & np.asarray(table[0, :-1] == 0, dtype=bool)
+    return np.where(unit, np.argmax(nonzero, axis=0) + 1, -1)
+
+
+def row_scales(table):
+    """
+    Number by which each constraint row is multiplied, the exact tables being pivoted without division
+    :param table: ndarray of the table
+    :return: ndarray of the absolute scale of each constraint row, ones for a float table
+    """
+    if np.issubdtype(table.dtype, np.floating):
+        return np.ones(len(table) - 1)
+    rows = unit_rows(table)
+    scales = np.ones(len(table) - 1)
+    for col in np.flatnonzero(rows > 0):
+        scales[rows[col] - 1] = abs(float(table[rows[col], col]))
+    return scales
+
+
+class PricingRule:
+    """
+    Rule choosing the entering column of the simplex, the first candidate column
+    The rules are strategies: PL and simplexe.get_pivot call choose to get the entering column,
+    leaving to get the leaving row among the minimum ratios and update before every pivot
+    """
+
+    name = "first"
+
+    def reset(self):
+        """
+        Forget what was learnt during a previous solve
+        """
+
+    def choose(self, table, candidates):
+        """
+        Entering column
+        :param table: ndarray of the table
+        :param candidates: boolean array, for every column but b, of the columns which could enter
+        :return: index of the entering column
+        """
+        return int(np.argmax(candidates))
+
+    def leaving(self, table, col, ratios):
+        """
+        Leaving row, the first one with the minimum ratio
+        :param table: ndarray of the table
+        :param col: index of the entering column
+        :param ratios: ndarray of the ratios of each constraint row, inf when the row can not leave
+        :return: index of the leaving row among the constraint rows (from 0)
+        """
+        return int(np.argmin(ratios))
+
+    def update(self, table, pivot):
+        """
+        Called before the pivot is applied to the table
+        :param table: ndarray of the table
+        :param pivot: tuple of the row and column number of the pivot
+        """
+
+
+class Dantzig(PricingRule):
+    """
+    Column with the largest cost in the objective row
+    """
+
+    name = "dantzig"
+
+    def choose(self, table, candidates):
+        costs = np.where(candidates, table[0, :-1].astype(np.float64), -np.inf)
+        return int(np.argmax(costs))
+
+
+class SteepestEdge(PricingRule):
+    """
+    Column with the largest cost relative to the norm of its edge, sqrt(1 + sum of its squares)
+    The table holding every column, the norms are exact and computed at each iteration
+    """
+
+    name = "steepest"
+
+    def choose(self, table, candidates):
+        columns = np.flatnonzero(candidates)
+        values = table[1:, columns].astype(np.float64) / row_scales(table)[:, None]
+        scores = table[0, columns].astype(np.float64) ** 2 / (1 + (values ** 2).sum(axis=0))
+        return int(columns[np.argmax(scores)])
+
+
+class Devex(PricingRule):
+    """
+    Approximate steepest edge: the norms are reference weights updated at each pivot, from the pivot
+    row only (Forrest and Goldfarb)
+    Attributes:
+        weights: ndarray of the weight of each column, None until the first choice
+    """
+
+    name = "devex"
+
+    def __init__(self):
+        self.weights = None
+
+    def reset(self):
+        self.weights = None
+
+    def fit(self, table):
+        """
+        Weights of the columns of the table, new columns (cuts) starting with a weight of 1, the
+        weights starting over when columns were removed
+        :param table: ndarray of the table
+        """
+        nb_col = table.shape[1] - 1
+        if self.weights is None or len(self.weights) > nb_col:
+            self.weights = np.ones(nb_col)
+        elif len(self.weights) < nb_col:
+            self.weights = np.concatenate([self.weights, np.ones(nb_col - len(self.weights))])
+
+    def choose(self, table, candidates):
+        self.fit(table)
+        columns = np.flatnonzero(candidates)
+        scores = table[0, columns].astype(np.float64) ** 2 / self.weights[columns]
+        return int(columns[np.argmax(scores)])
+
+    def update(self, table, pivot):
+        self.fit(table)
+        row_num, col = pivot
+        pivot_row = table[row_num, :-1].astype(np.float64) / float(table[pivot])
+        leaving = np.flatnonzero(unit_rows(table) == row_num)
+        scale = abs(float(table[row_num, leaving[0]])) if len(leaving) else 1.
+        weight = self.weights[col]
+        self.weights = np.maximum(self.weights, pivot_row ** 2 * weight)
+        self.weights[leaving] = max(weight / (float(table[pivot]) / scale) ** 2, 1)
+
+
+class Bland(PricingRule):
+    """
+    Smallest index rule, which never cycles: the first candidate column, then among the rows with the
+    minimum ratio the one whose basic variable has the smallest index
+    """
+
+    name = "bland"
+
+    def leaving(self, table, col, ratios):
+        ties = np.flatnonzero(ratios == ratios.min())
+        if len(ties) == 1:
+            return int(ties[0])
+        rows = unit_rows(table)
+        basic = {row: col for col, row in reversed(list(enumerate(rows))) if row > 0}
+        return int(min(ties, key=lambda tie: basic.get(tie + 1, len(rows))))
+
+
+rules = {rule.name: rule for rule in (PricingRule, Dantzig, SteepestEdge, Devex, Bland)}
+
+
+def get_rule(pricing):
+    """
+    Pricing rule from its name
+    :param pricing: name of the rule, one of rules, or a PricingRule already built
+    :return: PricingRule
+    """
+    if isinstance(pricing, PricingRule):
+        return pricing
+    if pricing not in rules:
+        raise ValueError("Unknown pricing {}, should be one of {}".format(pricing, tuple(rules)))
+    return rules[pricing]()
@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+import pricing
+import PL
+
+
+class PricingTest(unittest.TestCase):
+
+    def test_unit_rows(self):
+        """
+        unit_rows should find the basic column of each row, whatever the scale of the row
+        :return:
+        """
+        table = np.array([[3, 0, 2, 0, -1, 0],
+                          [1, 0, 4, 5, 0, 8],
+                          [2, -3, 1, 0, 0, 6]], dtype=object)
+        self.assertEqual(pricing.unit_rows(table).tolist(), [-1, 2, -1, 1, -1])
+        self.assertEqual(pricing.row_scales(table).tolist(), [5, 3])
+
+    def test_choose(self):
+        """
+        Every rule should choose a candidate column
+        :return:
+        """
+        table = np.array([[1., 3., 2., 0., -1., 0.],
+                          [1., 10., 1., 1., 0., 4.]])
+        candidates = np.array([True, True, True, False, False])
+        self.assertEqual(pricing.get_rule("first").choose(table, candidates), 0)
+        self.assertEqual(pricing.get_rule("dantzig").choose(table, candidates), 1)
+        self.assertEqual(pricing.get_rule("steepest").choose(table, candidates), 2)
+        self.assertEqual(pricing.get_rule("devex").choose(table, candidates), 1)
+        self.assertRaises(ValueError, pricing.get_rule, "unknown")
+
+    def test_bland_leaving(self):
+        """
+        Bland should break the ties of the ratio test with the smallest basic variable
+        :return:
+        """
+        table = np.array([[1., 0., 0., 0.],
+                          [1., 0., 1., 2.],
+                          [1., 1., 0., 2.]])
+        ratios = np.array([2., 2.])
+        self.assertEqual(pricing.get_rule("first").leaving(table, 0, ratios), 0)
+        self.assertEqual(pricing.get_rule("bland").leaving(table, 0, ratios), 1)
+
+    def test_solve(self):
+        """
+        Every rule should find the same optimal value
+        :return:
+        """
+        for file, optimal_val in [('file2.txt', 52 / 9), ('file3.txt', 20), ('file5.txt', 27.5)]:
+            for rule in pricing.rules:
+                my_PL = PL.PL(file, verbosity=PL.SILENT, pricing=rule)
+                my_PL.standardize()
+                my_PL.solve()
+                self.assertAlmostEqual(my_PL.optimal_val, optimal_val)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,376 @@
+import io
+import numpy as np
+import exceptions
+from sparse import CSCMatrix
+
+
+class Problem:
+    """
+    Parsed PL: max or min c x subject to A x (<=, >= or =) b, 0 <= x <= upper
+    Attributes:
+        max_min: "max" or "min"
+        objective: ndarray of the objective coefficients
+        matrix: ndarray or CSCMatrix of the constraint coefficients
+        signs: list of the constraint signs
+        rhs: ndarray of the right hand sides
+        names: list of the variable names, None if the format has none
+        upper: ndarray of the upper bound of each variable, inf when it has none, None if no variable
+            has one
+    """
+
+    def __init__(self, max_min, objective, matrix, signs, rhs, names=None, upper=None):
+        self.max_min = max_min
+        self.objective = objective
+        self.matrix = matrix
+        self.signs = signs
+        self.rhs = rhs
+        self.names = names
+        self.upper = upper
+
+    def with_bound_rows(self):
+        """
+        Same PL whose upper bounds are additional <= constraints, for the solvers without bounds
+        :return: Problem without upper
+        """
+        if self.upper is None:
+            return self
+        bounded = np.flatnonzero(np.isfinite(self.upper))
+        nb_row = len(self.rhs)
+        signs = list(self.signs) + ["<="] * len(bounded)
+        rhs = np.concatenate([np.asarray(self.rhs, dtype=np.float64), np.asarray(self.upper)[bounded]])
+        if isinstance(self.matrix, CSCMatrix):
+            cols = np.repeat(np.arange(self.matrix.shape[1]), np.diff(self.matrix.indptr))
+            matrix = CSCMatrix.from_triplets(np.concatenate([self.matrix.indices, nb_row + np.arange(len(bounded))]),
+                                             np.concatenate([cols, bounded]),
+                                             np.concatenate([self.matrix.data, np.ones(len(bounded))]),
+                                             (len(signs), self.matrix.shape[1]))
+        else:
+            matrix = np.vstack([self.matrix, np.eye(len(self.objective))[bounded]])
+        return Problem(self.max_min, self.objective, matrix, signs, rhs, self.names)
+
+    def to_table(self):
+        """
+        Table of the problem as lists, the objective first then each constraint with its right hand side
+        Values are python int when they are all integers
+        :return: multidimensional list
+        """
+        matrix = self.matrix.toarray() if isinstance(self.matrix, CSCMatrix) else self.matrix
+        table = np.vstack([np.append(self.objective, 0), np.column_stack([matrix, self.rhs])])
+        if np.all(table == np.round(table)):
+            table = table.astype(np.int64)
+        table = table.tolist()
+        table[0].pop()  # The objective row has no right hand side
+        return table
+
+
+def format_problem(problem):
+    """
+    Write a Problem in the "max c1 c2 ..." / "ub u1 u2 ..." / "a1 a2 ... <= b" format, parse_problem
+    giving it back
+    :param problem: Problem
+    :return: string of the PL
+    """
+    def numbers(values):
+        return " ".join(repr(float(value)) for value in values)
+
+    lines = ["{} {}".format(problem.max_min, numbers(problem.objective))]
+    if problem.upper is not None:
+        lines.append(" ".join(["ub"] + ["-" if value == np.inf else repr(float(value)) for value in problem.upper]))
+    matrix = problem.matrix.toarray() if isinstance(problem.matrix, CSCMatrix) else np.asarray(problem.matrix)
+    for row, sign, value in zip(matrix.reshape(len(problem.rhs), len(problem.objective)), problem.signs,
+                                problem.rhs):
+        lines.append("{} {} {!r}".format(numbers(row), sign, float(value)))
+    return "\n".join(lines) + "\n"
+
+
+def parse_rows(text, width):
+    """
+    Parse complete constraint lines in one pass
+    :param text: string of whole lines "a1 ... an sign b"
+    :param width: number of tokens of a line
+    :return: ndarray of shape (number of lines, width), the signs replaced by inf for <=, -inf for >=
+        and nan for =, which can not be mistaken for a coefficient
+    """
+    coded = text.replace("<=", " inf ").replace(">=", " -inf ").replace("=", " nan ")
+    try:
+        rows = np.loadtxt(coded.splitlines(), ndmin=2, comments=None)  # Parsed by numpy in C, blank lines skipped
+    except ValueError:
+        raise exceptions.NotDigitError("Constraints should contain digits and one sign only")
+    if not len(rows):
+        return np.zeros((0, width))
+    if rows.shape[1] != width:
+        raise exceptions.NotDigitError("Every constraint should have {} numbers and a sign".format(width - 1))
+    finite = np.isfinite(rows)
+    if finite[:, -2].any() or not finite[:, :-2].all() or not finite[:, -1].all():
+        raise exceptions.NotDigitError("Every constraint should have one sign before its right hand side")
+    return rows
+
+
+def decode_signs(codes):
+    """
+    Signs of the constraints from their code in the parsed lines
+    :param codes: ndarray of inf, -inf or nan
+    :return: list of signs
+    """
+    signs = np.where(np.isnan(codes), "=", np.where(codes > 0, "<=", ">="))
+    return signs.tolist()
+
+
+def iter_row_blocks(my_file, width, chunk_size):
+    """
+    Parse the constraint lines chunk by chunk
+    :param my_file: file positioned after the objective line
+    :param width: number of tokens of a line
+    :param chunk_size: number of characters read at once
+    :return: generator of ndarray blocks of parsed lines
+    """
+    rest = ""
+    while True:
+        chunk = my_file.read(chunk_size)
+        if not chunk:
+            break
+        chunk = rest + chunk
+        end = chunk.rfind("\n") + 1  # Only parse whole lines, the rest goes with the next chunk
+        rest = chunk[end:]
+        if end:
+            yield parse_rows(chunk[:end], width)
+    if rest.strip():
+        yield parse_rows(rest, width)
+
+
+def read_problem(file, sparse=False, chunk_size=1 << 22):
+    """
+    Read a PL in the "max c1 c2 ..." / "a1 a2 ... <= b" format, chunk by chunk so that the text
+    of a huge file is never held in memory at once
+    Lines "ub u1 u2 ..." right after the objective give upper bounds to the variables
+    :param file: file containing the PL
+    :param sparse: return the constraints as a CSCMatrix, only the non zeros of a chunk being kept
+    :param chunk_size: number of characters read at once
+    :return: Problem
+    """
+    try:
+        my_file = open(file, encoding='utf-8')
+    except (IOError, OSError):
+        raise FileNotFoundError("File not found. Try to check the name you provided.")
+    with my_file:
+        return read_stream(my_file, sparse, chunk_size)
+
+
+def parse_problem(text, sparse=False):
+    """
+    Parse a PL given as a string in the "max c1 c2 ..." / "ub u1 u2 ..." / "a1 a2 ... <= b" format
+    :param text: string of the PL
+    :param sparse: return the constraints as a CSCMatrix
+    :return: Problem
+    """
+    return read_stream(io.StringIO(text.strip()), sparse)
+
+
+def read_stream(my_file, sparse=False, chunk_size=1 << 22):
+    """
+    Read a PL from an opened text stream
+    :param my_file: text stream
+    :param sparse: return the constraints as a CSCMatrix, only the non zeros of a chunk being kept
+    :param chunk_size: number of characters read at once
+    :return: Problem
+    """
+    first_line = my_file.readline().split()
+    if not first_line:
+        raise exceptions.NotDigitError("First line should be max or min followed by the objective")
+    try:
+        objective = np.array(first_line[1:], dtype=np.float64)
+    except ValueError:
+        raise exceptions.NotDigitError("Objective should contain digits only")
+    width = len(objective) + 2  # coefficients, sign and right hand side
+    upper = read_upper_bounds(my_file, len(objective))
+
+    blocks, triplets = [], []
+    nb_row = 0
+    for block in iter_row_blocks(my_file, width, chunk_size):
+        if sparse:  # Keep only the non zeros and the last two columns
+            rows, cols = np.nonzero(block[:, :-2])
+            triplets.append((rows + nb_row, cols, block[rows, cols]))
+            block = block[:, -2:]
+        blocks.append(block)
+        nb_row += len(block)
+
+    rows = np.concatenate(blocks) if blocks else np.zeros((0, 2 if sparse else width))
+    signs = decode_signs(rows[:, -2])
+    if sparse:
+        rows_cols_values = [np.concatenate(values) for values in zip(*triplets)] or [[], [], []]
+        matrix = CSCMatrix.from_triplets(*rows_cols_values, (nb_row, len(objective)))
+    else:
+        matrix = rows[:, :-2]
+    return Problem(first_line[0], objective, matrix, signs, rows[:, -1], upper=upper)
+
+
+def read_upper_bounds(my_file, nb_var):
+    """
+    Read the "ub u1 u2 ..." lines following the objective, inf or - standing for no bound, the
+    smallest bound of a variable being kept
+    The stream is left at the first constraint line
+    :param my_file: text stream after the objective line
+    :param nb_var: number of variables
+    :return: ndarray of the upper bounds, None if there is no ub line
+    """
+    upper = None
+    while True:
+        position = my_file.tell()
+        line = my_file.readline().split()
+        if not line or line[0] != "ub":
+            my_file.seek(position)
+            return upper
+        if len(line) != nb_var + 1:
+            raise exceptions.NotDigitError("ub should be followed by one bound per variable")
+        try:
+            bounds = np.array([np.inf if value == "-" else value for value in line[1:]], dtype=np.float64)
+        except ValueError:
+            raise exceptions.NotDigitError("Bounds should contain digits only")
+        if (bounds < 0).any():
+            raise ValueError("Negative upper bounds are not supported, every variable is non negative")
+        upper = bounds if upper is None else np.minimum(upper, bounds)
+
+
+mps_fields = [(1, 3), (4, 12), (14, 22), (24, 36), (39, 47), (49, 61)]  # Columns of the fixed MPS fields
+
+
+def split_mps_line(line, fixed):
+    """
+    Fields of a data line of a MPS file
+    :param line: line without its end of line
+    :param fixed: wether the file is in fixed format, names may then contain spaces
+    :return: list of the non empty fields
+    """
+    if not fixed:
+        return line.split()
+    fields = [line[start:stop].strip() for start, stop in mps_fields]
+    return [field for field in fields if field]
+
+
+def read_mps(file, fixed=False, sparse=True):
+    """
+    Read a PL in free or fixed MPS format, minimized unless OBJSENSE says otherwise
+    Upper bounds are kept as the upper bounds of the variables, RANGES and the other BOUNDS are
+    turned into additional constraints, free and negative variables are not supported since every
+    variable is non negative
+    :param file: MPS file
+    :param fixed: wether the file is in fixed MPS format
+    :param sparse: return the constraints as a CSCMatrix
+    :return: Problem, the variable names in names
+    """
+    try:
+        my_file = open(file, encoding='utf-8')
+    except (IOError, OSError):
+        raise FileNotFoundError("File not found. Try to check the name you provided.")
+
+    max_min = "min"
+    objective_name = None
+    row_index, row_signs = {}, []
+    col_index, objective = {}, []
+    rows, cols, values = [], [], []
+    rhs, ranges, bounds = {}, {}, []
+    section = None
+    mps_signs = {"L": "<=", "G": ">=", "E": "="}
+    with my_file:
+        for line in my_file:
+            line = line.rstrip("\n\r")
+            if not line.strip() or line.startswith("*"):
+                continue
+            if not line[0].isspace():  # Section header
+                header = line.split()
+                section = header[0]
+                if section == "OBJSENSE" and len(header) > 1:
+                    max_min = header[1][:3].lower()
+                if section == "ENDATA":
+                    break
+                continue
+            fields = split_mps_line(line, fixed)
+            try:
+                if section == "OBJSENSE":
+                    max_min = fields[0][:3].lower()
+                elif section == "ROWS":
+                    if fields[0] == "N":
+                        objective_name = objective_name or fields[1]
+                    else:
+                        row_index[fields[1]] = len(row_signs)
+                        row_signs.append(mps_signs[fields[0]])
+                elif section == "COLUMNS":
+                    if "'MARKER'" in fields:
+                        continue
+                    if fields[0] not in col_index:
+                        col_index[fields[0]] = len(objective)
+                        objective.append(0.)
+                    col = col_index[fields[0]]
+                    for name, value in zip(fields[1::2], fields[2::2]):
+                        if name == objective_name:
+                            objective[col] = float(value)
+                        elif name in row_index:
+                            rows.append(row_index[name])
+                            cols.append(col)
+                            values.append(float(value))
+                elif section in ("RHS", "RANGES"):
+                    target = rhs if section == "RHS" else ranges
+                    if len(fields) % 2:  # The first field is the name of the vector
+                        fields = fields[1:]
+                    for name, value in zip(fields[::2], fields[1::2]):
+                        if name in row_index:
+                            target[row_index[name]] = float(value)
+                elif section == "BOUNDS":  # type, optional bound name, column and value if any
+                    kind = fields[0]
+                    if fields[-1] in col_index:
+                        bounds.append((kind, col_index[fields[-1]], None))
+                    else:
+                        bounds.append((kind, col_index[fields[-2]], float(fields[-1])))
+            except (IndexError, KeyError, ValueError):
+                raise exceptions.NotDigitError("Malformed MPS line in {}: {}".format(section, line.strip()))
+
+    nb_row = len(row_signs)
+    signs = list(row_signs)
+    b = [rhs.get(row, 0.) for row in range(nb_row)]
+
+    def add_row(col_values, sign, value):
+        for col, coefficient in col_values:
+            rows.append(len(signs))
+            cols.append(col)
+            values.append(coefficient)
+        signs.append(sign)
+        b.append(value)
+
+    for row, width in ranges.items():  # A range gives the row a second side
+        if signs[row] == "<=":
+            add_row(row_coefficients(rows, cols, values, row), ">=", b[row] - abs(width))
+        elif signs[row] == ">=":
+            add_row(row_coefficients(rows, cols, values, row), "<=", b[row] + abs(width))
+        else:
+            signs[row] = ">=" if width > 0 else "<="
+            add_row(row_coefficients(rows, cols, values, row), "<=" if width > 0 else ">=", b[row] + width)
+    upper = np.full(len(objective), np.inf)
+    for kind, col, value in bounds:
+        if kind in ("FR", "MI"):
+            raise ValueError("Free variables are not supported, every variable is non negative")
+        if kind in ("UP", "BV"):
+            if kind == "UP" and value < 0:
+                raise ValueError("Negative upper bounds are not supported, every variable is non negative")
+            upper[col] = min(upper[col], 1. if kind == "BV" else value)
+        elif kind in ("LO", "LI"):
+            if value < 0:
+                raise ValueError("Negative lower bounds are not supported, every variable is non negative")
+            if value > 0:
+                add_row([(col, 1.)], ">=", value)
+        elif kind == "FX":
+            add_row([(col, 1.)], "=", value)
+        elif kind == "UI":
+            upper[col] = min(upper[col], value)
+
+    names = sorted(col_index, key=col_index.get)
+    matrix = CSCMatrix.from_triplets(rows, cols, values, (len(signs), len(objective)))
+    return Problem(max_min, np.array(objective), matrix if sparse else matrix.toarray(), signs, np.array(b),
+                   names, upper if np.isfinite(upper).any() else None)
+
+
+def row_coefficients(rows, cols, values, row):
+    """
+    Coefficients of a row among the triplets read so far
+    :return: list of (column, value) tuples
+    """
+    return [(col, value) for r, col, value in zip(rows, cols, values) if r == row]
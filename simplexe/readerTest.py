@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import reader
+import exceptions
+import PL
+
+
+class ReaderTest(unittest.TestCase):
+
+    def write(self, text, suffix='.txt'):
+        my_file = tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False)
+        my_file.write(text)
+        my_file.close()
+        self.addCleanup(os.remove, my_file.name)
+        return my_file.name
+
+    def test_read_problem(self):
+        """
+        read_problem should parse the file whatever the size of the chunks
+        :return:
+        """
+        for chunk_size in (3, 1 << 22):
+            problem = reader.read_problem('file3.txt', chunk_size=chunk_size)
+            self.assertEqual(problem.max_min, 'max')
+            self.assertEqual(problem.signs, ['<=', '>=', '>='])
+            self.assertEqual(problem.to_table(), [[2, -1, 2, 1], [1, 2, 2, 1, 10], [3, 1, 1, -1, 6],
+                                                  [1, 1, 1, 1, 4]])
+            sparse = reader.read_problem('file3.txt', sparse=True, chunk_size=chunk_size)
+            self.assertEqual(sparse.matrix.toarray().tolist(), problem.matrix.tolist())
+        self.assertRaises(FileNotFoundError, reader.read_problem, 'no_file.txt')
+
+    def test_parse_problem(self):
+        """
+        parse_problem should accept floats and = constraints and reject malformed lines
+        :return:
+        """
+        problem = reader.parse_problem('min 1.5 2\n0.5 1 = 3\n\n1e1 0 >= -2\n')
+        self.assertEqual(problem.max_min, 'min')
+        self.assertEqual(problem.signs, ['=', '>='])
+        self.assertEqual(problem.to_table(), [[1.5, 2], [0.5, 1, 3], [10, 0, -2]])
+        problem = reader.parse_problem('max 1 2\nub 3 -\nub 2 inf\n1 1 <= 4')
+        self.assertEqual(problem.upper.tolist(), [2, np.inf])
+        self.assertEqual(problem.to_table(), [[1, 2], [1, 1, 4]])
+        self.assertIsNone(reader.parse_problem('max 1 2\n1 1 <= 4').upper)
+        self.assertRaises(ValueError, reader.parse_problem, 'max 1 2\nub -1 2\n1 1 <= 4')
+        for text in ['max 1 2\nub 1\n1 1 <= 4', 'max 1 2\nub 1 a\n1 1 <= 4', 'max 1 2\n1 2 <= x', 'max 1 2\n1 2 3 <= 4', 'max 1 a', 'max 1 2\n1 <= 2 3',
+                     'max 1 2\n1 2 3 4']:
+            self.assertRaises(exceptions.NotDigitError, reader.parse_problem, text)
+
+    def test_format_problem(self):
+        """
+        format_problem should write a PL that parse_problem reads back, bounds and sparse matrix included
+        :return:
+        """
+        problem = reader.parse_problem('min 0.1 2\nub 3 -\n1 1 <= 4\n0.5 0 = 1e-3', sparse=True)
+        text = reader.format_problem(problem)
+        self.assertEqual(text, 'min 0.1 2.0\nub 3.0 -\n1.0 1.0 <= 4.0\n0.5 0.0 = 0.001\n')
+        self.assertEqual(reader.parse_problem(text).to_table(), problem.to_table())
+
+    def test_read_mps(self):
+        """
+        read_mps should read free and fixed MPS, upper bounds being kept on the variables
+        :return:
+        """
+        free = self.write('NAME TEST\nOBJSENSE\n    MAX\nROWS\n N COST\n L LIM1\n G LIM2\n E MYEQN\n'
+                          'COLUMNS\n    X1 COST 1 LIM1 1\n    X1 LIM2 1\n    X2 COST 2 LIM1 1\n'
+                          '    X2 MYEQN -1\n    X3 COST -1 MYEQN 1\nRHS\n    RHS LIM1 4 LIM2 1\n'
+                          '    RHS MYEQN 7\nBOUNDS\n UP BND X1 4\nENDATA\n', '.mps')
+        fixed = self.write('NAME          TEST\nROWS\n N  COST\n L  LIM 1\nCOLUMNS\n'
+                           '    X 1       COST      1.0            LIM 1     2.0\n'
+                           'RHS\n    RHS       LIM 1     4.0\nENDATA\n', '.mps')
+        problem = reader.read_mps(free)
+        self.assertEqual(problem.max_min, 'max')
+        self.assertEqual(problem.names, ['X1', 'X2', 'X3'])
+        self.assertEqual(problem.objective.tolist(), [1, 2, -1])
+        self.assertEqual(problem.signs, ['<=', '>=', '='])
+        self.assertEqual(problem.upper.tolist(), [4, np.inf, np.inf])
+        problem = problem.with_bound_rows()
+        self.assertEqual(problem.signs, ['<=', '>=', '=', '<='])
+        self.assertEqual(problem.rhs.tolist(), [4, 1, 7, 4])
+        self.assertEqual(problem.matrix.toarray().tolist(), [[1, 1, 0], [1, 0, 0], [0, -1, 1], [1, 0, 0]])
+        my_PL = PL.PL(free, verbosity=PL.SILENT)
+        my_PL.solve("revised")
+        self.assertAlmostEqual(my_PL.optimal_val, -3)  # x1 + x2 = 4, x3 = 7 + x2
+        problem = reader.read_mps(fixed, fixed=True, sparse=False)
+        self.assertEqual(problem.max_min, 'min')
+        self.assertEqual(problem.names, ['X 1'])
+        self.assertTrue(np.array_equal(problem.matrix, [[2.]]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,401 @@
+import numpy as np
+import exceptions
+from sparse import CSCMatrix, EtaFactor
+
+
+slack_coefficients = {"<=": 1., ">=": -1., "=": 0.}
+
+
+class LUFactor:
+    """
+    LU factorization with partial pivoting of a square matrix, P B = L U
+    The columns are factorized by panels: the pivots of a panel only update the panel, the rest of the
+    matrix being updated once per panel with a matrix product
+    Attributes:
+        lu: ndarray holding L (unit diagonal, below) and U (on and above the diagonal)
+        perm: row permutation applied to the matrix
+    """
+
+    def __init__(self, matrix, panel_size=64):
+        """
+        Factorize the matrix
+        :param matrix: square ndarray
+        :param panel_size: number of columns of a panel
+        """
+        self.lu = np.array(matrix, dtype=np.float64)
+        size = len(self.lu)
+        self.perm = np.arange(size)
+        for start in range(0, size, panel_size):
+            end = min(start + panel_size, size)
+            for k in range(start, end):
+                pivot_row = k + int(np.argmax(np.abs(self.lu[k:, k])))
+                if self.lu[pivot_row, k] == 0:
+                    raise np.linalg.LinAlgError("Singular basis")
+                if pivot_row != k:
+                    self.lu[[k, pivot_row]] = self.lu[[pivot_row, k]]
+                    self.perm[[k, pivot_row]] = self.perm[[pivot_row, k]]
+                self.lu[k + 1:, k] /= self.lu[k, k]
+                self.lu[k + 1:, k + 1:end] -= np.outer(self.lu[k + 1:, k], self.lu[k, k + 1:end])
+            for k in range(start, end):  # Rows of U right of the panel, L11 U12 = A12
+                self.lu[k + 1:end, end:] -= np.outer(self.lu[k + 1:end, k], self.lu[k, end:])
+            self.lu[end:, end:] -= self.lu[end:, start:end] @ self.lu[start:end, end:]
+
+    def solve(self, rhs):
+        """
+        Solve B x = rhs
+        :param rhs: ndarray
+        :return: ndarray x
+        """
+        x = np.array(rhs, dtype=np.float64)[self.perm]
+        for k in range(1, len(x)):  # L y = P rhs
+            x[k] -= self.lu[k, :k] @ x[:k]
+        for k in range(len(x) - 1, -1, -1):  # U x = y
+            x[k] = (x[k] - self.lu[k, k + 1:] @ x[k + 1:]) / self.lu[k, k]
+        return x
+
+    def solve_transpose(self, rhs):
+        """
+        Solve B^T y = rhs
+        :param rhs: ndarray
+        :return: ndarray y
+        """
+        y = np.array(rhs, dtype=np.float64)
+        for k in range(len(y)):  # U^T z = rhs
+            y[k] = (y[k] - self.lu[:k, k] @ y[:k]) / self.lu[k, k]
+        for k in range(len(y) - 2, -1, -1):  # L^T w = z
+            y[k] -= self.lu[k + 1:, k] @ y[k + 1:]
+        result = np.empty_like(y)
+        result[self.perm] = y
+        return result
+
+
+class BasisFactor:
+    """
+    Factorization of the basis matrix: a LU factorization followed by eta matrices (product form),
+    one for each pivot since the last refactorization
+    Attributes:
+        lu: LUFactor of the basis at the last refactorization
+        etas: list of (row, column) tuples, the eta column replacing the row-th column of the identity
+    """
+
+    def __init__(self, matrix):
+        self.lu = LUFactor(matrix)
+        self.etas = []
+
+    def ftran(self, column):
+        """
+        Solve B x = column
+        :param column: ndarray
+        :return: ndarray x
+        """
+        x = self.lu.solve(column)
+        for row, eta in self.etas:
+            pivot = x[row] / eta[row]
+            x -= pivot * eta
+            x[row] = pivot
+        return x
+
+    def btran(self, row_vector):
+        """
+        Solve B^T y = row_vector
+        :param row_vector: ndarray
+        :return: ndarray y
+        """
+        y = np.array(row_vector, dtype=np.float64)
+        for row, eta in reversed(self.etas):
+            y[row] = (y[row] - eta @ y + eta[row] * y[row]) / eta[row]
+        return self.lu.solve_transpose(y)
+
+    def update(self, row, column):
+        """
+        Record the replacement of the row-th basic column
+        :param row: position in the basis of the leaving variable
+        :param column: ndarray B^-1 a of the entering variable
+        """
+        self.etas.append((row, column))
+
+
+class RevisedSimplex:
+    """
+    Revised simplex method for max c x subject to A x (<=, >= or =) b, x >= 0
+    Only a factorization of the basis is kept, the columns are priced on demand and the basis
+    is refactorized periodically. The slack and artificial columns are never stored, and A may be
+    a CSCMatrix, in which case the basis is kept in sparse product form
+    Attributes:
+        nb_var: number of original variables
+        structural: constraint matrix A, ndarray or CSCMatrix, rows made so that b >= 0
+        slack: coefficient of the slack variable of each row
+        artif_rows: rows having an artificial variable
+        cost: objective coefficients of every column
+        rhs: right hand side, made non negative
+        basis: list of the basic column of each row
+        x: values of the original variables at the optimum
+        optimal_val: optimal value
+        nb_iteration: number of pivots
+        max_iterations: number of pivots after which IterationLimitError is raised, no limit if None
+        stall_limit: number of degenerate pivots in a row after which Bland's rule is used
+        nb_stalled: number of degenerate pivots in a row
+        bland: boolean telling if the smallest index rule, which never cycles, chooses the pivots
+    """
+
+    def __init__(self, objective, matrix, signs, rhs, refactor_period=50, block_size=None, tol=1e-9,
+                 max_iterations=None, stall_limit=50):
+        """
+        :param objective: list of the objective coefficients
+        :param matrix: multidimensional list, ndarray or CSCMatrix of the constraint coefficients
+        :param signs: list of the constraint signs, "<=", ">=" or "="
+        :param rhs: list of the right hand sides
+        :param refactor_period: number of eta matrices before the basis is refactorized
+        :param block_size: number of columns priced at once, all of them if None
+        :param tol: tolerance under which a number is considered zero
+        :param max_iterations: number of pivots after which IterationLimitError is raised, no limit if None
+        :param stall_limit: number of degenerate pivots in a row after which Bland's rule is used
+        """
+        rhs = np.array(rhs, dtype=np.float64)
+        flip = rhs < 0  # Rows multiplied by -1 so that b >= 0
+        self.sparse = isinstance(matrix, CSCMatrix)
+        if self.sparse:
+            self.structural = CSCMatrix(np.where(flip[matrix.indices], -matrix.data, matrix.data),
+                                        matrix.indices, matrix.indptr, matrix.shape)
+        else:
+            self.structural = np.array(matrix, dtype=np.float64).reshape(len(rhs), len(objective))
+            self.structural[flip] *= -1
+        nb_row, self.nb_var = self.structural.shape
+        rhs[flip] *= -1
+        self.slack = np.array([slack_coefficients[sign] for sign in signs])  # 0 for an equality, no slack
+        self.slack[flip] *= -1
+        self.artif_rows = np.flatnonzero(self.slack <= 0)  # Rows whose slack can not be basic
+
+        self.nb_col = self.nb_var + nb_row + len(self.artif_rows)
+        self.cost = np.zeros(self.nb_col)
+        self.cost[:self.nb_var] = objective
+        self.rhs = rhs
+        self.nb_artif = len(self.artif_rows)
+        self.logical = np.arange(self.nb_var, self.nb_var + nb_row)  # First variable of each row to be basic
+        self.logical[self.artif_rows] = self.nb_var + nb_row + np.arange(self.nb_artif)
+        self.basis = self.logical.tolist()
+        self.refactor_period = refactor_period
+        self.block_size = block_size or max(self.nb_col, 1)
+        self.tol = tol
+        self.next_block = 0
+        self.factor = None
+        self.nb_updates = 0  # Pivots since the last refactorization
+        self.x_basis = None
+        self.x = None
+        self.optimal_val = None
+        self.nb_iteration = 0
+        self.max_iterations = max_iterations
+        self.stall_limit = stall_limit
+        self.nb_stalled = 0
+        self.bland = False
+
+    def column(self, col):
+        """
+        Dense copy of a column, slack and artificial columns included
+        :param col: index of the column
+        :return: ndarray
+        """
+        nb_row = len(self.rhs)
+        if col < self.nb_var:
+            return self.structural.column(col) if self.sparse else self.structural[:, col].copy()
+        result = np.zeros(nb_row)
+        if col < self.nb_var + nb_row:
+            result[col - self.nb_var] = self.slack[col - self.nb_var]
+        else:
+            result[self.artif_rows[col - self.nb_var - nb_row]] = 1
+        return result
+
+    def column_prices(self, duals, columns):
+        """
+        Product of the duals with some columns, slack and artificial columns included
+        :param duals: ndarray of the size of a column
+        :param columns: ndarray of column indices
+        :return: ndarray of the size of columns
+        """
+        nb_row = len(self.rhs)
+        result = np.empty(len(columns))
+        structural = columns < self.nb_var
+        if self.sparse:
+            result[structural] = self.structural.dot_columns(duals, columns[structural])
+        else:
+            result[structural] = duals @ self.structural[:, columns[structural]]
+        slack = ~structural & (columns < self.nb_var + nb_row)
+        rows = columns[slack] - self.nb_var
+        result[slack] = duals[rows] * self.slack[rows]
+        artif = columns >= self.nb_var + nb_row
+        result[artif] = duals[self.artif_rows[columns[artif] - self.nb_var - nb_row]]
+        return result
+
+    def refactorize(self):
+        """
+        Factorize the current basis from scratch and recompute the basic values
+        """
+        if self.sparse:
+            self.reinvert()
+        else:
+            self.factor = BasisFactor(np.column_stack([self.column(col) for col in self.basis]))
+        self.nb_updates = 0
+        self.x_basis = self.factor.ftran(self.rhs)
+
+    def reinvert(self):
+        """
+        Rebuild the product form of the basis, starting from the logical variables of each row and
+        bringing in the other basic columns one by one
+        """
+        self.factor = EtaFactor([self.column(col)[row] for row, col in enumerate(self.logical)])
+        basic = set(self.basis)
+        free_rows = np.array([col not in basic for col in self.logical])
+        new_basis = [col if col in basic else None for col in self.logical]
+        for col in sorted(basic - set(self.logical.tolist())):
+            column = self.factor.ftran(self.column(col))
+            row = int(np.argmax(np.where(free_rows, np.abs(column), -1)))
+            self.factor.update(row, column)
+            free_rows[row] = False
+            new_basis[row] = col
+        self.basis = new_basis
+
+    def price(self, cost, allowed):
+        """
+        Choose the entering column, pricing the columns block by block
+        :param cost: objective coefficients of every column
+        :param allowed: boolean array of the columns allowed to enter
+        :return: index of the entering column or None if the basis is optimal
+        """
+        duals = self.factor.btran(cost[self.basis])
+        if self.bland:  # The first column which improves the objective
+            reduced_costs = np.where(allowed, cost - self.column_prices(duals, np.arange(self.nb_col)), 0)
+            improving = np.flatnonzero(reduced_costs > self.tol)
+            return int(improving[0]) if len(improving) else None
+        order = np.roll(np.arange(self.nb_col), -self.next_block)  # Start after the last chosen block
+        for i in range(0, self.nb_col, self.block_size):
+            columns = order[i:i + self.block_size]
+            reduced_costs = cost[columns] - self.column_prices(duals, columns)
+            reduced_costs[~allowed[columns]] = 0
+            best = int(np.argmax(reduced_costs))
+            if reduced_costs[best] > self.tol:
+                self.next_block = (columns[-1] + 1) % self.nb_col
+                return int(columns[best])
+        return None
+
+    def ratio_test(self, column):
+        """
+        Choose the leaving row with the minimum ratio test
+        :param column: ndarray B^-1 a of the entering column
+        :return: position in the basis of the leaving variable
+        """
+        positive = column > self.tol
+        if not positive.any():
+            raise exceptions.SolutionNonBorneeError("Solution non bornee")
+        ratios = np.full(len(column), np.inf)
+        ratios[positive] = self.x_basis[positive] / column[positive]
+        if self.bland:  # Among the minimum ratios, the basic variable of smallest index
+            ties = np.flatnonzero(ratios <= ratios.min() + self.tol)
+            return int(min(ties, key=lambda row: self.basis[row]))
+        return int(np.argmin(ratios))
+
+    def iterate(self, cost, allowed, refactor=True):
+        """
+        Pivot until the basis is optimal for the given cost
+        :param cost: objective coefficients of every column
+        :param allowed: boolean array of the columns allowed to enter
+        :param refactor: factorize the basis first, False when it was just factorized
+        """
+        if refactor:
+            self.refactorize()
+        while True:
+            entering = self.price(cost, allowed)
+            if entering is None:
+                return
+            if self.max_iterations is not None and self.nb_iteration >= self.max_iterations:
+                raise exceptions.IterationLimitError("Nombre maximal d'iterations atteint")
+            column = self.factor.ftran(self.column(entering))
+            row = self.ratio_test(column)
+            step = self.x_basis[row] / column[row]
+            self.nb_stalled = self.nb_stalled + 1 if step <= self.tol else 0
+            self.bland = self.bland or self.nb_stalled >= self.stall_limit
+            self.x_basis -= step * column
+            self.x_basis[row] = step
+            self.basis[row] = entering
+            self.nb_iteration += 1
+            if self.nb_updates >= self.refactor_period:
+                self.refactorize()
+            else:
+                self.factor.update(row, column)
+                self.nb_updates += 1
+
+    def solve(self):
+        """
+        Solve the PL, with a first phase when artificial variables are needed
+        Without any constraint, there is no basis to factorize: every variable stays at zero, unless
+        one of them improves the objective, which is then unbounded
+        :return: optimal value
+        """
+        if not len(self.rhs):
+            if (self.cost > self.tol).any():
+                raise exceptions.SolutionNonBorneeError("Solution non bornee")
+            self.basis, self.x_basis = [], np.zeros(0)
+            return self.read_solution()
+        first_artif = self.nb_col - self.nb_artif
+        if self.nb_artif:
+            phase1_cost = np.zeros(self.nb_col)
+            phase1_cost[first_artif:] = -1
+            self.iterate(phase1_cost, np.ones(self.nb_col, dtype=bool))
+            if phase1_cost[self.basis] @ self.x_basis < -self.tol * max(1., np.abs(self.rhs).max()):
+                raise exceptions.SolutionNonRealisableError("Pas de solution realisable")
+            self.drive_out_artificials(first_artif)
+        allowed = np.arange(self.nb_col) < first_artif
+        self.iterate(self.cost, allowed)
+        return self.read_solution()
+
+    def solve_from(self, basis):
+        """
+        Solve the PL from a realisable basis without first phase, as the basis found by the crossover
+        of an interior point
+        :param basis: list of the basic column of each row, without artificial column
+        :return: optimal value
+        :raise ValueError: when the basis is singular or not realisable
+        """
+        first_artif = self.nb_col - self.nb_artif
+        if len(basis) != len(self.rhs) or any(col >= first_artif for col in basis):
+            raise ValueError("A basis has one column, not artificial, for each row")
+        self.basis = list(basis)
+        try:
+            self.refactorize()
+        except np.linalg.LinAlgError:
+            raise ValueError("Singular basis")
+        scale = 1 + np.abs(self.rhs).max(initial=0)
+        residual = np.column_stack([self.column(col) for col in self.basis]) @ self.x_basis - self.rhs
+        if not np.isfinite(self.x_basis).all() or np.abs(residual).max(initial=0) > 1e-6 * scale:
+            raise ValueError("Singular basis")
+        if (self.x_basis < -1e-6 * scale).any():
+            raise ValueError("The basis is not realisable")
+        self.iterate(self.cost, np.arange(self.nb_col) < first_artif, refactor=False)
+        return self.read_solution()
+
+    def read_solution(self):
+        """
+        Read the values of the variables and the optimal value from the optimal basis
+        :return: optimal value
+        """
+        values = np.zeros(self.nb_col)
+        values[self.basis] = self.x_basis
+        self.x = values[:self.nb_var]
+        self.optimal_val = float(self.cost @ values)
+        return self.optimal_val
+
+    def drive_out_artificials(self, first_artif):
+        """
+        Replace the artificial variables still basic at zero level after the first phase
+        :param first_artif: index of the first artificial column
+        """
+        for row, basic in enumerate(self.basis):
+            if basic < first_artif:
+                continue
+            unit = np.zeros(len(self.basis))
+            unit[row] = 1
+            pivot_row = self.column_prices(self.factor.btran(unit), np.arange(first_artif))  # row of B^-1 A
+            pivot_row[[col for col in self.basis if col < first_artif]] = 0
+            candidates = np.flatnonzero(np.abs(pivot_row) > self.tol)
+            if len(candidates):  # otherwise the row is redundant and the artificial stays at zero
+                self.factor.update(row, self.factor.ftran(self.column(int(candidates[0]))))
+                self.basis[row] = int(candidates[0])
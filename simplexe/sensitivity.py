@@ -0,0 +1,120 @@
+"""
+Sensitivity analysis of an optimal table: how far a cost or a right hand side can move before the basis
+changes, and the segments of a parametric change of the costs or of the right hand sides
+The functions work on a normalized table, the basic number of each row being 1 and the z column -1, in the
+max form and the flipped columns of the table. PL.sensitivity and the parametric methods of PL map them
+back to the PL as it was given
+"""
+import numpy as np
+
+
+class Sensitivity:
+    """
+    Sensitivity report of an optimal PL
+    The values of a constraint without slack variable (=) are None, B^-1 being only read from the
+    slack columns of the table
+    Attributes:
+        optimal_val: optimal value
+        solution: list of the values of the variables
+        basis: list of the basic column of each constraint row
+        dual_values: list of the change of the optimal value for each unit added to a right hand side
+        reduced_costs: list of the change of the optimal value for each unit a non basic variable is
+            moved off its bound, 0 for a basic variable
+        cost_ranges: list of the (lowest, highest) value of each objective coefficient keeping the basis
+            optimal, the other coefficients being unchanged
+        rhs_ranges: list of the (lowest, highest) value of each right hand side keeping the basis
+            realisable, the other right hand sides being unchanged
+    """
+
+    def __init__(self, optimal_val, solution, basis, dual_values, reduced_costs, cost_ranges, rhs_ranges):
+        self.optimal_val = optimal_val
+        self.solution = solution
+        self.basis = basis
+        self.dual_values = dual_values
+        self.reduced_costs = reduced_costs
+        self.cost_ranges = cost_ranges
+        self.rhs_ranges = rhs_ranges
+
+    def __repr__(self):
+        return "Sensitivity(optimal_val={!r}, dual_values={!r}, reduced_costs={!r})".format(
+            self.optimal_val, self.dual_values, self.reduced_costs)
+
+
+class Segment:
+    """
+    Interval of the parameter of a parametric change on which one basis stays optimal
+    The solution and the optimal value are linear in the parameter along the segment
+    Attributes:
+        start, end: values of the parameter at the ends of the segment
+        basis: list of the basic column of each constraint row
+        solution, solution_end: lists of the values of the variables at start and at end
+        optimal_val, optimal_val_end: optimal values at start and at end
+    """
+
+    def __init__(self, start, end, basis, solution, solution_end, optimal_val, optimal_val_end):
+        self.start = start
+        self.end = end
+        self.basis = basis
+        self.solution = solution
+        self.solution_end = solution_end
+        self.optimal_val = optimal_val
+        self.optimal_val_end = optimal_val_end
+
+    def __repr__(self):
+        return "Segment(start={!r}, end={!r}, optimal_val={!r}, optimal_val_end={!r})".format(
+            self.start, self.end, self.optimal_val, self.optimal_val_end)
+
+
+def normalize(table, basis):
+    """
+    Scale the rows of a table so that the basic numbers are 1 and the z number -1, in place
+    :param table: float ndarray of an optimal table
+    :param basis: list of the basic column of each constraint row
+    :return: the table
+    """
+    table[1:] /= table[np.arange(1, len(table)), basis][:, None]
+    table[0] /= -table[0][-2]
+    return table
+
+
+def cost_range(table, basis, col, tol=1e-9):
+    """
+    Change of the cost of a column of a normalized table keeping every reduced cost non positive
+    :param table: normalized float ndarray of an optimal table
+    :param basis: list of the basic column of each constraint row
+    :param col: index of the column
+    :param tol: numbers smaller than tol are taken as zero
+    :return: tuple of the lowest and highest change, -inf or inf when there is no limit
+    """
+    costs = table[0, :-2]
+    if col not in basis:  # Only its own reduced cost moves
+        return -np.inf, -costs[col]
+    row = table[basis.index(col) + 1, :-2]
+    nonbasic = np.ones(len(row), dtype=bool)
+    nonbasic[basis] = False
+    # The reduced cost of a non basic column l becomes costs[l] - change * row[l]
+    positive, negative = nonbasic & (row > tol), nonbasic & (row < -tol)
+    return ((costs[positive] / row[positive]).max(initial=-np.inf),
+            (costs[negative] / row[negative]).min(initial=np.inf))
+
+
+def rhs_range(values, column, upper, tol=1e-9):
+    """
+    Steps t keeping the basic values + t column between zero and their upper bound
+    :param values: ndarray of the basic values
+    :param column: ndarray of the change of each basic value for a unit step
+    :param upper: ndarray of the upper bound of each basic variable, inf when it has none
+    :param tol: numbers smaller than tol are taken as zero
+    :return: tuple of the lowest and highest step, and of the rows limiting them, None when there is
+        no limit
+    """
+    low, high = np.full(len(values), -np.inf), np.full(len(values), np.inf)
+    positive, negative = column > tol, column < -tol
+    low[positive] = -values[positive] / column[positive]
+    high[negative] = -values[negative] / column[negative]
+    bounded = np.isfinite(upper)
+    high[positive & bounded] = ((upper - values) / np.where(positive, column, 1))[positive & bounded]
+    low[negative & bounded] = ((upper - values) / np.where(negative, column, 1))[negative & bounded]
+    low_row = int(np.argmax(low)) if np.isfinite(low).any() else None
+    high_row = int(np.argmin(high)) if np.isfinite(high).any() else None
+    return (min(low.max(initial=-np.inf), 0.), max(high.min(initial=np.inf), 0.), low_row, high_row)
@@ -0,0 +1,107 @@
+import unittest
+import numpy as np
+import PL
+import reader
+import sensitivity
+
+
+def solved(text, **options):
+    """
+    :param text: PL in the text format
+    :param options: keyword arguments of PL.PL
+    :return: PL standardized and solved
+    """
+    my_PL = PL.PL(problem=reader.parse_problem(text), verbosity=PL.SILENT, **options)
+    my_PL.standardize()
+    my_PL.solve()
+    return my_PL
+
+
+class SensitivityTest(unittest.TestCase):
+    wyndor = "max 3 5\n1 0 <= 4\n0 2 <= 12\n3 2 <= 18"
+
+    def test_rhs_range(self):
+        """
+        rhs_range should keep every basic value between zero and its bound
+        """
+        low, high, low_row, high_row = sensitivity.rhs_range(np.array([2., 6., 3.]), np.array([1., -2., 1.]),
+                                                             np.array([np.inf, np.inf, 4.]))
+        self.assertEqual((low, high, low_row, high_row), (-2., 1., 0, 2))
+
+    def test_sensitivity(self):
+        """
+        The dual values, reduced costs and ranges should be those of the textbook example, in exact mode too
+        """
+        for exact in (False, True):
+            report = solved(self.wyndor, exact=exact).sensitivity()
+            self.assertAlmostEqual(report.optimal_val, 36)
+            np.testing.assert_allclose(report.solution, [2, 6])
+            np.testing.assert_allclose(report.dual_values, [0, 1.5, 1])
+            np.testing.assert_allclose(report.reduced_costs, [0, 0])
+            np.testing.assert_allclose(report.cost_ranges, [(0, 7.5), (2, np.inf)])
+            np.testing.assert_allclose(report.rhs_ranges, [(2, np.inf), (6, 18), (12, 24)])
+
+    def test_min_and_bounds(self):
+        """
+        The report of a min PL with bounded variables should agree with solving the changed PL again
+        """
+        text = "min 2 3 4\nub 5 1 inf\n1 1 1 >= 6\n1 2 0 >= 4\n0 1 3 >= 3"
+        my_PL = solved(text)
+        report = my_PL.sensitivity()
+        for row, (low, high) in enumerate(report.rhs_ranges):
+            for value in (low, high):
+                if np.isfinite(value):
+                    changed = solved(text, max_iterations=100)
+                    changed.set_rhs({row: value})
+                    changed.reoptimize()
+                    self.assertAlmostEqual(changed.optimal_val, report.optimal_val
+                                           + report.dual_values[row] * (value - my_PL.rhs[row]))
+        for var, (low, high) in enumerate(report.cost_ranges):
+            for value in (low, high):
+                if np.isfinite(value):
+                    changed = solved(text.replace("min 2 3 4", "min " + " ".join(
+                        str(value if index == var else cost) for index, cost in enumerate([2, 3, 4]))))
+                    self.assertAlmostEqual(changed.optimal_val, report.optimal_val
+                                           + (value - [2, 3, 4][var]) * report.solution[var])
+
+    def test_equality(self):
+        """
+        An equality has no dual value nor range read from the table, and can not be swept
+        """
+        my_PL = solved("max 1 2\n1 1 = 4\n1 0 <= 3")
+        report = my_PL.sensitivity()
+        self.assertEqual(report.dual_values[0], None)
+        self.assertEqual(report.rhs_ranges[0], None)
+        with self.assertRaises(ValueError):
+            my_PL.parametric_rhs({0: 1.})
+        with self.assertRaises(ValueError):
+            solved(self.wyndor, engine="revised").sensitivity()
+
+    def test_parametric_rhs(self):
+        """
+        The sweep should pivot at the end of the range of the right hand side and leave the PL unchanged
+        """
+        my_PL = solved(self.wyndor)
+        segments = my_PL.parametric_rhs({2: 1.}, 20.)
+        self.assertEqual([(segment.start, segment.end) for segment in segments], [(0, 6), (6, 20)])
+        self.assertEqual([(segment.optimal_val, segment.optimal_val_end) for segment in segments],
+                         [(36, 42), (42, 42)])
+        np.testing.assert_allclose(segments[0].solution_end, [4, 6])
+        self.assertEqual(my_PL.optimal_val, 36)
+        segments = my_PL.parametric_rhs({0: -1.}, 10.)
+        self.assertEqual(segments[-1].end, 4)  # x1 <= 4 - theta is not realisable beyond 4
+
+    def test_parametric_objective(self):
+        """
+        The sweep should pivot at the end of the range of the cost
+        """
+        segments = solved(self.wyndor).parametric_objective({0: 1.}, 10.)
+        self.assertEqual([(segment.start, segment.end) for segment in segments], [(0, 4.5), (4.5, 10)])
+        np.testing.assert_allclose(segments[1].solution, [4, 3])
+        self.assertAlmostEqual(segments[1].optimal_val_end, 13 * 4 + 5 * 3)
+        segments = solved("max 1 -1\n1 -1 <= 2\n1 0 <= 4").parametric_objective({1: 1.}, 5.)
+        self.assertEqual(segments[-1].end, 1)  # x2 has a positive cost beyond 1 and is not bounded
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,324 @@
+"""
+Long running solve server, so that a PL costs a round trip instead of starting python and importing numpy
+Usage: python server.py [--socket PATH | --host HOST --port PORT] [-w WORKERS] [--threads] [--timeout SECONDS]
+The server reads one JSON request per line and answers one JSON line per request, in the order of the
+requests of the connection:
+    {"id": 1, "problem": "max 1 2\\n1 1 <= 4\\n", "engine": "auto", "exact": false, "timeout": 10}
+    {"id": 1, "status": "optimal", "optimal_val": 8.0, "solution": [0.0, 4.0], "nb_iteration": 2, ...}
+The problem is in the text format of reader.parse_problem, every other field being optional. The requests
+wait in a bounded queue: once it is full the server stops reading the connections, the clients being
+slowed down by their socket instead of the memory of the server growing. client.Client speaks this protocol
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import stat
+import time
+import PL
+import reader
+
+DEFAULT_PORT = 7640
+MAX_REQUEST_BYTES = 64 * 2 ** 20
+
+
+def solve_text(text, engine=None, exact=False, max_iterations=None):
+    """
+    Solve a PL given in the text format, run in a worker
+    :param text: string of the PL
+    :param engine: name of the engine, one of PL.PL.engines, the default of PL.PL if None
+    :param exact: pivot with exact integers
+    :param max_iterations: number of iterations after which the solve stops, no limit if None
+    :return: dict of the status, optimal value, solution, number of iterations and wall time in seconds,
+        the status being "error" with an error message when the PL can not be read or solved
+    """
+    return solve_source(lambda: reader.parse_problem(text), engine, exact, max_iterations)
+
+
+def solve_file(file, engine=None, exact=False, max_iterations=None):
+    """
+    Solve a PL file in any format read by PL.read_file, text, MPS or binary
+    :param file: file containing the PL
+    :return: dict of the answer, as solve_text
+    """
+    return solve_source(lambda: PL.read_file(file), engine, exact, max_iterations)
+
+
+def solve_source(read, engine, exact, max_iterations):
+    """
+    :param read: function returning the reader.Problem, its errors being answered as those of the solve
+    :return: dict of the answer, as solve_text
+    """
+    start = time.perf_counter()
+    response = {"status": None, "optimal_val": None, "solution": None, "nb_iteration": 0}
+    try:
+        my_PL = PL.PL(problem=read(), verbosity=PL.SILENT, engine=engine, exact=exact,
+                      max_iterations=max_iterations)
+        my_PL.standardize()
+        result = my_PL.solve()
+    except Exception as e:  # A broken PL should not stop the worker
+        response["status"] = "error"
+        response["error"] = "{}: {}".format(type(e).__name__, e)
+    else:
+        response["status"] = result.status
+        response["optimal_val"] = None if result.optimal_val is None else float(result.optimal_val)
+        response["solution"] = None if result.solution is None else [float(value) for value in result.solution]
+        response["nb_iteration"] = result.nb_iteration
+    response["wall_time"] = time.perf_counter() - start
+    return response
+
+
+class SolveServer:
+    """
+    Asyncio server solving the PL of its clients on a pool of workers
+    Each connection is read by a task putting its requests in the shared queue, a worker task taking
+    them out and running solve_text on the executor. A request still waiting or solving at its deadline
+    gets a "timeout" answer. A process can not be interrupted: the worker of a solve which timed out
+    waits for its end before taking the next request, so that no more than workers PL are ever solved
+    at once. max_iterations is the way to bound the solve itself
+    Attributes:
+        workers: number of PL solved at once
+        max_pending: number of requests waiting in the queue before the connections stop being read
+        timeout: default number of seconds given to a request, from its arrival to its answer
+        use_threads: boolean telling if the executor is a pool of threads instead of processes
+        executor: concurrent.futures executor running solve_text, created by start
+        queue: asyncio.Queue of the requests and the futures of their answers
+        server: asyncio.Server listening, None before start
+        path: file of the Unix socket, removed by close, None with TCP
+        worker_tasks: list of the worker tasks
+        connections: set of the tasks serving a connection
+        nb_solved: number of requests answered by a worker
+        nb_timeout: number of requests answered "timeout"
+    """
+
+    def __init__(self, workers=None, max_pending=None, timeout=60., use_threads=False,
+                 max_request_bytes=MAX_REQUEST_BYTES):
+        """
+        :param workers: number of PL solved at once, the number of CPUs if None
+        :param max_pending: number of requests waiting before the connections stop being read, twice the
+            number of workers if None
+        :param timeout: default number of seconds given to a request, no limit if None
+        :param use_threads: solve on a pool of threads, which starts faster than processes but shares
+            the GIL between the solves
+        :param max_request_bytes: size of the longest request line
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.timeout = timeout
+        self.use_threads = use_threads
+        self.max_request_bytes = max_request_bytes
+        self.executor = None
+        self.queue = None
+        self.server = None
+        self.path = None
+        self.worker_tasks = []
+        self.connections = set()
+        self.nb_solved = 0
+        self.nb_timeout = 0
+
+    async def start(self, path=None, host="127.0.0.1", port=DEFAULT_PORT):
+        """
+        Start the workers and listen, on a Unix socket if a path is given and on TCP otherwise
+        The worker processes are started, and PL imported in them, before the first request
+        :param path: file of the Unix socket, a socket left by a previous server being replaced
+        :param host: address to listen on with TCP
+        :param port: TCP port, 0 for any free port
+        :return: the address listened on, the path or a tuple of the host and port
+        """
+        loop = asyncio.get_running_loop()
+        if self.use_threads:
+            self.executor = concurrent.futures.ThreadPoolExecutor(self.workers)
+        else:
+            self.executor = concurrent.futures.ProcessPoolExecutor(self.workers)
+            await asyncio.gather(*(loop.run_in_executor(self.executor, os.getpid) for _ in range(self.workers)))
+        self.queue = asyncio.Queue(self.max_pending)
+        self.worker_tasks = [asyncio.create_task(self.work()) for _ in range(self.workers)]
+        if path is not None:
+            if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+                os.remove(path)
+            self.server = await asyncio.start_unix_server(self.handle, path, limit=self.max_request_bytes)
+            self.path = path
+            return path
+        self.server = await asyncio.start_server(self.handle, host, port, limit=self.max_request_bytes)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        """
+        Stop listening, close the connections and stop the workers, the requests still waiting being dropped
+        """
+        if self.server is not None:
+            self.server.close()
+        tasks = list(self.connections) + self.worker_tasks
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+    async def handle(self, stream_reader, writer):
+        """
+        Serve a connection: its requests are queued as they are read and answered in the same order
+        by a second task, so that a client can send several requests before reading the answers
+        No more than max_pending answers wait to be written, the connection not being read meanwhile
+        :param stream_reader: asyncio.StreamReader of the connection
+        :param writer: asyncio.StreamWriter of the connection
+        """
+        task = asyncio.current_task()
+        self.connections.add(task)
+        answers = asyncio.Queue(self.max_pending)  # Full when the client does not read its answers
+        answering = asyncio.create_task(self.answer(answers, writer))
+        try:
+            try:
+                while True:
+                    try:
+                        line = await stream_reader.readline()
+                    except ValueError:  # Longer than max_request_bytes, the rest of the line can not be skipped
+                        await answers.put(self.rejected(None, "Request longer than {} bytes".format(
+                            self.max_request_bytes)))
+                        break
+                    if not line:
+                        break
+                    if line.strip():
+                        await answers.put(await self.submit(line))
+            except ConnectionError:
+                pass
+            await answers.put(None)
+            await answering
+        except asyncio.CancelledError:  # Closed by close, the stream callback would log an error otherwise
+            pass
+        finally:
+            answering.cancel()
+            writer.close()
+            self.connections.discard(task)
+
+    async def submit(self, line):
+        """
+        Put a request line in the queue, waiting while the queue is full
+        :param line: bytes of the JSON request
+        :return: future of the answer
+        """
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict) or not isinstance(request.get("problem"), str):
+                raise ValueError("A request should be an object with a problem string")
+        except ValueError as e:
+            return self.rejected(None, str(e))
+        for field in ("timeout", "max_iterations"):
+            value = request.get(field)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0):
+                return self.rejected(request.get("id"), "{} should be a non negative number".format(field))
+        timeout = request.get("timeout", self.timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        answer = asyncio.get_running_loop().create_future()
+        await self.queue.put((request, deadline, answer))
+        return answer
+
+    @staticmethod
+    def rejected(request_id, error):
+        """
+        :param request_id: id of the request, None if it could not be read
+        :param error: error message
+        :return: future already holding the error answer
+        """
+        answer = asyncio.get_running_loop().create_future()
+        answer.set_result({"id": request_id, "status": "error", "error": error})
+        return answer
+
+    @staticmethod
+    async def answer(answers, writer):
+        """
+        Write the answers of a connection in the order of its requests
+        :param answers: asyncio.Queue of the futures of the answers, None once the connection is read
+        :param writer: asyncio.StreamWriter of the connection
+        """
+        try:
+            while True:
+                answer = await answers.get()
+                if answer is None:
+                    break
+                writer.write(json.dumps(await answer).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def work(self):
+        """
+        Worker task: solve the queued requests one at a time on the executor
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            request, deadline, answer = await self.queue.get()
+            try:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self.time_out(request, answer)
+                    continue
+                solving = loop.run_in_executor(self.executor, solve_text, request["problem"],
+                                               request.get("engine"), bool(request.get("exact", False)),
+                                               request.get("max_iterations"))
+                try:
+                    response = await asyncio.wait_for(asyncio.shield(solving), remaining)
+                except asyncio.TimeoutError:
+                    self.time_out(request, answer)
+                    await asyncio.gather(solving, return_exceptions=True)  # The slot is busy until the end
+                    continue
+                except Exception as e:  # A worker process died
+                    response = {"status": "error", "error": "{}: {}".format(type(e).__name__, e)}
+                self.nb_solved += 1
+                response["id"] = request.get("id")
+                answer.set_result(response)
+            finally:
+                self.queue.task_done()
+
+    def time_out(self, request, answer):
+        """
+        Answer "timeout" to a request
+        :param request: dict of the request
+        :param answer: future of its answer
+        """
+        self.nb_timeout += 1
+        answer.set_result({"id": request.get("id"), "status": "timeout",
+                           "error": "Pas de reponse avant {} s".format(request.get("timeout", self.timeout))})
+
+
+async def serve(path=None, host="127.0.0.1", port=DEFAULT_PORT, **options):
+    """
+    Run a SolveServer until it is interrupted
+    :param path: file of the Unix socket, TCP if None
+    :param host: address to listen on with TCP
+    :param port: TCP port
+    :param options: keyword arguments of SolveServer
+    """
+    server = SolveServer(**options)
+    address = await server.start(path, host, port)
+    print("Listening on {}".format(address), flush=True)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the solve of PL over a Unix socket or TCP")
+    parser.add_argument("--socket", help="file of the Unix socket, TCP is used if not given")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on with TCP")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument("-w", "--workers", type=int, help="number of PL solved at once, the number of CPUs by default")
+    parser.add_argument("--max-pending", type=int, help="number of requests waiting before the clients are slowed down")
+    parser.add_argument("--timeout", type=float, default=60., help="default seconds given to a request")
+    parser.add_argument("--threads", action="store_true", help="solve on threads instead of processes")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.socket, args.host, args.port, workers=args.workers, max_pending=args.max_pending,
+                          timeout=args.timeout, use_threads=args.threads))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
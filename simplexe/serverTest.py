@@ -0,0 +1,119 @@
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import unittest
+import client
+import server
+
+
+class ServerTest(unittest.TestCase):
+
+    def start(self, path=None, **options):
+        """
+        Run a SolveServer on an event loop of its own thread, closed at the end of the test
+        :param path: file of the Unix socket, TCP on a free port if None
+        :param options: keyword arguments of SolveServer
+        :return: tuple of the server and a function opening a client.Client to it
+        """
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        solve_server = server.SolveServer(**options)
+        address = asyncio.run_coroutine_threadsafe(solve_server.start(path, port=0), loop).result()
+
+        def stop():
+            asyncio.run_coroutine_threadsafe(solve_server.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+        self.addCleanup(stop)
+        if path is not None:
+            return solve_server, lambda: client.Client(path)
+        return solve_server, lambda: client.Client(host=address[0], port=address[1])
+
+    def test_solve(self):
+        """
+        The answers should be those of PL, in the order of the requests
+        """
+        solve_server, connect = self.start(workers=2, use_threads=True)
+        with connect() as my_client:
+            answer = my_client.solve_file("file5.txt")
+            self.assertEqual(answer["status"], "optimal")
+            self.assertAlmostEqual(answer["optimal_val"], 27.5)
+            self.assertEqual(len(answer["solution"]), 2)
+            answer = my_client.solve_file("file4.txt", engine="revised")
+            self.assertAlmostEqual(answer["optimal_val"], 14.4)
+            self.assertEqual(my_client.solve("max 1 1\n1 -1 <= 1")["status"], "unbounded")
+            self.assertEqual(my_client.solve("max 1\n1 <= 1\n1 >= 2")["status"], "infeasible")
+            self.assertEqual(my_client.solve("max 1 a\n1 1 <= 1")["status"], "error")
+            problems = ["max 1 2\n1 1 <= {}".format(rhs) for rhs in range(1, 11)]
+            answers = list(my_client.solve_many(problems, window=4))
+        self.assertEqual([answer["optimal_val"] for answer in answers], [2. * rhs for rhs in range(1, 11)])
+        self.assertEqual(solve_server.nb_solved, 15)
+
+    def test_backpressure(self):
+        """
+        Several clients should share a queue of one request, none of them losing an answer
+        """
+        solve_server, connect = self.start(workers=1, max_pending=1, use_threads=True)
+        results = {}
+
+        def run(index):
+            with connect() as my_client:
+                problems = ["max 1 1\n1 2 <= {}".format(rhs) for rhs in range(index, index + 20)]
+                results[index] = [answer["optimal_val"] for answer in my_client.solve_many(problems)]
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {index: [float(rhs) for rhs in range(index, index + 20)] for index in range(4)})
+        self.assertEqual(solve_server.nb_solved, 80)
+
+    def test_timeout(self):
+        """
+        A request past its deadline should be answered "timeout", the connection still serving the next ones
+        """
+        _, connect = self.start(workers=1, use_threads=True)
+        with connect() as my_client:
+            answer = my_client.solve_file("file5.txt", timeout=0)
+            self.assertEqual(answer["status"], "timeout")
+            self.assertEqual(my_client.solve_file("file5.txt")["status"], "optimal")
+
+    def test_bad_request(self):
+        """
+        A request which is not a JSON object with a problem, or whose limits are not numbers, should be
+        answered "error"
+        """
+        _, connect = self.start(workers=1, use_threads=True)
+        with connect() as my_client:
+            my_client.sock.sendall(b"not json\n")
+            self.assertEqual(my_client.receive(None)["status"], "error")
+            my_client.sock.sendall(b'{"id": 7}\n')
+            self.assertEqual(my_client.receive(None)["status"], "error")
+            my_client.sock.sendall(b'{"id": 8, "problem": "max 1\\n1 <= 1", "timeout": "10"}\n'
+                                   b'{"id": 9, "problem": "max 1\\n1 <= 1", "max_iterations": -1}\n')
+            self.assertEqual([my_client.receive(8), my_client.receive(9)],
+                             [{"id": 8, "status": "error", "error": "timeout should be a non negative number"},
+                              {"id": 9, "status": "error", "error": "max_iterations should be a non negative number"}])
+            self.assertEqual(my_client.solve_file("file5.txt")["status"], "optimal")
+
+    @unittest.skipUnless(hasattr(os, "fork") and sys.platform != "darwin", "Unix sockets and fork needed")
+    def test_processes(self):
+        """
+        The server should solve on worker processes behind a Unix socket
+        """
+        path = os.path.join(tempfile.mkdtemp(), "lp.sock")
+        _, connect = self.start(path, workers=2)
+        with connect() as my_client:
+            answers = list(my_client.solve_many([open("file5.txt").read(), open("file4.txt").read()]))
+        self.assertAlmostEqual(answers[0]["optimal_val"], 27.5)
+        self.assertAlmostEqual(answers[1]["optimal_val"], 14.4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,9 @@
 import os
 import re
-from operator import itemgetter
 import exceptions
-import tabulate
+import reader
+import pricing as pricing_rules
+from tracing import SUMMARY, TRACE
 import numpy as np
 import copy
 
@@ -25,7 +26,7 @@ def get_signs(list, signs):
     :param list: to get the sign from and remove them afterward
     :param signs: to store the signs
     """
-    for i in list:
+    for i in list[:]:  # Iterate over a copy since signs are removed from the list
         if not re.match(r'-?\d', i):  # match positive and negative digits
             signs.append(i)
             list.remove(i)
@@ -50,102 +51,105 @@ def get_data(file='file2.txt'):
     :param file: file containing the PL
     :return: tuple of wether min or max, the list of signs, the multi dimensional table
     """
-    try:
-        file = open(file, encoding='utf-8')
-    except (IOError, OSError) as e:
-        raise FileNotFoundError("The file is not found. Try to check the name you provided.")
-    else:
-        table = []
-        signs = []
-        max_min = file.read(3)  # Wether max or min
-        for line in file:
-            numbers_list = line.split()  # Get a list of string
-            get_signs(numbers_list, signs)
-            table.append(to_int(numbers_list))
-        # Fill the z column of the table
-        fill_z_column(table)
-        file.close()
+    problem = reader.read_problem(file)
+    table = problem.to_table()
+    # Fill the z column of the table
+    fill_z_column(table)
 
-        return (max_min, signs, table)
+    return (problem.max_min, problem.signs, table)
 
 
 def is_all_negative_but_last(list):
     """
     Check if all elements but the last are negative
-    :param list: list of integers
+    :param list: list or array of numbers
     :return: boolean telling if all elements but last are negative
     """
-    is_all_negative = True
-    for i in list[:len(list)-1]:  # Do not test for the last element of the list
-        if i > 0:
-            is_all_negative = False
-            break
-    return is_all_negative
+    return not (np.asarray(list)[:-1] > 0).any()  # Do not test for the last element of the list
 
 
 def column_is_all_negative(col, table):
     """
     Check wether the entire column is negative or equals to zero
-    :param col: index of the column to check
+    :param col: index of the column to check, or a slice to check several columns at once
     :param table: multidimensional array representing the table
-    :return: boolean
+    :return: boolean, or array of booleans when several columns are checked
     """
-    column_is_all_negative = True
-    for row in table[1:]:  # Spare the first row since it is the z row
-        if row[col] > 0:  # column col in row row
-            column_is_all_negative = False
-            break
-    return column_is_all_negative
+    return ~(np.asarray(table)[1:, col] > 0).any(axis=0)  # Spare the first row since it is the z row
 
 
-def get_pivot_from_column(col, table):
+def get_pivot_from_column(col, table, pricing=None):
     """
     Return the row number of the pivot at this column
     :param col: index of the column
     :param table: multidimensional array representing the PL table
+    :param pricing: PricingRule breaking the ties of the ratio test, the first row if None
     :return: int row position of the pivot
     """
-    pivot_candidates_over_b = [(row_num, row[col]/row[-1]) for row_num, row in enumerate(table[1:])
-                               if row[col] > 0]
-    pivot = max(pivot_candidates_over_b, key=itemgetter(1))  # Evaluate the second element of each tuple
-    return pivot[0] + 1  # we previously removed the first row so we add it to get the absolute position
+    table = np.asarray(table)
+    column = table[1:, col]
+    positive = column > 0
+    ratios = np.full(len(column), np.inf)
+    ratios[positive] = table[1:, -1][positive] / column[positive]
+    pricing = pricing or pricing_rules.PricingRule()
+    # we previously removed the first row so we add it to get the absolute position
+    return pricing.leaving(table, col, ratios) + 1
 
 
-def get_pivot(table, stop_function=is_all_negative_but_last):
+def get_pivot(table, stop_function=is_all_negative_but_last, pricing="first"):
     """
     Return the coordinate of the pivot if it exists
     :param table: multidimensional array representing the PL table
+    :param pricing: name of the pricing rule choosing the entering column, or a PricingRule
     :return: tuple of the row and column number of the pivot
     """
-    pivot = None
-    if isinstance(table, np.matrixlib.defmatrix.matrix):  # Convert to list if matrix
-        table = table.tolist()
-    while not stop_function(table[0]):  # Until there is no positive digit which
-        # column could contain a pivot
-        for col, value in enumerate(table[0]):
-            if value > 0 and not column_is_all_negative(col, table):  # There is a possible pivot in
-                # the column since there is at least one positive number in this column
-                pivot = get_pivot_from_column(col, table), col
-                break  # pivot found so get out of for loop
-        else:
-            raise exceptions.SolutionNonBorneeError("Solution non bornee")
-        break  # get out of while loop, did not enter else block
-    return pivot
+    table = np.asarray(table)
+    if stop_function(table[0]):  # No positive digit which column could contain a pivot
+        return None
+    # Columns with a positive cost and at least one positive number could contain a pivot
+    candidates = (table[0, :-1] > 0) & ~column_is_all_negative(slice(None, -1), table)
+    if not candidates.any():
+        raise exceptions.SolutionNonBorneeError("Solution non bornee")
+    pricing = pricing_rules.get_rule(pricing)
+    col = pricing.choose(table, candidates)
+    return get_pivot_from_column(col, table, pricing), col
+
+
+def to_array(table):
+    """
+    Table as the ndarray pivoted by the simplex: float64, unless it holds python integers (object), pivoted
+    exactly
+    Integer input is not kept in int64, whose fraction free pivots overflow without any warning
+    :param table: multidimensional list or ndarray
+    :return: ndarray
+    """
+    table = np.asarray(table)
+    return table if table.dtype == object else np.asarray(table, dtype=np.float64)
 
 
 def transform(table, pivot):
     """
     Operate the transformation on the table given the pivot
+    The whole table is updated at once with a rank-1 update, the pivot row being kept
+    An exact table (object) is pivoted fraction free, each row being divided by the gcd of its numbers
     :param table: multidimensional array representing the PL table
     :param pivot: tuple of the row and column number of the pivot
-    :return:
+    :return: the transformed table as an ndarray
     """
-    table = np.matrix(table)
-    pivot_row = table[pivot[0]]
-    for index, row in enumerate(table):
-        if index != pivot[0]:
-            table[index] = row*table[pivot] - pivot_row*row[0, pivot[1]]
-    return table.tolist()
+    table = to_array(table)
+    pivot_value = table[pivot]
+    if table.dtype != object:
+        pivot_row = table[pivot[0]] / pivot_value
+        table = table - np.outer(table[:, pivot[1]], pivot_row)
+    else:  # Fraction free: row * pivot - pivot_row * row[col]
+        pivot_row = table[pivot[0]].copy()
+        table = table * pivot_value - np.outer(table[:, pivot[1]], pivot_row)
+    table[pivot[0]] = pivot_row
+    if table.dtype == object:
+        gcds = np.gcd.reduce(table, axis=1)
+        gcds[gcds == 0] = 1  # A row of zeros is left as it is
+        table = table // gcds[:, None]
+    return table
 
 
 def last_is_zero(list):
@@ -157,33 +161,63 @@ def last_is_zero(list):
     return list[-1] == 0
 
 
-def solve(table, stop_function=is_all_negative_but_last):
+def solve(table, stop_function=is_all_negative_but_last, verbosity=TRACE, trace=None, pricing="first",
+          max_iterations=None):
     """
     Solve a simple PL with base realisable
     :param signs: list of constraints signs
     :param table: multidimensional array representing the PL table
-    :return:
+    :param verbosity: SILENT, SUMMARY or TRACE
+    :param trace: optional Trace recording the pivots and objective values
+    :param pricing: name of the pricing rule choosing the entering column, or a PricingRule
+    :param max_iterations: number of tables after which IterationLimitError is raised, no limit if None
+    :return: the last table
     """
-    try:
-        pivot = get_pivot(table, stop_function)
-    except exceptions.SolutionNonBorneeError:
-        print("Solution non bornee")
-    else:
-        if pivot is not None:
+    table = to_array(table)
+    pricing = pricing_rules.get_rule(pricing)  # Built once, a rule like Devex learns along the solve
+    nb_iteration = 0
+    while True:
+        if max_iterations is not None and nb_iteration >= max_iterations:
+            raise exceptions.IterationLimitError("Nombre maximal d'iterations atteint")
+        try:
+            pivot = get_pivot(table, stop_function, pricing)
+        except exceptions.SolutionNonBorneeError:
+            if verbosity >= SUMMARY:
+                print("Solution non bornee")
+            return table
+        nb_iteration += 1
+        if trace is not None:
+            trace.record(table, pivot, table[0][-1]/table[0][-2])
+        if pivot is None:
+            break
+        if verbosity >= TRACE:
             print_table(table, pivot)
-            table = transform(table, pivot)
-            # print_table(table)
-            solve(table)
-        else:
-            print_table(table)
-            print("Termine\n Valeur optimale = {}".format(table[0][-1]/table[0][-2]))
+        pricing.update(table, pivot)
+        table = transform(table, pivot)
+    if verbosity >= TRACE:
+        print_table(table)
+    if verbosity >= SUMMARY:
+        print("Termine\n Valeur optimale = {}".format(table[0][-1]/table[0][-2]))
+    return table
+
+
+def phase1_done(list):
+    """
+    Check if the first phase is over: the sum of the artificial variables is zero, or can not
+    decrease anymore
+    :param list: objective row of the first phase
+    :return: boolean
+    """
+    return last_is_zero(list) or is_all_negative_but_last(list)
 
 
-def phase1(table, var_artif_row):
+def phase1(table, var_artif_row, verbosity=TRACE, trace=None):
     """
     Recherche de base realisable a partir de la phase 1
     :param signs: list of constraints signs
     :param table: multidimensional array representing the PL table
+    :param verbosity: SILENT, SUMMARY or TRACE
+    :param trace: optional Trace recording the pivots and objective values
     :return: table avec base realisable
     """
     w = [0] * len(table[0])
@@ -194,16 +228,20 @@ def phase1(table, var_artif_row):
         w[-3-i] = 0  # We omit the last two columns z zt b columns
     w[-2] = -1  # z column which is now omega column is -1
     table[0] = w
-    print_table(table)
-    solve(table, stop_function=last_is_zero)
+    if verbosity >= TRACE:
+        print_table(table)
+    return solve(table, stop_function=phase1_done, verbosity=verbosity, trace=trace)
 
 
-def process(nb_var, table):
+def process(nb_var, table, verbosity=TRACE, trace=None):
     """
     Real process
     :param signs: list of constraints signs
     :param table: multidimensional array representing the PL table
-    :return:
+    :param verbosity: SILENT, SUMMARY or TRACE
+    :param trace: optional Trace recording the pivots and objective values
+    :return: status of the solve, "optimal", "unbounded", "infeasible", or "feasible" when the first phase
+    found a realisable base, the second phase not being run
     """
     old_dim = len(table[0])
     nb_var_artif = 0
@@ -219,12 +257,14 @@ def process(nb_var, table):
                     else:
                         r.insert(len(r) - 2, 0)
     if old_dim != len(table[0]):
-        print("Phase 1")
-        print_table(table, nb_var_artif=nb_var_artif)
-        table = phase1(table, var_artif_row)
-    else:
-        # San passer par phase1
-        solve(table)
+        if verbosity >= TRACE:
+            print("Phase 1")
+            print_table(table, nb_var_artif=nb_var_artif)
+        table = phase1(table, var_artif_row, verbosity, trace)
+        return "feasible" if last_is_zero(table[0]) else "infeasible"
+    # San passer par phase1
+    table = solve(table, verbosity=verbosity, trace=trace)
+    return "optimal" if is_all_negative_but_last(table[0]) else "unbounded"
 
 
 def display_result():
@@ -253,9 +293,11 @@ def print_table(table, pivot=None, nb_var_artif=0):
     :param table: multidimensional array representing the table of the PL
     :return:
     """
-    printed_table = copy.deepcopy(table)
-    if isinstance(printed_table, np.matrixlib.defmatrix.matrix):  # Convert to list if matrix
-        printed_table = printed_table.tolist()
+    import tabulate  # Only needed to display, kept out of the import of the module
+    if isinstance(table, np.ndarray):  # Convert to list if ndarray
+        printed_table = table.tolist()
+    else:
+        printed_table = copy.deepcopy(table)
     if pivot is not None:
         printed_table[pivot[0]][pivot[1]] = "[{}]".format(printed_table[pivot[0]][pivot[1]])
 
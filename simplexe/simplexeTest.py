@@ -1,6 +1,8 @@
 import unittest
+import numpy as np
 import simplexe
 import exceptions
+import tracing
 
 
 class SimplexeTest(unittest.TestCase):
@@ -44,6 +46,36 @@ class SimplexeTest(unittest.TestCase):
         check wether table column specified by index is all negative
         :return:
         """
+        table = [[1, 3, -1, 0], [0, -2, 4, 1], [-1, 0, 2, 5]]
+        self.assertEqual(simplexe.column_is_all_negative(0, table), True)
+        self.assertEqual(simplexe.column_is_all_negative(2, table), False)
+        self.assertEqual(list(simplexe.column_is_all_negative(slice(None, -1), table)), [True, True, False])
+
+    def test_transform(self):
+        """
+        transform should pivot the whole table at once and keep the pivot row
+        :return:
+        """
+        table = simplexe.transform([[1, 3, 0], [2, 4, 8], [3, -1, 3]], (1, 1))
+        self.assertIsInstance(table, np.ndarray)
+        self.assertEqual(table.dtype, np.float64)  # Integers are not pivoted in int64, which overflows
+        self.assertEqual(table.tolist(), [[-0.5, 0, -6], [0.5, 1, 2], [3.5, 0, 5]])
+        table = simplexe.transform(np.array([[1, 3, 0], [2, 4, 8], [3, -1, 3]], dtype=object), (1, 1))
+        self.assertEqual(table.tolist(), [[-1, 0, -12], [1, 2, 4], [7, 0, 10]])
+        table = simplexe.transform(np.array([[1., 3., 0.], [2., 4., 8.], [3., -1., 3.]]), (1, 1))
+        self.assertEqual(table.tolist(), [[-0.5, 0, -6], [0.5, 1, 2], [3.5, 0, 5]])
+
+    def test_solve(self):
+        """
+        solve should pivot until the table is optimal and stop at max_iterations
+        :return:
+        """
+        table = [[3, 2, 0, 0, -1, 0], [1, 1, 1, 0, 0, 4], [1, 3, 0, 1, 0, 6]]
+        table = simplexe.solve(table, verbosity=tracing.SILENT)
+        self.assertEqual(table[0][-1] / table[0][-2], 12)
+        self.assertRaises(exceptions.IterationLimitError, simplexe.solve,
+                          [[3, 2, 0, 0, -1, 0], [1, 1, 1, 0, 0, 4], [1, 3, 0, 1, 0, 6]],
+                          verbosity=tracing.SILENT, max_iterations=1)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,148 @@
+import numpy as np
+
+
+class CSCMatrix:
+    """
+    Sparse matrix stored column by column (compressed sparse column)
+    Attributes:
+        shape: tuple of the number of rows and columns
+        data: ndarray of the non zero values, column after column
+        indices: ndarray of the row index of each value
+        indptr: ndarray, the values of column j are data[indptr[j]:indptr[j + 1]]
+    """
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=np.float64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = tuple(shape)
+
+    @classmethod
+    def from_triplets(cls, rows, cols, values, shape):
+        """
+        Build the matrix from coordinates, duplicates are summed and zeros dropped
+        :param rows: row index of each value
+        :param cols: column index of each value
+        :param values: values
+        :param shape: tuple of the number of rows and columns
+        :return: CSCMatrix
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        keys = cols * shape[0] + rows
+        keys, inverse = np.unique(keys, return_inverse=True)
+        values = np.bincount(inverse, weights=values, minlength=len(keys))
+        keep = values != 0
+        keys, values = keys[keep], values[keep]
+        indptr = np.zeros(shape[1] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys // shape[0], minlength=shape[1]), out=indptr[1:])
+        return cls(values, keys % shape[0], indptr, shape)
+
+    @classmethod
+    def from_dense(cls, matrix):
+        """
+        Build the matrix from a dense one
+        :param matrix: multidimensional list or ndarray
+        :return: CSCMatrix
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        cols, rows = np.nonzero(matrix.T)
+        return cls.from_triplets(rows, cols, matrix[rows, cols], matrix.shape)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def column(self, col):
+        """
+        Dense copy of a column
+        :param col: index of the column
+        :return: ndarray
+        """
+        result = np.zeros(self.shape[0])
+        start, stop = self.indptr[col], self.indptr[col + 1]
+        result[self.indices[start:stop]] = self.data[start:stop]
+        return result
+
+    def dot_columns(self, vector, columns):
+        """
+        Product of a row vector with some columns, vector @ matrix[:, columns]
+        :param vector: ndarray of the size of a column
+        :param columns: ndarray of column indices
+        :return: ndarray of the size of columns
+        """
+        columns = np.asarray(columns, dtype=np.int64)
+        lengths = self.indptr[columns + 1] - self.indptr[columns]
+        offsets = np.cumsum(lengths) - lengths
+        positions = np.repeat(self.indptr[columns] - offsets, lengths) + np.arange(lengths.sum())
+        segments = np.repeat(np.arange(len(columns)), lengths)
+        return np.bincount(segments, weights=self.data[positions] * vector[self.indices[positions]],
+                           minlength=len(columns))
+
+    def dot(self, vector):
+        """
+        Product of the matrix with a column vector, matrix @ vector
+        :param vector: ndarray of the size of a row
+        :return: ndarray
+        """
+        cols = np.repeat(np.arange(self.shape[1]), np.diff(self.indptr))
+        return np.bincount(self.indices, weights=self.data * vector[cols], minlength=self.shape[0])
+
+    def toarray(self):
+        """
+        Dense copy of the matrix
+        :return: ndarray
+        """
+        result = np.zeros(self.shape)
+        result[self.indices, np.repeat(np.arange(self.shape[1]), np.diff(self.indptr))] = self.data
+        return result
+
+
+class EtaFactor:
+    """
+    Product form of the inverse of a basis: a diagonal starting basis followed by sparse eta columns,
+    so the memory used grows with the non zeros of the etas instead of the square of the basis size
+    Attributes:
+        diagonal: ndarray of the diagonal of the starting basis
+        etas: list of (row, indices, values) tuples, the non zeros of the eta column replacing the
+            row-th column of the identity
+    """
+
+    def __init__(self, diagonal):
+        self.diagonal = np.asarray(diagonal, dtype=np.float64)
+        self.etas = []
+
+    def ftran(self, column):
+        """
+        Solve B x = column
+        :param column: ndarray
+        :return: ndarray x
+        """
+        x = column / self.diagonal
+        for row, indices, values in self.etas:
+            pivot = x[row] / values[indices == row][0]
+            x[indices] -= pivot * values
+            x[row] = pivot
+        return x
+
+    def btran(self, row_vector):
+        """
+        Solve B^T y = row_vector
+        :param row_vector: ndarray
+        :return: ndarray y
+        """
+        y = np.array(row_vector, dtype=np.float64)
+        for row, indices, values in reversed(self.etas):
+            at_row = indices == row
+            y[row] = (y[row] - values[~at_row] @ y[indices[~at_row]]) / values[at_row][0]
+        return y / self.diagonal
+
+    def update(self, row, column):
+        """
+        Record the replacement of the row-th basic column
+        :param row: position in the basis of the leaving variable
+        :param column: ndarray B^-1 a of the entering variable
+        """
+        indices = np.flatnonzero(column)
+        self.etas.append((row, indices, column[indices]))
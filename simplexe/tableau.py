@@ -0,0 +1,47 @@
+import numpy as np
+
+INT64_LIMIT = 2 ** 31  # A fraction free pivot multiplies two numbers of the table, which then stay below 2**63
+
+
+def slack_coefficients(signs):
+    """
+    Coefficient of the slack variable of each constraint
+    :param signs: list of constraints signs
+    :return: ndarray of 1 for <=, -1 for >= and 0 for = which has no slack variable
+    """
+    var_ecart = {"<=": 1, ">=": -1, "=": 0}
+    return np.array([var_ecart[sign] for sign in signs], dtype=np.int64)
+
+
+def build_table(objective, matrix, rhs, signs=None, z_column=True):
+    """
+    Table of a PL, allocated at its final shape and filled block by block
+    The columns are the variables, a slack variable for each constraint when the signs are given, the
+    z column, then b
+    :param objective: objective coefficients of the max problem
+    :param matrix: 2d array of the constraints
+    :param rhs: right hand side of each constraint
+    :param signs: list of constraints signs, None to leave the slack variables out
+    :param z_column: wether the table has a z column, -1 in the objective row and 0 elsewhere
+    :return: ndarray, int64 when every number is an integer below INT64_LIMIT, float64 otherwise
+    """
+    objective = np.asarray(objective)
+    rhs = np.asarray(rhs)
+    nb_var, nb_row = len(objective), len(rhs)
+    matrix = np.asarray(matrix).reshape(nb_row, nb_var)
+    nb_slack = 0 if signs is None else len(signs)
+    dtype = np.result_type(objective, matrix, rhs, np.int64)
+    if dtype != object:  # Large integers would wrap around in int64
+        dtype = np.int64 if all(np.all(part == np.round(part)) and np.abs(part).max(initial=0) < INT64_LIMIT
+                                for part in (objective, matrix, rhs)) else np.float64
+
+    table = np.zeros((nb_row + 1, nb_var + nb_slack + z_column + 1), dtype=dtype)
+    table[0, :nb_var] = objective
+    table[1:, :nb_var] = matrix
+    if nb_slack:
+        rows = np.arange(nb_row)
+        table[rows + 1, nb_var + rows] = slack_coefficients(signs)
+    if z_column:
+        table[0, -2] = -1
+    table[1:, -1] = rhs
+    return table
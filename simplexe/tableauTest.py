@@ -0,0 +1,40 @@
+import unittest
+import numpy as np
+import tableau
+
+
+class TableauTest(unittest.TestCase):
+
+    def test_build_table(self):
+        """
+        build_table should put the slack, z and b columns of every constraint in one table
+        """
+        table = tableau.build_table([1, 2], [[3, 4], [5, 6], [7, 8]], [9, 10, 11], ["<=", ">=", "="])
+        self.assertEqual(table.dtype, np.int64)
+        self.assertEqual(table.tolist(), [[1, 2, 0, 0, 0, -1, 0],
+                                          [3, 4, 1, 0, 0, 0, 9],
+                                          [5, 6, 0, -1, 0, 0, 10],
+                                          [7, 8, 0, 0, 0, 0, 11]])
+        table = tableau.build_table([1.5, 2], [[3, 4]], [9], z_column=False)
+        self.assertEqual(table.dtype, np.float64)
+        self.assertEqual(table.tolist(), [[1.5, 2, 0], [3, 4, 9]])
+
+    def test_large_integers(self):
+        """
+        build_table should keep integers too large for the pivots in int64 as float64
+        """
+        table = tableau.build_table([1, 1], [[1, 1], [1, 0]], [1e19, 5e18], ["<=", "<="])
+        self.assertEqual(table.dtype, np.float64)
+        self.assertEqual(table[1:, -1].tolist(), [1e19, 5e18])
+        self.assertEqual(tableau.build_table([1], [[1]], [2 ** 31], ["<="]).dtype, np.float64)
+        self.assertEqual(tableau.build_table([1], [[1]], [2 ** 31 - 1], ["<="]).dtype, np.int64)
+
+    def test_no_constraint(self):
+        """
+        build_table should keep the objective row of a PL without constraints
+        """
+        self.assertEqual(tableau.build_table([1, 2], [], [], []).tolist(), [[1, 2, -1, 0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
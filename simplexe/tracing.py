@@ -0,0 +1,184 @@
+import contextlib
+import functools
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+SILENT = 0  # Nothing is printed
+SUMMARY = 1  # Only the outcome of the solve is printed
+TRACE = 2  # Every table is printed, pedagogical output
+
+
+class Trace:
+    """
+    Cheap record of a solve, filled at every iteration
+    Tables are only copied when keep_tableaux is set and rendered on demand afterwards
+    Attributes:
+        keep_tableaux: boolean telling wether a copy of each table is kept
+        pivots: list of the pivot (row, column) chosen at each iteration, None for the last table
+        objective_values: list of the objective value at each iteration
+        tableaux: list of the copies of the tables
+    """
+
+    def __init__(self, keep_tableaux=False):
+        self.keep_tableaux = keep_tableaux
+        self.pivots = []
+        self.objective_values = []
+        self.tableaux = []
+
+    def __len__(self):
+        return len(self.pivots)
+
+    def record(self, table, pivot, objective_value):
+        """
+        Record an iteration
+        :param table: ndarray of the table before the pivot is applied
+        :param pivot: tuple of the row and column number of the pivot, None if the table is the last
+        :param objective_value: current value of the objective
+        """
+        self.pivots.append(pivot)
+        self.objective_values.append(objective_value)
+        if self.keep_tableaux:
+            self.tableaux.append(table.copy())
+
+    def render(self, formatter, iteration=None):
+        """
+        Render the kept tables
+        :param formatter: function taking a table and a pivot and returning a string
+        :param iteration: index of the only table to render, all of them if None
+        :return: string of the rendered tables
+        """
+        if not self.keep_tableaux:
+            raise ValueError("Tables were not kept, create the trace with keep_tableaux=True")
+        if iteration is not None:
+            return formatter(self.tableaux[iteration], self.pivots[iteration])
+        return "\n".join(formatter(table, pivot) for table, pivot in zip(self.tableaux, self.pivots))
+
+    def __str__(self):
+        """
+        One line per iteration with the pivot and the objective value
+        """
+        return "\n".join("Iteration {}: pivot {} valeur {}".format(index + 1, pivot, value)
+                         for index, (pivot, value) in enumerate(zip(self.pivots, self.objective_values)))
+
+
+class Stats:
+    """
+    Counters and timers of a solve, always on since they cost a few calls to the clock per pivot
+    Attributes:
+        times: dict of the seconds spent in each timed step ("pricing", "ratio_test", "transform",
+            "dual_pricing"), a step called by another one being left out of the time of the other
+        wall_time: seconds of the whole solve
+        nb_pivot: number of pivots applied
+        nb_degenerate: number of pivots on a row whose right hand side is zero, the objective not moving
+        nb_bound_flip: number of variables moved to their other bound without any pivot
+        nb_stall: number of times the simplex stalled on degenerate pivots, switching its ratio test
+        max_shape: tuple of the largest number of rows and columns of the table
+        peak_table_bytes: largest size of the table array, the python integers of an exact table
+            being counted as pointers
+        peak_memory: peak resident memory of the process in bytes at the end of the solve, None when
+            the platform does not tell
+    """
+
+    def __init__(self):
+        self.times = {}
+        self.wall_time = 0.
+        self.nb_pivot = 0
+        self.nb_degenerate = 0
+        self.nb_bound_flip = 0
+        self.nb_stall = 0
+        self.max_shape = (0, 0)
+        self.peak_table_bytes = 0
+        self.peak_memory = None
+        self.nested = []
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        """
+        Add the time spent in the block to the step name
+        :param name: name of the step
+        """
+        start = time.perf_counter()
+        self.nested.append(0.)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            inner = self.nested.pop()
+            self.times[name] = self.times.get(name, 0.) + elapsed - inner
+            if self.nested:
+                self.nested[-1] += elapsed
+
+    def record_pivot(self, table, pivot, tol=0):
+        """
+        Count a pivot before it is applied to the table
+        :param table: ndarray of the table
+        :param pivot: tuple of the row and column number of the pivot
+        :param tol: numbers of absolute value below tol are zeros
+        :return: boolean telling if the pivot is degenerate
+        """
+        self.nb_pivot += 1
+        degenerate = abs(table[pivot[0], -1]) <= tol
+        if degenerate:
+            self.nb_degenerate += 1
+        self.max_shape = tuple(max(old, new) for old, new in zip(self.max_shape, table.shape))
+        self.peak_table_bytes = max(self.peak_table_bytes, table.nbytes)
+        return degenerate
+
+    def record_memory(self):
+        """
+        Read the peak resident memory of the process
+        """
+        if resource is not None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.peak_memory = peak if sys.platform == "darwin" else peak * 1024  # Kilobytes on Linux
+
+    def as_dict(self):
+        """
+        :return: dict of the statistics
+        """
+        return {"times": dict(self.times), "wall_time": self.wall_time, "nb_pivot": self.nb_pivot,
+                "nb_degenerate": self.nb_degenerate, "nb_bound_flip": self.nb_bound_flip, "nb_stall": self.nb_stall,
+                "max_shape": list(self.max_shape), "peak_table_bytes": self.peak_table_bytes,
+                "peak_memory": self.peak_memory}
+
+
+def timed(name):
+    """
+    Decorator adding the time spent in a method to the step name of the stats of its object
+    :param name: name of the step
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.stats.timer(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class Result:
+    """
+    Outcome of a solve
+    Attributes:
+        status: "optimal", "unbounded", "infeasible" or "iteration_limit"
+        optimal_val: optimal value, None unless optimal
+        solution: list of the values of the variables, None unless optimal
+        nb_iteration: number of iterations
+        stats: Stats of the solve
+    """
+
+    def __init__(self, status, optimal_val=None, solution=None, nb_iteration=0, stats=None):
+        self.status = status
+        self.optimal_val = optimal_val
+        self.solution = solution
+        self.nb_iteration = nb_iteration
+        self.stats = stats if stats is not None else Stats()
+
+    def __repr__(self):
+        return "Result(status={!r}, optimal_val={!r}, nb_iteration={})".format(
+            self.status, self.optimal_val, self.nb_iteration)